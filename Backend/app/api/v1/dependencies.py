@@ -1,7 +1,7 @@
 """
 API dependencies
 """
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.db.session import get_db
@@ -10,12 +10,21 @@ from app.services.user_service import UserService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+# request.state key under which /v1/batch shares its (token, user) with sub-requests;
+# the user is detached from any session, so only its loaded columns are usable
+AUTHENTICATED_USER_STATE = "authenticated_user"
+
 
 def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ):
-    """Get current authenticated user"""
+    """Get current authenticated user (reusing the one a batch request already loaded for this token)"""
+    shared = getattr(request.state, AUTHENTICATED_USER_STATE, None)
+    if shared is not None and shared[0] == token:
+        return shared[1]
+    
     user_id = verify_token(token)
     if user_id is None:
         raise HTTPException(
@@ -0,0 +1,251 @@
+"""
+Caching utilities: an in-process TTL/LRU cache and a response cache with
+tag-based invalidation (per-worker, or shared through Redis)
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a time-to-live.
+    Each gunicorn worker has its own instance.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry and mark it most recently used"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store an entry, evicting the least recently used one when full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class LocalCacheBackend:
+    """
+    Per-worker backend: an LRU of entries plus in-memory tag versions.
+
+    Tag versions are kept in a bounded LRU too (one tag per product ever
+    changed would otherwise grow forever). Versions come from one increasing
+    clock, and untracked tags read as the version of the last evicted tag, so
+    forgetting a tag can only invalidate entries, never revive stale ones.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, max_tags: Optional[int] = None):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions: "OrderedDict[str, int]" = OrderedDict()
+        self._max_tags = max_tags or maxsize * 4
+        self._clock = 0  # last version handed out
+        self._floor = 0  # version of tags that aren't tracked
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries.set(key, value, ttl)
+
+    def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        with self._lock:
+            return [self._versions.get(tag, self._floor) for tag in tags]
+
+    def bump(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._clock += 1
+                self._versions[tag] = self._clock
+                self._versions.move_to_end(tag)
+            while len(self._versions) > self._max_tags:
+                _, version = self._versions.popitem(last=False)
+                self._floor = max(self._floor, version)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        with self._lock:
+            self._versions.clear()
+            self._clock = self._floor = 0
+
+
+class RedisCacheBackend:
+    """Shared backend: entries and tag versions live in Redis, so an invalidation in one worker is seen by all"""
+
+    def __init__(self, url: str, prefix: str = "respcache:"):
+        import redis  # optional dependency, only needed when RESPONSE_CACHE_REDIS_URL is set
+
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._redis.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._redis.set(self._prefix + key, value, ex=max(1, int(ttl)))
+
+    def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        values = self._redis.mget([f"{self._prefix}tag:{tag}" for tag in tags])
+        return [int(value or 0) for value in values]
+
+    def bump(self, tags: Iterable[str]) -> None:
+        pipeline = self._redis.pipeline(transaction=False)
+        for tag in tags:
+            pipeline.incr(f"{self._prefix}tag:{tag}")
+        pipeline.execute()
+
+    def clear(self) -> None:
+        for key in self._redis.scan_iter(f"{self._prefix}*"):
+            self._redis.delete(key)
+
+
+class CachedResponse(NamedTuple):
+    """Pre-serialized response body with the headers to send along"""
+    body: bytes
+    headers: Dict[str, str]
+
+
+class ResponseCache:
+    """
+    Cache of pre-serialized JSON responses with tag-based invalidation.
+
+    Each entry records the version of every tag it depends on when it was
+    stored; invalidating a tag bumps its version, so older entries stop
+    matching and age out of the LRU. Nothing has to enumerate keys.
+    """
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(namespace: str, params: Iterable[Tuple[str, Any]] = ()) -> str:
+        """Cache key from parsed query params, independent of their order; None and "" are dropped"""
+        normalized = sorted(
+            (name, str(getattr(value, "value", value)))
+            for name, value in params
+            if value is not None and value != ""
+        )
+        return f"{namespace}?{urlencode(normalized)}"
+
+    def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        """
+        Current versions of `tags`. Read them before querying the data a
+        response is built from and pass them to get() and set(): a write that
+        commits in between then invalidates the stored entry instead of
+        having the stale body filed under its new version.
+        """
+        return self.backend.tag_versions(tags)
+
+    def get(self, key: str, tags: Sequence[str], versions: Optional[List[int]] = None) -> Optional[CachedResponse]:
+        """Return the entry for `key` unless one of its tags was invalidated since"""
+        raw = self.backend.get(key)
+        if raw is None:
+            return None
+        try:
+            # "<json [versions, headers]>\n<body>"; JSON, not pickle, since the bytes may come from a shared server
+            meta, body = raw.split(b"\n", 1)
+            stored_versions, headers = json.loads(meta)
+        except ValueError:
+            logger.warning("Discarding unreadable response cache entry %s", key)
+            return None
+        if stored_versions != (self.backend.tag_versions(tags) if versions is None else versions):
+            return None
+        return CachedResponse(body, headers)
+
+    def set(
+        self,
+        key: str,
+        tags: Sequence[str],
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None,
+        versions: Optional[List[int]] = None
+    ) -> None:
+        """Store a serialized response under `versions` (taken before the query) or the current versions of `tags`"""
+        if versions is None:
+            versions = self.backend.tag_versions(tags)
+        meta = json.dumps([versions, dict(headers or {})], separators=(",", ":"))
+        self.backend.set(key, meta.encode() + b"\n" + body, self.ttl)
+
+    def invalidate(self, *tags: str) -> None:
+        if tags:
+            self.backend.bump(tags)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+def _create_response_cache() -> ResponseCache:
+    from app.core.config import settings
+
+    backend = None
+    if settings.RESPONSE_CACHE_REDIS_URL:
+        try:
+            backend = RedisCacheBackend(settings.RESPONSE_CACHE_REDIS_URL)
+        except ImportError:
+            logger.warning("RESPONSE_CACHE_REDIS_URL is set but the redis package is not installed; using the per-worker cache")
+    if backend is None:
+        backend = LocalCacheBackend(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+    return ResponseCache(backend, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+response_cache = _create_response_cache()
+
+
+def invalidate_on_commit(session: Session, *tags: str) -> None:
+    """Invalidate `tags` once `session` commits (and not at all if it rolls back)"""
+    session.info.setdefault("cache_tags", set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tags(session: Session) -> None:
+    tags = session.info.pop("cache_tags", None)
+    if tags:
+        try:
+            response_cache.invalidate(*tags)
+        except Exception:
+            # A cache outage must not fail a write that already committed
+            logger.exception("Response cache invalidation failed for %s", sorted(tags))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tags(session: Session) -> None:
+    session.info.pop("cache_tags", None)
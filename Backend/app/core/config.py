@@ -23,7 +23,37 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "password"
     POSTGRES_DB: str = "sunglass_db"
     POSTGRES_PORT: str = "5432"
-    
+
+    # Connection Pool Settings (per worker process)
+    # Size pools so that workers * instances * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    # stays below the Cloud SQL max_connections limit
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds; recycle before Cloud SQL drops idle connections
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection before failing
+    DB_POOL_PRE_PING: bool = True
+
+    # Read replicas (comma-separated URLs); read-only routes are spread across
+    # them round-robin, falling back to the primary when none are healthy
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_RETRY_INTERVAL: int = 30  # seconds before re-probing a failed replica
+
+    # Schema management runs once per deployment (scripts/init_db.py), not in
+    # every worker; enable create_all on startup only for local development
+    DB_CREATE_TABLES_ON_STARTUP: bool = False
+    DB_READINESS_TIMEOUT: float = 2.0  # seconds /health/ready waits for the database
+
+    # Query Instrumentation (development and tests): responses carry DB time and
+    # query counts in Server-Timing, which must not reach clients in production
+    QUERY_INSTRUMENTATION_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: int = 200  # log statements slower than this
+    N_PLUS_ONE_THRESHOLD: int = 5  # flag statement shapes repeated this often in one request
+    QUERY_BUDGET_ENFORCE: bool = False  # raise when a route exceeds its query_budget (tests)
+
+    # GET /metrics exposes pool internals: set a token for scrapers to send as
+    # "Authorization: Bearer <token>"; when empty, keep /metrics internal-only
+    METRICS_TOKEN: str = ""
+
     # Security Settings
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours (1440 minutes)
@@ -41,10 +71,51 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
     ALLOWED_IMAGE_TYPES: list = ["image/jpeg", "image/png", "image/webp"]
     
+    # Orders
+    ORDER_RESERVATION_MINUTES: int = 30  # how long unpaid orders hold their stock
+    
+    # Idempotency-Key handling for retried POST requests
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24  # how long completed responses are replayed
+    IDEMPOTENCY_LOCK_SECONDS: int = 60  # lease held while the first request runs
+    IDEMPOTENCY_CACHE_SIZE: int = 1024  # per-worker in-memory front cache entries
+    
+    # Bulk product endpoints
+    PRODUCT_BULK_MAX_ITEMS: int = 500
+    
+    # Catalog export: rows fetched from the server-side cursor per streamed chunk,
+    # and how far behind now the watermark stays (in-flight writes, see SYNC_LAG_SECONDS)
+    EXPORT_CHUNK_SIZE: int = 1000
+    EXPORT_LAG_SECONDS: int = 2
+    
+    # Delta sync: rows newer than this are held back until in-flight writes with
+    # earlier updated_at values have committed, so watermarks never skip a row
+    SYNC_LAG_SECONDS: int = 2
+    SYNC_PAGE_SIZE: int = 500
+    
+    # Batch endpoint: maximum sub-requests per POST /v1/batch
+    BATCH_MAX_REQUESTS: int = 10
+    
+    # Response compression (gzip, plus brotli when the brotli package is installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes; smaller bodies aren't worth the CPU
+    COMPRESSION_LEVEL: int = 6
+    COMPRESSION_BROTLI: bool = True
+    COMPRESSION_CONTENT_TYPES: str = (
+        "application/json,application/x-ndjson,text/csv,text/html,text/plain,"
+        "text/css,application/javascript,text/javascript,image/svg+xml"
+    )
+    
+    # Response cache for public product endpoints
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 30  # bounds staleness between workers without a shared backend
+    RESPONSE_CACHE_SIZE: int = 512  # entries per worker
+    RESPONSE_CACHE_REDIS_URL: str = ""  # e.g. redis://localhost:6379/0 to share entries and invalidations (needs the redis package)
+    
     # AI Model Settings
     AI_CONFIDENCE_THRESHOLD: float = 0.1
     USE_AI_MODEL: bool = True
     USE_VISION_API: bool = True
+    AI_WARMUP_ON_STARTUP: bool = False  # import Pillow/model clients at startup instead of on the first validation
     
     # Swagger UI Authentication
     # Set ENABLE_SWAGGER_AUTH=True in .env to protect Swagger documentation with JWT authentication
@@ -70,6 +141,16 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
     
+    @property
+    def replica_urls(self) -> list[str]:
+        """Parse read replica URLs"""
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
+    @property
+    def compression_content_types(self) -> list[str]:
+        """Parse the compressible content type allowlist"""
+        return [value.strip().lower() for value in self.COMPRESSION_CONTENT_TYPES.split(",") if value.strip()]
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
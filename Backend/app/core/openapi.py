@@ -0,0 +1,87 @@
+"""
+OpenAPI document: built once, served as bytes
+
+The schema is generated once per process (at startup, or on first use) and
+kept as compact JSON bytes plus a gzip copy and an ETag, so serving it costs
+no schema generation or JSON encoding per request, and clients that already
+have it get a 304.
+"""
+import gzip
+import hashlib
+import json
+from typing import Any, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.openapi.utils import get_openapi
+from fastapi.responses import Response
+
+from app.middleware.compression import preferred_encodings
+from app.utils.etag import etag_matches, not_modified
+
+OPENAPI_URL = "/docs/frame/openapi.json"
+SWAGGER_UI_URL = "/docs/frame/swagger-ui/index.html"
+SWAGGER_UI_OAUTH2_REDIRECT_URL = "/docs/oauth2-redirect"
+REDOC_URL = "/docs/frame/redoc/index.html"
+
+
+def build_openapi_schema(app: FastAPI) -> Dict[str, Any]:
+    """OpenAPI schema for the app, with Bearer authentication and the logo"""
+    openapi_schema = get_openapi(
+        title=app.title,
+        version=app.version,
+        description=app.description,
+        routes=app.routes,
+        tags=app.openapi_tags,
+    )
+
+    openapi_schema.setdefault("components", {})["securitySchemes"] = {
+        "Bearer": {
+            "type": "http",
+            "scheme": "bearer",
+            "bearerFormat": "JWT",
+            "description": "Enter JWT token obtained from /login endpoint. Format: Bearer <token>"
+        }
+    }
+
+    # Add favicon info to OpenAPI schema (for Swagger UI)
+    if "info" in openapi_schema:
+        openapi_schema["info"]["x-logo"] = {
+            "url": "/favicon.ico",
+            "altText": "Frame Flea Logo"
+        }
+
+    return openapi_schema
+
+
+class OpenAPIDocument:
+    """Serialized OpenAPI schema with its gzip encoding and ETag"""
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self.body = json.dumps(schema, separators=(",", ":"), ensure_ascii=False).encode()
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+    def response(self, request: Request) -> Response:
+        """The document (gzipped if accepted), or 304 if the client's copy is current"""
+        if etag_matches(request, self.etag):
+            return not_modified(self.etag)
+
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if preferred_encodings(request.headers.get("accept-encoding"), ("gzip",)):
+            return Response(
+                self.gzip_body,
+                media_type="application/json",
+                headers={**headers, "Content-Encoding": "gzip", "ETag": f"W/{self.etag}"}
+            )
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+def get_openapi_document(app: FastAPI) -> OpenAPIDocument:
+    """The app's OpenAPI document, built on first use and then reused"""
+    document = getattr(app.state, "openapi_document", None)
+    if document is None:
+        if app.openapi_schema is None:
+            app.openapi_schema = build_openapi_schema(app)
+        document = app.state.openapi_document = OpenAPIDocument(app.openapi_schema)
+    return document
@@ -0,0 +1,41 @@
+"""
+Response serialization helpers
+
+Two fast paths replace FastAPI's default of jsonable_encoder + stdlib json:
+
+- Routes that return models or ORM objects render through
+  DefaultJSONResponse, which is ORJSONResponse when orjson is installed
+  (the app's default_response_class).
+- Hot routes skip that too: dump_json validates against the response schema
+  and serializes straight to bytes in pydantic-core, and json_response sends
+  those bytes as they are.
+"""
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to stdlib json
+    orjson = None
+
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema: Any) -> TypeAdapter:
+    """Cached TypeAdapter for a response schema (e.g. List[ProductResponse])"""
+    return TypeAdapter(schema)
+
+
+def dump_json(schema: Any, value: Any) -> bytes:
+    """Validate ORM objects (or dicts) against `schema` and serialize to JSON bytes"""
+    adapter = type_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+def json_response(body: bytes, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Response for an already serialized JSON body"""
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,114 @@
+"""
+Query plan inspection
+
+Runs EXPLAIN for an ORM query or Core select with its real bound
+parameters, so tests can assert that hot queries are served by an index
+rather than a full table scan:
+
+    plan = explain(db, ProductService(db).listing_query(category="sunglasses"))
+    assert plan.uses_index("ix_products_active_category_created_at_id")
+    assert not plan.full_scans
+
+Supports PostgreSQL (EXPLAIN (FORMAT JSON)) and SQLite (EXPLAIN QUERY PLAN).
+"""
+import json
+import re
+from typing import Any, Dict, Iterator, List, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import Select
+
+_SQLITE_INDEX = re.compile(r"USING (?:COVERING |INTEGER PRIMARY KEY|PRIMARY KEY)?\s*(?:INDEX )?(\w+)?")
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+_PG_INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+class QueryPlan:
+    """Dialect-neutral view of an EXPLAIN result"""
+
+    def __init__(self, dialect: str, steps: List[Dict[str, Any]], raw: Any):
+        self.dialect = dialect
+        self.steps = steps  # {"table", "index", "full_scan", "detail"} per scan node
+        self.raw = raw
+
+    @property
+    def indexes(self) -> List[str]:
+        return [step["index"] for step in self.steps if step["index"]]
+
+    @property
+    def full_scans(self) -> List[str]:
+        """Tables read without an index"""
+        return [step["table"] for step in self.steps if step["full_scan"]]
+
+    def uses_index(self, name: str) -> bool:
+        return name in self.indexes
+
+    def __str__(self) -> str:
+        return "\n".join(step["detail"] for step in self.steps)
+
+
+def explain(db: Session, query: Union[Query, Select]) -> QueryPlan:
+    """Return the plan the database picks for `query`"""
+    statement = query.statement if isinstance(query, Query) else query
+    connection = db.connection()
+    dialect = connection.dialect.name
+
+    if dialect == "postgresql":
+        prefix = "EXPLAIN (FORMAT JSON)"
+    elif dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN"
+    else:
+        raise NotImplementedError(f"EXPLAIN is not supported for {dialect}")
+
+    # Let SQLAlchemy compile and bind the statement as usual, then prefix the
+    # SQL just before it reaches the driver and read the plan rows raw
+    def _prefix_explain(conn, cursor, statement, parameters, context, executemany):
+        return f"{prefix} {statement}", parameters
+
+    event.listen(connection, "before_cursor_execute", _prefix_explain, retval=True)
+    try:
+        result = connection.execute(statement)
+        rows = result.cursor.fetchall()
+        result.close()
+    finally:
+        event.remove(connection, "before_cursor_execute", _prefix_explain)
+
+    if dialect == "postgresql":
+        document = rows[0][0]
+        plan = json.loads(document) if isinstance(document, str) else document
+        return QueryPlan(dialect, list(_postgres_steps(plan[0]["Plan"])), plan)
+    return QueryPlan(dialect, [_sqlite_step(row[-1]) for row in rows], rows)
+
+
+def assert_uses_index(db: Session, query: Union[Query, Select], index_name: str) -> QueryPlan:
+    """Fail unless `query` is planned with `index_name` and no full table scan"""
+    plan = explain(db, query)
+    assert plan.uses_index(index_name), f"Expected index {index_name}, plan was:\n{plan}"
+    assert not plan.full_scans, f"Unexpected full scan of {plan.full_scans}, plan was:\n{plan}"
+    return plan
+
+
+def _postgres_steps(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    node_type = node["Node Type"]
+    if node_type in _PG_INDEX_NODES or node_type == "Seq Scan":
+        yield {
+            "table": node.get("Relation Name"),
+            "index": node.get("Index Name"),
+            "full_scan": node_type == "Seq Scan",
+            "detail": f"{node_type} on {node.get('Relation Name') or node.get('Index Name')}",
+        }
+    for child in node.get("Plans", []):
+        yield from _postgres_steps(child)
+
+
+def _sqlite_step(detail: str) -> Dict[str, Any]:
+    full_scan = _SQLITE_FULL_SCAN.match(detail)
+    index = _SQLITE_INDEX.search(detail)
+    words = detail.split()
+    return {
+        "table": words[1] if len(words) > 1 and words[0] in ("SCAN", "SEARCH") else None,
+        "index": index.group(1) if index and "INDEX" in detail else None,
+        "full_scan": bool(full_scan),
+        "detail": detail,
+    }
@@ -0,0 +1,121 @@
+"""
+Full-text search index for products
+
+PostgreSQL: a GIN index over a weighted tsvector expression
+(title A, brand/model B, description C). Queries repeat the exact same
+expression so the planner can use the index.
+
+SQLite (local development and tests): an FTS5 external-content table,
+products_fts, kept in sync by triggers. It stores only the index, not a copy
+of the rows, and the update trigger fires only when a searchable column
+changes, so stock and price updates don't touch it.
+
+Both are created together with the products table (create_all). Existing
+databases get them from migration 006.
+"""
+from sqlalchemy import DDL, Column, Index, Integer, MetaData, Table, Text, event, func, text
+import sqlalchemy.dialects.postgresql  # noqa: F401 - registers typed to_tsvector() and to_tsquery()
+from sqlalchemy.sql.elements import ColumnElement
+
+SEARCH_CONFIG = "english"
+SQLITE_FTS_TABLE = "products_fts"
+
+# (column, tsvector weight) in ranking order; brand and model share a weight
+SEARCH_COLUMNS = (("title", "A"), ("brand", "B"), ("model", "B"), ("description", "C"))
+
+# bm25() column weights for products_fts, matching SEARCH_COLUMNS
+SQLITE_BM25_WEIGHTS = "10.0, 4.0, 4.0, 1.0"
+
+# Query-side handle on the FTS5 table; it lives outside Base.metadata because
+# its DDL is dialect-specific (see SQLITE_DDL)
+products_fts = Table(
+    SQLITE_FTS_TABLE, MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    *(Column(name, Text) for name, _ in SEARCH_COLUMNS)
+)
+
+_columns = ", ".join(name for name, _ in SEARCH_COLUMNS)
+_new_values = ", ".join(f"new.{name}" for name, _ in SEARCH_COLUMNS)
+_old_values = ", ".join(f"old.{name}" for name, _ in SEARCH_COLUMNS)
+
+SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+    f"{_columns}, content='products', content_rowid='id', tokenize='porter unicode61')",
+
+    f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ai AFTER INSERT ON products BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values}); END",
+
+    f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ad AFTER DELETE ON products BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values}); END",
+
+    f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_au AFTER UPDATE OF {_columns} ON products BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values}); "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values}); END",
+)
+
+
+def search_vector(table: Table) -> ColumnElement:
+    """
+    Weighted tsvector over the searchable columns (PostgreSQL).
+    Constants are inlined as text so the index DDL and queries render the
+    same expression.
+    """
+    vector = None
+    for name, weight in SEARCH_COLUMNS:
+        part = func.setweight(
+            func.to_tsvector(
+                text(f"'{SEARCH_CONFIG}'::regconfig"),
+                func.coalesce(table.c[name], text("''"))
+            ),
+            text(f"'{weight}'")
+        )
+        vector = part if vector is None else vector.op("||")(part)
+    return vector
+
+
+def search_query(term: str) -> ColumnElement:
+    """tsquery for user input (PostgreSQL); see tsquery_text()"""
+    return func.to_tsquery(text(f"'{SEARCH_CONFIG}'::regconfig"), tsquery_text(term))
+
+
+def tsquery_text(term: str) -> str:
+    """
+    Quote each word of user input for to_tsquery() and AND them together;
+    the last word matches as a prefix, like fts5_query() on SQLite, so the
+    same search returns the same rows on both backends.
+    """
+    words = [word.replace("\\", "\\\\").replace("'", "''") for word in term.split()]
+    if not words:
+        return ""
+    quoted = [f"'{word}'" for word in words]
+    quoted[-1] += ":*"
+    return " & ".join(quoted)
+
+
+def fts5_query(term: str) -> str:
+    """
+    Quote each word of user input for FTS5 MATCH so operators and
+    punctuation are treated as text; the last word matches as a prefix.
+    """
+    words = [word.replace('"', '""') for word in term.split()]
+    if not words:
+        return ""
+    quoted = [f'"{word}"' for word in words]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def install_product_search(table: Table) -> None:
+    """Attach the dialect-specific search index DDL to the products table"""
+    Index(
+        "ix_products_search",
+        search_vector(table),
+        postgresql_using="gin"
+    ).ddl_if(dialect="postgresql")
+
+    for statement in SQLITE_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(
+        table, "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}").execute_if(dialect="sqlite")
+    )
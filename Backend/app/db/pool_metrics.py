@@ -0,0 +1,155 @@
+"""
+Connection pool instrumentation
+
+Tracks how long requests wait to check out a pooled connection, how many
+checkouts time out, and how many connections are in use or in overflow, so
+pool sizes can be tuned against the Cloud SQL connection limit.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (seconds) of the checkout latency histogram buckets
+CHECKOUT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    """Thread-safe counters and checkout latency histogram for one pool"""
+
+    def __init__(self, buckets: tuple = CHECKOUT_LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded values"""
+        with self._lock:
+            self._bucket_counts = [0] * (len(self.buckets) + 1)
+            self.checkout_count = 0
+            self.checkout_seconds_total = 0.0
+            self.checkout_seconds_max = 0.0
+            self.timeouts = 0
+            self.connects = 0
+            self.invalidations = 0
+
+    def observe_checkout(self, seconds: float):
+        """Record the time spent waiting for a connection"""
+        with self._lock:
+            self.checkout_count += 1
+            self.checkout_seconds_total += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+            for index, upper_bound in enumerate(self.buckets):
+                if seconds <= upper_bound:
+                    self._bucket_counts[index] += 1
+                    break
+            else:
+                self._bucket_counts[-1] += 1
+
+    def record_timeout(self):
+        """Record a checkout that gave up after DB_POOL_TIMEOUT"""
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self):
+        """Record a new DBAPI connection being opened"""
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self):
+        """Record a connection being invalidated (e.g. failed pre-ping)"""
+        with self._lock:
+            self.invalidations += 1
+
+    def histogram(self) -> Dict[str, int]:
+        """Cumulative histogram keyed by bucket upper bound, Prometheus style"""
+        with self._lock:
+            counts = list(self._bucket_counts)
+        histogram = {}
+        running_total = 0
+        for upper_bound, count in zip(self.buckets, counts):
+            running_total += count
+            histogram[str(upper_bound)] = running_total
+        histogram["+Inf"] = running_total + counts[-1]
+        return histogram
+
+    def snapshot(self, pool: Optional[Any] = None) -> Dict[str, Any]:
+        """Return all metrics plus current pool gauges as a JSON-friendly dict"""
+        with self._lock:
+            data = {
+                "checkouts": self.checkout_count,
+                "checkout_seconds_total": round(self.checkout_seconds_total, 6),
+                "checkout_seconds_max": round(self.checkout_seconds_max, 6),
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+        data["checkout_latency_histogram"] = self.histogram()
+
+        if pool is not None:
+            data["pool_class"] = type(pool).__name__
+            # Gauges are only available on queue-based pools
+            gauges = {"size": "size", "idle": "checkedin", "in_use": "checkedout", "overflow": "overflow"}
+            for name, method_name in gauges.items():
+                method = getattr(pool, method_name, None)
+                if callable(method):
+                    data[name] = method()
+            max_overflow = getattr(pool, "_max_overflow", None)
+            if max_overflow is not None:
+                data["max_overflow"] = max_overflow
+            timeout = getattr(pool, "_timeout", None)
+            if timeout is not None:
+                data["timeout"] = timeout
+        return data
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures checkout wait time and timeouts"""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.observe_checkout(time.perf_counter() - start)
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        # Keep accumulating into the same metrics after engine.dispose()
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach pool event listeners that feed the engine's PoolMetrics"""
+    if not isinstance(engine.pool, InstrumentedQueuePool):
+        return
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        engine.pool.metrics.record_connect()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        engine.pool.metrics.record_invalidation()
+
+
+def get_pool_metrics(engine: Engine) -> Dict[str, Any]:
+    """Return pool metrics for an engine, or gauges only for uninstrumented pools"""
+    pool = engine.pool
+    metrics = getattr(pool, "metrics", None)
+    if metrics is None:
+        return {"pool_class": type(pool).__name__, "instrumented": False}
+    return {"instrumented": True, **metrics.snapshot(pool)}
@@ -0,0 +1,141 @@
+"""
+SQL statement instrumentation
+
+Counts statements and database time for the current request (or any block
+wrapped in track_queries), logs statements slower than
+SLOW_QUERY_THRESHOLD_MS together with the route that issued them, and flags
+statements repeated with the same shape within one request (likely N+1).
+assert_max_queries and query_budget let tests fail when a route exceeds its
+declared statement budget.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_active_stats: ContextVar[Tuple["QueryStats", ...]] = ContextVar("query_stats", default=())
+
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|%s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|:\w+))+\s*\)")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block or route issues more statements than its budget"""
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a statement to its shape so repeated lookups compare equal"""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Statements and database time collected for one request or block"""
+
+    def __init__(self, route: str = ""):
+        self.route = route
+        self.statements: List[str] = []
+        self.total_seconds = 0.0
+        self._shapes: Counter = Counter()
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements.append(statement)
+        self.total_seconds += seconds
+        self._shapes[normalize_statement(statement)] += 1
+
+    def repeated_statements(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Statement shapes issued at least `threshold` times"""
+        threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        return [(shape, count) for shape, count in self._shapes.most_common() if count >= threshold]
+
+
+def current_route() -> str:
+    """Route of the innermost active collector, for log messages"""
+    active = _active_stats.get()
+    return active[-1].route if active else ""
+
+
+@contextmanager
+def track_queries(route: str = "") -> Iterator[QueryStats]:
+    """Collect every statement executed in this context"""
+    stats = QueryStats(route or current_route())
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(budget: int) -> Iterator[QueryStats]:
+    """Fail if the block issues more than `budget` statements"""
+    with track_queries() as stats:
+        yield stats
+    check_budget(stats, budget)
+
+
+def check_budget(stats: QueryStats, budget: int) -> None:
+    """Raise QueryBudgetExceeded if `stats` is over `budget`"""
+    if stats.count > budget:
+        listing = "\n".join(f"  {index + 1}. {statement}" for index, statement in enumerate(stats.statements))
+        where = f" on {stats.route}" if stats.route else ""
+        raise QueryBudgetExceeded(f"{stats.count} statements executed{where}, budget is {budget}:\n{listing}")
+
+
+def query_budget(budget: int) -> Callable:
+    """Declare the maximum number of statements a route may issue"""
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__query_budget__ = budget
+        return endpoint
+    return decorator
+
+
+def report_request(stats: QueryStats) -> None:
+    """Log likely N+1 patterns for a finished request"""
+    for shape, count in stats.repeated_statements():
+        logger.warning("Possible N+1 on %s: statement repeated %d times: %s", stats.route, count, shape)
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Attach statement timing listeners to an engine"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+
+        for stats in _active_stats.get():
+            stats.record(statement, elapsed)
+
+        if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            logger.warning(
+                "Slow query (%.1f ms) on %s: %s",
+                elapsed * 1000, current_route() or "<no request>", statement
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        # after_cursor_execute never fires for failed statements
+        connection = context.connection
+        if connection is not None and connection.info.get("query_start_time"):
+            connection.info["query_start_time"].pop()
@@ -0,0 +1,128 @@
+"""
+Read-replica routing
+
+Sessions flagged as read-only (see get_read_db) send their queries to one of
+the configured replicas, picked round-robin. Everything else, and any flush
+from a read-only session, goes to the primary. Replicas that fail to connect
+are taken out of rotation and re-probed after DB_REPLICA_RETRY_INTERVAL
+seconds; when none are available reads fall back to the primary.
+"""
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class _Replica:
+    """A replica engine and its health state"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.healthy = True
+        self.retry_at = 0.0
+        self.failures = 0
+
+
+class ReplicaRouter:
+    """Round-robin selection over healthy replicas with fallback to the primary"""
+
+    def __init__(self, primary: Engine, replicas: Optional[List[Engine]] = None, retry_interval: float = 30):
+        self.primary = primary
+        self.retry_interval = retry_interval
+        self._replicas = [_Replica(replica) for replica in (replicas or [])]
+        self._cycle = itertools.cycle(self._replicas)
+        self._lock = threading.Lock()
+
+        for replica in self._replicas:
+            self._watch(replica)
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replicas)
+
+    def get_read_engine(self) -> Engine:
+        """Return the next available replica, or the primary if none are up"""
+        for _ in range(len(self._replicas)):
+            with self._lock:
+                replica = next(self._cycle)
+            if self._is_available(replica):
+                return replica.engine
+        return self.primary
+
+    def mark_unavailable(self, engine: Engine) -> None:
+        """Take a replica out of rotation until the retry interval has passed"""
+        for replica in self._replicas:
+            if replica.engine is engine:
+                with self._lock:
+                    if replica.healthy:
+                        logger.warning("Read replica %s unavailable, falling back", engine.url.render_as_string())
+                    replica.healthy = False
+                    replica.failures += 1
+                    replica.retry_at = time.monotonic() + self.retry_interval
+                return
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Health of each replica, for metrics"""
+        return [
+            {
+                "url": replica.engine.url.render_as_string(),
+                "healthy": replica.healthy,
+                "failures": replica.failures,
+            }
+            for replica in self._replicas
+        ]
+
+    def _is_available(self, replica: _Replica) -> bool:
+        if replica.healthy:
+            return True
+        if time.monotonic() < replica.retry_at:
+            return False
+        return self._probe(replica)
+
+    def _probe(self, replica: _Replica) -> bool:
+        """Check whether a replica that was marked down has recovered"""
+        try:
+            with replica.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except exc.DBAPIError:
+            self.mark_unavailable(replica.engine)
+            return False
+
+        with self._lock:
+            replica.healthy = True
+        logger.info("Read replica %s back in rotation", replica.engine.url.render_as_string())
+        return True
+
+    def _watch(self, replica: _Replica) -> None:
+        """Mark a replica down when it raises connection-level errors"""
+
+        @event.listens_for(replica.engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, exc.OperationalError):
+                self.mark_unavailable(replica.engine)
+
+
+class RoutingSession(Session):
+    """Session that sends read-only work to replicas and writes to the primary"""
+
+    def __init__(self, router: Optional[ReplicaRouter] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.router = router
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.router is None:
+            return super().get_bind(mapper, clause=clause, **kw)
+        if self.info.get("read_only") and not self._flushing:
+            # Stick to one replica for the lifetime of the session so a
+            # request sees a consistent snapshot
+            if "read_engine" not in self.info:
+                self.info["read_engine"] = self.router.get_read_engine()
+            return self.info["read_engine"]
+        return self.router.primary
@@ -1,11 +1,17 @@
 """
 Database session management
 """
+import math
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 from app.core.config import settings
+from app.db.pool_metrics import InstrumentedQueuePool, instrument_engine
+from app.db.query_stats import instrument_queries
+from app.db.routing import ReplicaRouter, RoutingSession
 
 # Support Cloud SQL Unix socket connections
 # If POSTGRES_SERVER starts with /cloudsql/, use Unix socket connection
@@ -21,15 +27,52 @@ else:
     # Standard TCP connection (local development or IP-based)
     DATABASE_URL = settings.DATABASE_URL
 
+
+def create_db_engine(url: str) -> Engine:
+    """Create an engine using the pool settings from app.core.config"""
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "echo": settings.LOG_LEVEL == "DEBUG",
+    }
+
+    # In-memory SQLite (tests) shares one connection across threads, so the
+    # TestClient's worker thread sees the same database; everything else gets
+    # a sized, instrumented queue pool
+    url_info = make_url(url)
+    in_memory = url_info.get_backend_name() == "sqlite" and url_info.database in (None, "", ":memory:")
+    if in_memory:
+        options.update(poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+
+    db_engine = create_engine(url, **options)
+    instrument_engine(db_engine)
+    if settings.QUERY_INSTRUMENTATION_ENABLED:
+        instrument_queries(db_engine)
+    return db_engine
+
+
 # Create database engine
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.LOG_LEVEL == "DEBUG"
-)
+engine = create_db_engine(DATABASE_URL)
+
+# Read replica engines (optional)
+replica_engines = [create_db_engine(url) for url in settings.replica_urls]
+replica_router = ReplicaRouter(engine, replica_engines, retry_interval=settings.DB_REPLICA_RETRY_INTERVAL)
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    router=replica_router,
+    autocommit=False,
+    autoflush=False,
+    bind=engine
+)
 
 # Create base class for models
 Base = declarative_base()
@@ -42,3 +85,101 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+class LazySession:
+    """
+    Session proxy that only creates the real session (and checks out a pooled
+    connection) the first time it is used.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory or SessionLocal
+        self._session = None
+
+    @property
+    def is_started(self) -> bool:
+        """Whether the underlying session has been created"""
+        return self._session is not None
+
+    def _get_session(self):
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self._get_session(), name)
+
+    def close(self):
+        """Close the underlying session if it was ever created"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+def get_lazy_db():
+    """Dependency to get a database session that is only opened on first use"""
+    db = LazySession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db():
+    """
+    Dependency for read-only routes. Queries go to a read replica when one is
+    configured, and no connection is checked out until the session is used.
+    """
+    db = LazySession(lambda: SessionLocal(info={"read_only": True}))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_primary_read_db():
+    """
+    Dependency for reads that must see the latest commits (responses that
+    get cached, a user's own data right after their writes). Lazy like
+    get_read_db, but always on the primary.
+    """
+    db = LazySession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_session_factory():
+    """
+    Dependency for responses that outlive the request scope (streamed
+    bodies): returns a factory for a read-only session the caller opens and
+    closes itself, since dependency sessions are closed before the body is sent.
+    """
+    return lambda: SessionLocal(info={"read_only": True})
+
+
+def create_health_engine(url: str) -> Engine:
+    """
+    Engine for readiness probes: no pool to wait on, and connect/statement
+    timeouts of DB_READINESS_TIMEOUT so a probe can't hang on a dead database
+    """
+    timeout = settings.DB_READINESS_TIMEOUT
+    backend = make_url(url).get_backend_name()
+    if backend == "postgresql":
+        connect_args = {"connect_timeout": max(1, math.ceil(timeout)), "options": f"-c statement_timeout={int(timeout * 1000)}"}
+    elif backend == "sqlite":
+        connect_args = {"timeout": timeout}
+    else:
+        connect_args = {}
+    return create_engine(url, poolclass=NullPool, connect_args=connect_args)
+
+
+health_engine = create_health_engine(DATABASE_URL)
+
+
+def ping_database(db_engine: Engine = None) -> None:
+    """Run SELECT 1 on the primary; raises if the database can't be reached"""
+    with (db_engine or health_engine).connect() as connection:
+        connection.execute(text("SELECT 1"))
@@ -1,23 +1,38 @@
 """
 Main FastAPI application with proper Swagger UI configuration
 """
+import asyncio
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from fastapi import FastAPI
+from typing import Optional
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html, get_swagger_ui_oauth2_redirect_html
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.core.config import settings
-from app.database import Base, engine
+from app.core.openapi import (
+    OPENAPI_URL,
+    REDOC_URL,
+    SWAGGER_UI_OAUTH2_REDIRECT_URL,
+    SWAGGER_UI_URL,
+    get_openapi_document,
+)
+from app.core.responses import DefaultJSONResponse
+from app.utils.static_files import PrecompressedStaticFiles
+from app.db.base import Base
+from app.db.session import engine, ping_database
 from middleware.error_handler import (
     validation_exception_handler,
     http_exception_handler,
     general_exception_handler
 )
 
-# Create database tables (lazy initialization - only if database is available)
+# Create database tables. Deployments run scripts/init_db.py once instead;
+# workers only do this when DB_CREATE_TABLES_ON_STARTUP is set (local development)
 def init_db():
     """Initialize database tables if database is available"""
     try:
@@ -28,20 +43,19 @@ def init_db():
         print("  The app will start, but database operations will fail until PostgreSQL is running.")
         print("  To start PostgreSQL, run: docker-compose up -d postgres")
 
-# Try to initialize database, but don't fail if it's not available
-init_db()
-
 # Get base directory for static files (needed for favicon)
 base_dir = Path(__file__).resolve().parent.parent
 
 # FastAPI app configuration
 app = FastAPI(
+    default_response_class=DefaultJSONResponse,
     title=settings.PROJECT_NAME,
     description=settings.DESCRIPTION,
     version=settings.VERSION,
-    docs_url="/docs/frame/swagger-ui/index.html",
-    redoc_url="/docs/frame/redoc/index.html",
-    openapi_url="/docs/frame/openapi.json",
+    # Docs routes are registered below so the schema is served as prebuilt bytes
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None,
     tags_metadata=[
         {
             "name": "1. User Signup",
@@ -73,12 +87,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Export-Watermark"],
 )
 
+# Response compression (gzip/brotli above a size threshold, allowlisted content types)
+if settings.COMPRESSION_ENABLED:
+    from app.middleware.compression import CompressionMiddleware
+    app.add_middleware(CompressionMiddleware)
+
 # Rate limiting middleware
 from app.middleware.rate_limit import RateLimitMiddleware
 app.add_middleware(RateLimitMiddleware)
 
+# Per-request SQL statement accounting (Server-Timing header, N+1 warnings)
+if settings.QUERY_INSTRUMENTATION_ENABLED:
+    from app.middleware.query_stats import QueryStatsMiddleware
+    app.add_middleware(QueryStatsMiddleware)
+
 # Swagger authentication middleware (protects /docs routes)
 # Note: Set ENABLE_SWAGGER_AUTH=True in .env to enable
 if settings.ENABLE_SWAGGER_AUTH:
@@ -90,67 +115,70 @@ app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
-# Custom OpenAPI setup for Bearer authentication
+# Custom OpenAPI setup for Bearer authentication (built once, see app.core.openapi)
 def setup_openapi_schema():
-    from fastapi.openapi.utils import get_openapi
-    
-    if app.openapi_schema:
-        return app.openapi_schema
-        
-    openapi_schema = get_openapi(
-        title=app.title,
-        version=app.version,
-        description=app.description,
-        routes=app.routes,
-        tags=app.openapi_tags if hasattr(app, 'openapi_tags') else None,
-    )
-    
-    openapi_schema["components"]["securitySchemes"] = {
-        "Bearer": {
-            "type": "http",
-            "scheme": "bearer",
-            "bearerFormat": "JWT",
-            "description": "Enter JWT token obtained from /login endpoint. Format: Bearer <token>"
-        }
-    }
-    
-    # Add favicon info to OpenAPI schema (for Swagger UI)
-    if "info" in openapi_schema:
-        openapi_schema["info"]["x-logo"] = {
-            "url": "/favicon.ico",
-            "altText": "Frame Flea Logo"
-        }
-    
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
+    return get_openapi_document(app).schema
 
 app.openapi = setup_openapi_schema
 
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_json(request: Request):
+    """OpenAPI schema as pre-serialized bytes (gzip when accepted, 304 on a matching ETag)"""
+    return get_openapi_document(app).response(request)
+
+@app.get(SWAGGER_UI_URL, include_in_schema=False)
+async def swagger_ui_html():
+    """Swagger UI"""
+    return get_swagger_ui_html(
+        openapi_url=OPENAPI_URL,
+        title=f"{app.title} - Swagger UI",
+        oauth2_redirect_url=SWAGGER_UI_OAUTH2_REDIRECT_URL,
+    )
+
+@app.get(SWAGGER_UI_OAUTH2_REDIRECT_URL, include_in_schema=False)
+async def swagger_ui_redirect():
+    """OAuth2 redirect page for Swagger UI"""
+    return get_swagger_ui_oauth2_redirect_html()
+
+@app.get(REDOC_URL, include_in_schema=False)
+async def redoc_html():
+    """ReDoc"""
+    return get_redoc_html(openapi_url=OPENAPI_URL, title=f"{app.title} - ReDoc")
+
 # Mount static files directory for favicon and other static assets
 # Note: Mount this BEFORE including routers to ensure proper route precedence
 static_dir = base_dir / "static"
 if static_dir.exists():
     try:
-        app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+        app.mount("/static", PrecompressedStaticFiles(directory=str(static_dir)), name="static")
         print(f"✓ Static files mounted from: {static_dir}")
     except Exception as e:
         print(f"⚠ Warning: Could not mount static files: {e}")
 
 # Include routers
-from app.routes import auth, users, products, orders, ai_validation, frame, swagger_auth
+from app.routes import auth, users, products, orders, sync, batch, ai_validation, frame, swagger_auth, metrics
 
 app.include_router(auth.router, prefix="/v1/auth", tags=["1. User Signup"])
 app.include_router(swagger_auth.router, prefix="/v1/auth", tags=["1. User Signup"])
 app.include_router(users.router, prefix="/v1/auth", tags=["1. User Signup"])
 app.include_router(products.router, prefix="/v1/products", tags=["Products"])
 app.include_router(orders.router, prefix="/v1/orders", tags=["Orders"])
+app.include_router(sync.router, prefix="/v1/sync", tags=["Sync"])
+app.include_router(batch.router, prefix="/v1/batch", tags=["Batch"])
 app.include_router(ai_validation.router, prefix="/v1", tags=["2. Flame Flow"])
 app.include_router(frame.router, prefix="/v1/frame", tags=["2. Flame Flow"])
+app.include_router(metrics.router, tags=["Health"])
 
 # Startup event to verify favicon
 @app.on_event("startup")
 async def startup_event():
-    """Verify favicon exists on startup"""
+    """Verify favicon exists and build the OpenAPI document on startup"""
+    if settings.DB_CREATE_TABLES_ON_STARTUP:
+        await run_in_threadpool(init_db)
+    if settings.AI_WARMUP_ON_STARTUP:
+        from app.services.ai_validation_service import warmup
+        await run_in_threadpool(warmup)
+    get_openapi_document(app)
     favicon_path = base_dir / "static" / "favicon.ico"
     if favicon_path.exists():
         print(f"✓ Favicon found at: {favicon_path}")
@@ -167,6 +195,31 @@ async def health_check():
         "project": settings.PROJECT_NAME
     }
 
+# Readiness probes run on their own thread, one at a time: a probe stuck on a
+# dead database never takes threads from the shared pool that sync endpoints use
+_readiness_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readiness")
+_readiness_probe: Optional[Future] = None
+
+@app.get("/health/ready", tags=["Health"])
+async def readiness_check():
+    """
+    Readiness check: the worker can reach the database.
+    The query runs off the event loop with connect/statement timeouts, and
+    a probe still running is awaited instead of starting another one.
+    """
+    global _readiness_probe
+    if _readiness_probe is None or _readiness_probe.done():
+        _readiness_probe = _readiness_executor.submit(ping_database)
+    try:
+        # Shielded: a timed-out request must not cancel the probe other requests are awaiting
+        await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(_readiness_probe)), timeout=settings.DB_READINESS_TIMEOUT)
+    except Exception:
+        return DefaultJSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "database": "unavailable"}
+        )
+    return {"status": "ready", "database": "ok"}
+
 @app.get("/", tags=["Health"])
 async def root():
     """Root endpoint"""
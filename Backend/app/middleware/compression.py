@@ -0,0 +1,178 @@
+"""
+Response compression middleware
+
+gzip (or brotli, when the `brotli` package is installed and the client
+accepts it) for responses whose content type is on an allowlist and whose
+body is at least a minimum size, so small responses and already-compressed
+media don't pay compression CPU. Written as a pure ASGI middleware so
+streamed responses (the catalog export) are compressed chunk by chunk
+instead of being buffered.
+"""
+import zlib
+from typing import Dict, Iterable, List, Optional, Set
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+def encoding_qualities(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """Content codings named in an Accept-Encoding header with their q-values (q=0 included)"""
+    qualities = {}
+    for part in (accept_encoding or "").lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = params.strip()
+        try:
+            q = float(quality[2:]) if quality.startswith("q=") else 1.0
+        except ValueError:
+            continue
+        if coding:
+            qualities[coding] = q
+    return qualities
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Set[str]:
+    """Content codings an Accept-Encoding header allows (q=0 excluded)"""
+    return {coding for coding, q in encoding_qualities(accept_encoding).items() if q > 0}
+
+
+def preferred_encodings(accept_encoding: Optional[str], available: Iterable[str] = ("br", "gzip")) -> List[str]:
+    """The `available` codings this client accepts, highest q first (ties keep the server's order)"""
+    qualities = encoding_qualities(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    ranked = [(qualities.get(encoding, wildcard), encoding) for encoding in available]
+    return [encoding for q, encoding in sorted(ranked, key=lambda item: -item[0]) if q > 0]
+
+
+class _Compressor:
+    """Incremental gzip/brotli encoder"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=min(level, 11))
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + (self._brotli.finish() if final else self._brotli.flush())
+        # Sync-flush each streamed chunk so clients can consume it as it arrives
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """Compress eligible responses for clients that accept gzip or brotli"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = None,
+        content_types: List[str] = None,
+        level: int = None,
+        brotli_enabled: bool = None
+    ):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+        self.content_types = tuple(content_types or settings.compression_content_types)
+        self.level = settings.COMPRESSION_LEVEL if level is None else level
+        brotli_enabled = settings.COMPRESSION_BROTLI if brotli_enabled is None else brotli_enabled
+        self.encodings = ("br", "gzip") if brotli_enabled and brotli is not None else ("gzip",)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encodings = preferred_encodings(request_headers.get("accept-encoding"), self.encodings)
+        if not encodings:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponse(self, encodings[0], send, request_headers.get("if-none-match")).run(scope, receive)
+
+    def is_compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in self.content_types
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    # The encoded bytes are a different representation: a strong ETag no longer applies
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class _CompressedResponse:
+    """Per-response state: decides on the first body message whether to compress"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send, if_none_match: Optional[str] = None):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.if_none_match = if_none_match or ""
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.handle)
+
+    async def handle(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            if message["status"] == 304:
+                # A client revalidating the weak validator of a compressed 200 gets that same validator back
+                not_modified_headers = MutableHeaders(raw=message["headers"])
+                etag = not_modified_headers.get("etag")
+                if etag and f"W/{etag}" in self.if_none_match:
+                    _weaken_etag(not_modified_headers)
+                not_modified_headers.add_vary_header("Accept-Encoding")
+            if message["status"] in (204, 304) or not self.middleware.is_compressible(headers):
+                self.passthrough = True
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+
+            self.compressor = _Compressor(self.encoding, self.middleware.level)
+            headers["Content-Encoding"] = self.encoding
+            _weaken_etag(headers)
+            if more_body:
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+            else:
+                body = self.compressor.compress(body, final=True)
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(self.start)
+
+        await self.send({
+            "type": "http.response.body",
+            "body": self.compressor.compress(body, final=not more_body),
+            "more_body": more_body,
+        })
@@ -0,0 +1,40 @@
+"""
+Per-request SQL statement accounting
+"""
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import settings
+from app.db.query_stats import track_queries, report_request, check_budget
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """
+    Count statements and database time for each request:
+    - Adds a Server-Timing header (db;dur=<ms>;desc="<n> queries")
+    - Logs statement shapes repeated within the request (possible N+1)
+    - Enforces @query_budget on routes when QUERY_BUDGET_ENFORCE is set
+
+    Stats are finalized when the endpoint returns, before the body is sent
+    (the header has to go out with it). Statements run while a
+    StreamingResponse body is generated, such as the rows of
+    GET /v1/products/export, are not counted or budgeted; the slow-query
+    log still records them individually.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        """Process request inside a statement collector"""
+        with track_queries(f"{request.method} {request.url.path}") as stats:
+            response = await call_next(request)
+
+        report_request(stats)
+
+        route = request.scope.get("route")
+        budget = getattr(getattr(route, "endpoint", None), "__query_budget__", None)
+        if budget is not None and settings.QUERY_BUDGET_ENFORCE:
+            check_budget(stats, budget)
+
+        response.headers.append(
+            "Server-Timing",
+            f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries"'
+        )
+        return response
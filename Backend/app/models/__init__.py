@@ -1,5 +1,11 @@
 # Models Package
 from app.models.user import User
 from app.models.refresh_token import RefreshToken
+from app.models.product import Product
+from app.models.product_image import ProductImage
+from app.models.product_facet import ProductFacetCount
+from app.models.order import Order, OrderItem
+from app.models.review import Review
+from app.models.idempotency_key import IdempotencyKey
 
-__all__ = ["User", "RefreshToken"]
+__all__ = ["User", "RefreshToken", "Product", "ProductImage", "ProductFacetCount", "Order", "OrderItem", "Review", "IdempotencyKey"]
@@ -0,0 +1,27 @@
+"""
+Idempotency key model for replaying responses to retried requests
+"""
+from sqlalchemy import Column, String, Text, Integer, DateTime, JSON, UniqueConstraint
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """Stored response for a client-supplied Idempotency-Key"""
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+    )
+
+    # Key information
+    scope = Column(String(100), nullable=False)  # endpoint (and user) the key belongs to
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)  # fingerprint of the original request body
+
+    # Stored response (status_code is NULL while the first request is still running)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    response_headers = Column(JSON, nullable=True)
+
+    # Expiry (short lease while in progress, then the replay TTL)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,7 +1,7 @@
 """
 Order and OrderItem models
 """
-from sqlalchemy import Column, String, Text, Integer, Float, Boolean, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, String, Text, Integer, Float, Boolean, ForeignKey, Enum, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 import enum
@@ -31,6 +31,10 @@ class Order(Base):
     """Order model"""
     
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_buyer_id_created_at_id", "buyer_id", "created_at", "id"),  # keyset pagination
+        Index("ix_orders_buyer_id_updated_at_id", "buyer_id", "updated_at", "id"),  # delta sync
+    )
     
     # Order information
     order_number = Column(String(50), unique=True, index=True, nullable=False)
@@ -54,6 +58,9 @@ class Order(Base):
     shipping_country = Column(String(100), nullable=True)
     shipping_postal_code = Column(String(20), nullable=True)
     
+    # Inventory reservation (cleared once paid; expired unpaid orders are cancelled)
+    reserved_until = Column(DateTime, nullable=True, index=True)
+    
     # Tracking
     tracking_number = Column(String(100), nullable=True)
     estimated_delivery = Column(DateTime, nullable=True)
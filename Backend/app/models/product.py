@@ -1,9 +1,10 @@
 """
 Product model for marketplace items
 """
-from sqlalchemy import Column, String, Text, Integer, Float, Boolean, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, String, Text, Integer, Float, Boolean, ForeignKey, Enum, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.fulltext import install_product_search
 import enum
 
 
@@ -72,3 +73,27 @@ class Product(Base):
     order_items = relationship("OrderItem", back_populates="product")
     reviews = relationship("Review", back_populates="product")
     images = relationship("ProductImage", back_populates="product")
+
+
+# Listing access paths (see ProductService.get_products). Listings only show
+# active products, so the partial indexes leave soft-deleted rows out entirely.
+_active = Product.is_active == True
+
+Index(
+    "ix_products_active_created_at_id", Product.created_at, Product.id,
+    postgresql_where=_active, sqlite_where=_active
+)
+Index(
+    "ix_products_active_category_created_at_id", Product.category, Product.created_at, Product.id,
+    postgresql_where=_active, sqlite_where=_active
+)
+Index(
+    "ix_products_active_featured_created_at_id", Product.is_featured, Product.created_at, Product.id,
+    postgresql_where=_active, sqlite_where=_active
+)
+# Incremental export/sync: rows changed after a watermark, in (updated_at, id) order
+Index("ix_products_updated_at_id", Product.updated_at, Product.id)
+# Seller's listings (User.products) and the seller foreign key
+Index("ix_products_seller_id_is_active", Product.seller_id, Product.is_active)
+
+install_product_search(Product.__table__)
@@ -0,0 +1,18 @@
+"""
+Precomputed facet counts for the product catalog
+"""
+from sqlalchemy import Column, String, Integer, UniqueConstraint
+from app.db.base import Base
+
+
+class ProductFacetCount(Base):
+    """Number of active products per facet value (e.g. brand=Ray-Ban)"""
+    
+    __tablename__ = "product_facet_counts"
+    __table_args__ = (
+        UniqueConstraint("facet", "value", name="uq_product_facet_counts_facet_value"),
+    )
+    
+    facet = Column(String(20), nullable=False)  # category, condition, brand, color, material, price
+    value = Column(String(100), nullable=False)
+    count = Column(Integer, default=0, nullable=False)
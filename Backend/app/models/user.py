@@ -38,7 +38,7 @@ class User(Base):
     last_login = Column(DateTime, nullable=True)
     email_verified_at = Column(DateTime, nullable=True)
     
-    # Relationships (commented out for now to avoid circular imports)
-    # products = relationship("Product", back_populates="seller")
-    # orders = relationship("Order", back_populates="buyer")
-    # reviews = relationship("Review", back_populates="user")
+    # Relationships (related models are registered in app.models)
+    products = relationship("Product", back_populates="seller")
+    orders = relationship("Order", back_populates="buyer")
+    reviews = relationship("Review", back_populates="user")
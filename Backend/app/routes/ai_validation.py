@@ -3,7 +3,7 @@ AI validation endpoints for sunglasses detection
 """
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_lazy_db
 from app.services.ai_validation_service import AIValidationService
 from app.schemas.ai_validation import ValidationRequest, ValidationResponse
 
@@ -13,7 +13,7 @@ router = APIRouter()
 @router.post("/validate-sunglasses", response_model=ValidationResponse)
 async def validate_sunglasses(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_lazy_db)
 ):
     """Validate if uploaded image contains sunglasses"""
     try:
@@ -48,7 +48,7 @@ async def validate_sunglasses(
 @router.post("/validate-sunglasses-base64", response_model=ValidationResponse)
 async def validate_sunglasses_base64(
     request: ValidationRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_lazy_db)
 ):
     """Validate base64 encoded image for sunglasses"""
     try:
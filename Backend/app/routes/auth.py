@@ -1,11 +1,11 @@
 """
 Authentication endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, status, Header
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+from typing import Optional
 from app.db.session import get_db
 from app.schemas.user import (
     UserCreate, UserResponse, Token, LoginRequest, 
@@ -13,6 +13,7 @@ from app.schemas.user import (
 )
 from app.services.user_service import UserService
 from app.services.refresh_token_service import RefreshTokenService
+from app.services.idempotency_service import IdempotencyService, IdempotencyError, secret_digest
 from app.core.security import (
     create_access_token, verify_password, validate_password
 )
@@ -54,18 +55,43 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="v1/auth/login")
     **Response Headers:**
     - `createdOn`: Timestamp when the account was created (ISO 8601 format, e.g., "2019-10-11T08:00:00Z")
     - `updatedOn`: Timestamp when the account was last updated (ISO 8601 format, e.g., "2019-10-11T08:00:00Z")
+    
+    **Retries:**
+    Send an `Idempotency-Key` header to make retries safe; a repeated key replays
+    the original response without creating the account again.
     """
 )
-async def register(user_data: UserSignupRequest, db: Session = Depends(get_db)):
+async def register(
+    user_data: UserSignupRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: Session = Depends(get_db)
+):
     """
     Register a new user with all signup fields.
     Returns user data in body and createdOn/updatedOn in response headers.
     """
     user_service = UserService(db)
     
+    # Replay a completed signup for a retried key. The password enters the
+    # fingerprint only as a keyed digest, so a different client reusing the
+    # key with the same profile fields gets 422 instead of the stored response
+    idempotency = IdempotencyService(db)
+    try:
+        replay = idempotency.begin(
+            "auth:register", idempotency_key, {
+                **user_data.model_dump(exclude={"password", "rePassword"}),
+                "password": secret_digest(user_data.password),
+            }
+        )
+    except IdempotencyError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    if replay is not None:
+        return replay
+    
     # Validate password strength
     is_valid, error_msg = validate_password(user_data.password)
     if not is_valid:
+        idempotency.abandon()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=error_msg
@@ -87,9 +113,9 @@ async def register(user_data: UserSignupRequest, db: Session = Depends(get_db)):
             "phoneNumber": result["phoneNumber"]
         }
         
-        # Return JSONResponse with timestamps in headers
-        return JSONResponse(
-            content=response_body,
+        # Return response with timestamps in headers (stored for idempotent replays)
+        return idempotency.complete(
+            response_body,
             status_code=status.HTTP_201_CREATED,
             headers={
                 "createdOn": created_on,
@@ -97,10 +123,14 @@ async def register(user_data: UserSignupRequest, db: Session = Depends(get_db)):
             }
         )
     except ValueError as e:
+        idempotency.abandon()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(e)
         )
+    except Exception:
+        idempotency.abandon()
+        raise
 
 
 @router.post("/login", response_model=Token, summary="Login and get access token")
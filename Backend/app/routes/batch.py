@@ -0,0 +1,44 @@
+"""
+Batch endpoint: several GETs in one round trip
+"""
+from fastapi import APIRouter, Depends, Request
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.api.v1.dependencies import AUTHENTICATED_USER_STATE
+from app.core.security import verify_token
+from app.db.session import get_lazy_db
+from app.schemas.batch import BatchRequest, BatchResponse
+from app.services.batch_service import BatchService
+from app.services.user_service import UserService
+
+router = APIRouter()
+
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
+
+
+@router.post("/", response_model=BatchResponse)
+async def batch(
+    batch_request: BatchRequest,
+    request: Request,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_lazy_db)
+):
+    """
+    Run up to BATCH_MAX_REQUESTS independent GET requests concurrently and
+    return all their responses. The Authorization header applies to every
+    sub-request; the user is looked up once for the whole batch.
+    """
+    state = {}
+    if token:
+        user_id = verify_token(token)
+        user = UserService(db).get_user_by_id(int(user_id)) if user_id is not None else None
+        if user is not None:
+            # Sub-requests run concurrently, sync ones in threadpool threads:
+            # share a detached copy so none of them loads through this session
+            db.expunge(user)
+            state[AUTHENTICATED_USER_STATE] = (token, user)
+    
+    batch_service = BatchService(request.app, request.scope, state)
+    responses = await batch_service.run(batch_request.requests)
+    return {"responses": responses}
@@ -4,7 +4,7 @@ Frame validation endpoints
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
-from app.db.session import get_db
+from app.db.session import get_lazy_db
 # Note: You'll need to create these schemas and services
 # from app.schemas.frame import FrameCreate, FrameResponse, FrameUpdate
 # from app.services.frame_service import FrameService
@@ -15,7 +15,7 @@ router = APIRouter()
 @router.post("/register", summary="Register a new frame")
 async def register_frame(
     # frame_data: FrameCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_lazy_db)
 ):
     """Register a new frame for validation"""
     # Placeholder implementation - replace with actual frame service
@@ -28,7 +28,7 @@ async def register_frame(
 
 @router.get("/", summary="Get all frames")
 async def get_all_frames(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_lazy_db)
 ):
     """Get list of all frames"""
     # Placeholder implementation - replace with actual frame service
@@ -41,7 +41,7 @@ async def get_all_frames(
 @router.get("/{frame_id}", summary="Get frame by ID")
 async def get_frame(
     frame_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_lazy_db)
 ):
     """Get frame details by ID"""
     # Placeholder implementation - replace with actual frame service
@@ -56,7 +56,7 @@ async def get_frame(
 async def update_frame(
     frame_id: str,
     # frame_update: FrameUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_lazy_db)
 ):
     """Update frame details by ID"""
     # Placeholder implementation - replace with actual frame service
@@ -70,7 +70,7 @@ async def update_frame(
 @router.delete("/{frame_id}", summary="Delete frame by ID")
 async def delete_frame(
     frame_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_lazy_db)
 ):
     """Delete frame by ID"""
     # Placeholder implementation - replace with actual frame service
@@ -0,0 +1,43 @@
+"""
+Runtime metrics endpoints
+"""
+import hmac
+import os
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from app.core.config import settings
+from app.db.session import engine, replica_engines, replica_router
+from app.db.pool_metrics import get_pool_metrics
+
+router = APIRouter()
+
+
+def require_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """Require `Authorization: Bearer <METRICS_TOKEN>` when a metrics token is configured"""
+    if not settings.METRICS_TOKEN:
+        return
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/metrics", summary="Runtime metrics for this worker", dependencies=[Depends(require_metrics_token)])
+async def get_metrics():
+    """
+    Return metrics for the worker that served the request.
+    Each gunicorn worker has its own pool, so totals must be summed across workers.
+    Requires the METRICS_TOKEN bearer token when one is set; without it the
+    endpoint is open and must only be reachable from the internal network.
+    """
+    return {
+        "pid": os.getpid(),
+        "db_pool": get_pool_metrics(engine),
+        "db_replicas": [
+            {**replica, "pool": get_pool_metrics(replica_engine)}
+            for replica, replica_engine in zip(replica_router.status(), replica_engines)
+        ],
+    }
@@ -1,45 +1,73 @@
 """
 Order management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.db.session import get_db
+from app.db.session import get_db, get_primary_read_db
 from app.schemas.order import OrderResponse, OrderCreate, OrderUpdate
-from app.services.order_service import OrderService
+from app.services.order_service import OrderConflictError, OrderService, ProductUnavailableError
+from app.services.inventory_service import InsufficientInventoryError
+from app.services.idempotency_service import IdempotencyService, IdempotencyError
 from app.api.v1.dependencies import get_current_user
+from app.db.query_stats import query_budget
+from app.core.responses import json_response
+from app.utils.fields import InvalidFieldsError, dump_fields, parse_fields
+from app.utils.pagination import InvalidCursorError, NEXT_CURSOR_HEADER, next_cursor
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[OrderResponse])
+@query_budget(3)  # current user, orders page, items for the page
 async def get_orders(
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Deprecated: use cursor"),
     limit: int = Query(100, ge=1, le=100),
     status: Optional[str] = None,
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields, e.g. id,order_number,status,total_amount"),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_primary_read_db)
 ):
-    """Get user's orders"""
+    """
+    Get user's orders, newest first.
+    Read from the primary, so an order shows up as soon as it was created.
+    The X-Next-Cursor response header holds the cursor for the next page.
+    `fields` returns (and loads) only the named fields of each order.
+    """
     order_service = OrderService(db)
-    orders = order_service.get_user_orders(
-        user_id=current_user["id"],
-        skip=skip,
-        limit=limit,
-        status=status
-    )
-    return orders
+    try:
+        selected = parse_fields(fields, OrderResponse)
+        orders = order_service.get_user_orders(
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            status=status,
+            cursor=cursor,
+            fields=selected
+        )
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    headers = {}
+    cursor_out = next_cursor(orders, limit)
+    if cursor_out:
+        headers[NEXT_CURSOR_HEADER] = cursor_out
+    return json_response(dump_fields(OrderResponse, selected, orders, many=True), headers=headers)
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
+@query_budget(3)  # current user, order, its items
 async def get_order(
     order_id: int,
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_primary_read_db)
 ):
     """Get order by ID"""
     order_service = OrderService(db)
-    order = order_service.get_order_by_id(order_id, current_user["id"])
+    order = order_service.get_order_by_id(order_id, current_user.id)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,27 +79,70 @@ async def get_order(
 @router.post("/", response_model=OrderResponse)
 async def create_order(
     order_data: OrderCreate,
-    current_user: dict = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Create a new order"""
+    """
+    Create a new order.
+    Send an `Idempotency-Key` header to make retries safe: a repeated key
+    replays the original response instead of creating another order.
+    """
+    idempotency = IdempotencyService(db)
+    try:
+        replay = idempotency.begin(
+            f"orders:create:{current_user.id}", idempotency_key, order_data.model_dump(mode="json")
+        )
+    except IdempotencyError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    if replay is not None:
+        return replay
+    
     order_service = OrderService(db)
-    order = order_service.create_order(order_data, current_user["id"])
-    return order
+    try:
+        # The order commits together with its stored response, so a retry
+        # after a crash either replays it or finds no order was created
+        order = order_service.create_order(order_data, current_user.id, commit=False)
+        return idempotency.complete(OrderResponse.model_validate(order).model_dump(mode="json"))
+    except ProductUnavailableError as e:
+        idempotency.abandon()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except InsufficientInventoryError as e:
+        idempotency.abandon()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception:
+        idempotency.abandon()
+        raise
 
 
 @router.put("/{order_id}", response_model=OrderResponse)
 async def update_order(
     order_id: int,
     order_update: OrderUpdate,
-    current_user: dict = Depends(get_current_user),
+    current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Update order status"""
+    """
+    Update order status.
+    Paying takes over the stock reservation (409 if it already expired);
+    cancelling returns the order's stock, whether reserved or paid for.
+    """
     order_service = OrderService(db)
-    order = order_service.update_order(
-        order_id, order_update, current_user["id"]
-    )
+    try:
+        order = order_service.update_order(
+            order_id, order_update, current_user.id
+        )
+    except OrderConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
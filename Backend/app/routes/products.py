@@ -1,75 +1,294 @@
 """
 Product management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.db.session import get_db
-from app.schemas.product import ProductResponse, ProductCreate, ProductUpdate
-from app.services.product_service import ProductService
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.responses import dump_json, json_response
+from app.db.session import get_db, get_primary_read_db, get_read_db, get_read_session_factory
+from app.models.product import ProductCategory, ProductCondition
+from app.schemas.product import (
+    ProductResponse, ProductCreate, ProductUpdate, ProductBrowseResponse,
+    ProductBulkCreateRequest, ProductBulkUpdateRequest, ProductBulkResponse
+)
+from app.services.export_service import EXPORT_FORMATS, ProductExportService
+from app.services.product_service import ProductService, PRODUCT_LIST_TAG, product_tag
 from app.api.v1.dependencies import get_current_user
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.fields import InvalidFieldsError, dump_fields, parse_fields
+from app.utils.pagination import InvalidCursorError, NEXT_CURSOR_HEADER, next_cursor
 
 router = APIRouter()
 
 
+def get_cacheable_read_db(
+    primary: Session = Depends(get_primary_read_db),
+    replica: Session = Depends(get_read_db)
+) -> Session:
+    """
+    Session for responses that may be cached. While the cache is on, misses
+    read the primary: a fill from a lagging replica right after a write would
+    store the old rows (and ETag) under the new tag version, for every worker,
+    until the TTL. Both sessions are lazy, so the unused one costs nothing.
+    """
+    return primary if settings.RESPONSE_CACHE_ENABLED else replica
+
+
+def _tag_versions(tags: List[str]) -> Optional[List[int]]:
+    """Snapshot of the cache tag versions, taken before reading the data a response is built from"""
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None
+    return response_cache.tag_versions(tags)
+
+
+def _cached_response(request: Request, key: str, tags: List[str], versions: Optional[List[int]]) -> Optional[Response]:
+    """Serve a stored response (or 304 for its ETag), if caching is on and no tag changed since"""
+    if versions is None:
+        return None
+    cached = response_cache.get(key, tags, versions)
+    if cached is None:
+        return None
+    etag = cached.headers.get("ETag")
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+    return json_response(cached.body, headers={**cached.headers, "X-Cache": "HIT"})
+
+
+def _cache_response(key: str, tags: List[str], versions: Optional[List[int]], body: bytes, headers: dict = None) -> Response:
+    """Store a serialized response body under the versions snapshotted before the query, and return it"""
+    headers = headers or {}
+    if versions is not None:
+        response_cache.set(key, tags, body, headers, versions)
+    return json_response(body, headers={**headers, "X-Cache": "MISS"})
+
+
 @router.get("/", response_model=List[ProductResponse])
 async def get_products(
-    skip: int = Query(0, ge=0),
+    request: Request,
+    skip: int = Query(0, ge=0, description="Deprecated: use cursor"),
     limit: int = Query(100, ge=1, le=100),
     category: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    featured: Optional[bool] = None,
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields, e.g. id,title,price,primary_image_url"),
+    db: Session = Depends(get_cacheable_read_db)
 ):
-    """Get list of products with optional filtering"""
+    """
+    Get list of products with optional filtering, newest first.
+    The X-Next-Cursor response header holds the cursor for the next page.
+    `search` matches title, brand, model and description, best matches first
+    (search results are paged with `skip`).
+    `fields` returns (and loads) only the named fields of each product.
+    Responses are cached until a product changes, and carry an ETag for
+    If-None-Match revalidation (304 Not Modified).
+    """
+    try:
+        selected = parse_fields(fields, ProductResponse)
+    except InvalidFieldsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    filters = {
+        "skip": skip, "limit": limit, "category": category,
+        "search": search, "featured": featured, "cursor": cursor,
+    }
+    cache_key = response_cache.make_key("products:list", [*filters.items(), ("fields", selected)])
+    tags = [PRODUCT_LIST_TAG]
+    versions = _tag_versions(tags)
+    cached = _cached_response(request, cache_key, tags, versions)
+    if cached is not None:
+        return cached
+    
     product_service = ProductService(db)
-    products = product_service.get_products(
-        skip=skip,
-        limit=limit,
-        category=category,
-        search=search
+    try:
+        # Revalidation: compare against (id, updated_at) of the page before loading rows
+        if request.headers.get("if-none-match"):
+            etag = make_etag(cache_key, product_service.get_listing_versions(**filters))
+            if etag_matches(request, etag):
+                return not_modified(etag)
+        
+        products = product_service.get_products(**filters, fields=selected)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    headers = {"ETag": make_etag(cache_key, [(p.id, p.updated_at) for p in products])}
+    cursor_out = None if search else next_cursor(products, limit)
+    if cursor_out:
+        headers[NEXT_CURSOR_HEADER] = cursor_out
+    return _cache_response(cache_key, tags, versions, dump_fields(ProductResponse, selected, products, many=True), headers)
+
+
+@router.get("/browse", response_model=ProductBrowseResponse)
+async def browse_products(
+    category: Optional[List[ProductCategory]] = Query(None),
+    condition: Optional[List[ProductCondition]] = Query(None),
+    brand: Optional[List[str]] = Query(None),
+    color: Optional[List[str]] = Query(None),
+    material: Optional[List[str]] = Query(None),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Browse products with multi-facet filters.
+    Repeat a parameter to match any of several values (e.g. ?brand=Oakley&brand=Persol);
+    different facets must all match. Facet counts cover the whole active catalog.
+    """
+    product_service = ProductService(db)
+    try:
+        products, facets = product_service.browse(
+            limit=limit,
+            cursor=cursor,
+            categories=category,
+            conditions=condition,
+            brands=brand,
+            colors=color,
+            materials=material,
+            min_price=min_price,
+            max_price=max_price
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return json_response(dump_json(ProductBrowseResponse, {
+        "items": products, "facets": facets, "next_cursor": next_cursor(products, limit)
+    }))
+
+
+@router.get("/export")
+async def export_products(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[datetime] = Query(None, description="Only products updated after this (X-Export-Watermark of a previous export)"),
+    session_factory = Depends(get_read_session_factory)
+):
+    """
+    Stream the catalog as NDJSON or CSV.
+    Without `since` every active product is exported; with `since`, every
+    product updated after it, including deactivated ones (is_active false).
+    The X-Export-Watermark header is the `since` value for the next export.
+    """
+    if since is not None and since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    export_service = ProductExportService(session_factory)
+    watermark = export_service.get_watermark()
+    headers = {"Content-Disposition": f'attachment; filename="products.{format}"'}
+    if watermark is not None:
+        headers["X-Export-Watermark"] = watermark.isoformat()
+    elif since is not None:
+        headers["X-Export-Watermark"] = since.isoformat()
+    
+    return StreamingResponse(
+        export_service.stream(format, watermark, since=since),
+        media_type=EXPORT_FORMATS[format],
+        headers=headers,
+        # Closes the session if the body was never streamed (client went away)
+        background=BackgroundTask(export_service.close)
     )
-    return products
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
+    request: Request,
     product_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_cacheable_read_db)
 ):
-    """Get product by ID"""
+    """
+    Get product by ID (cached until the product changes).
+    Send If-None-Match with a previous ETag to get 304 Not Modified.
+    """
+    cache_key = response_cache.make_key(f"products:{product_id}")
+    tags = [product_tag(product_id)]
+    versions = _tag_versions(tags)
+    cached = _cached_response(request, cache_key, tags, versions)
+    if cached is not None:
+        return cached
+    
     product_service = ProductService(db)
+    
+    # Revalidation: a single-column version lookup instead of loading the row
+    if request.headers.get("if-none-match"):
+        updated_at = product_service.get_product_version(product_id)
+        if updated_at is not None:
+            etag = make_etag("product", [(product_id, updated_at)])
+            if etag_matches(request, etag):
+                return not_modified(etag)
+    
     product = product_service.get_product_by_id(product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
-    return product
+    etag = make_etag("product", [(product.id, product.updated_at)])
+    return _cache_response(cache_key, tags, versions, dump_json(ProductResponse, product), {"ETag": etag})
 
 
 @router.post("/", response_model=ProductResponse)
 async def create_product(
     product_data: ProductCreate,
-    current_user: dict = Depends(get_current_user),
+    current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new product"""
     product_service = ProductService(db)
-    product = product_service.create_product(product_data, current_user["id"])
+    product = product_service.create_product(product_data, current_user.id)
     return product
 
 
+def _bulk_response(results: List[dict], success: str) -> ProductBulkResponse:
+    succeeded = sum(1 for result in results if result["status"] == success)
+    return ProductBulkResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+@router.post("/bulk", response_model=ProductBulkResponse)
+async def bulk_create_products(
+    bulk_data: ProductBulkCreateRequest,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create up to PRODUCT_BULK_MAX_ITEMS products in one transaction, with a result per item"""
+    product_service = ProductService(db)
+    results = product_service.bulk_create_products(bulk_data.items, current_user.id)
+    return _bulk_response(results, "created")
+
+
+@router.patch("/bulk", response_model=ProductBulkResponse)
+async def bulk_update_products(
+    bulk_data: ProductBulkUpdateRequest,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Update up to PRODUCT_BULK_MAX_ITEMS of your products in one transaction, with a result per item"""
+    product_service = ProductService(db)
+    results = product_service.bulk_update_products(bulk_data.items, current_user.id)
+    return _bulk_response(results, "updated")
+
+
 @router.put("/{product_id}", response_model=ProductResponse)
 async def update_product(
     product_id: int,
     product_update: ProductUpdate,
-    current_user: dict = Depends(get_current_user),
+    current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update product (only by owner)"""
     product_service = ProductService(db)
     product = product_service.update_product(
-        product_id, product_update, current_user["id"]
+        product_id, product_update, current_user.id
     )
     if not product:
         raise HTTPException(
@@ -82,12 +301,12 @@ async def update_product(
 @router.delete("/{product_id}")
 async def delete_product(
     product_id: int,
-    current_user: dict = Depends(get_current_user),
+    current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete product (only by owner)"""
     product_service = ProductService(db)
-    success = product_service.delete_product(product_id, current_user["id"])
+    success = product_service.delete_product(product_id, current_user.id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,38 @@
+"""
+Delta sync endpoint for client-side caches
+"""
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.config import settings
+from app.core.responses import dump_json, json_response
+from app.db.session import get_read_db
+from app.schemas.sync import SyncResponse
+from app.services.sync_service import SyncService
+from app.api.v1.dependencies import get_current_user
+from app.utils.pagination import InvalidCursorError
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SyncResponse)
+async def sync(
+    watermark: Optional[str] = Query(None, description="Watermark from the previous sync; omit for a full load"),
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_PAGE_SIZE),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Products and the current user's orders created, updated or deleted since
+    `watermark`. Apply `changed` and drop `deleted` ids from the local cache,
+    store the returned watermark, and call again while `has_more` is true.
+    """
+    sync_service = SyncService(db)
+    try:
+        changes = sync_service.get_changes(current_user.id, watermark=watermark, limit=limit)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return json_response(dump_json(SyncResponse, changes))
@@ -1,12 +1,14 @@
 """
 User management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, get_primary_read_db
 from app.schemas.user import UserResponse, UserUpdate, UserSignupRequest, UserSignupResponse
 from app.services.user_service import UserService
 from app.api.v1.dependencies import get_current_user
+from app.core.responses import dump_json, json_response
+from app.utils.etag import etag_matches, make_etag, not_modified
 
 router = APIRouter()
 
@@ -49,18 +51,32 @@ async def get_user_by_phone(phoneNumber: str, db: Session = Depends(get_db)):
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user_profile(
+    request: Request,
     user_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_primary_read_db)
 ):
-    """Get user profile by ID"""
+    """
+    Get user profile by ID (from the primary, so edits show up immediately).
+    Send If-None-Match with a previous ETag to get 304 Not Modified.
+    """
     user_service = UserService(db)
+    
+    # Revalidation: a single-column version lookup instead of loading the row
+    if request.headers.get("if-none-match"):
+        updated_at = user_service.get_user_version(user_id)
+        if updated_at is not None:
+            etag = make_etag("user", [(user_id, updated_at)])
+            if etag_matches(request, etag):
+                return not_modified(etag)
+    
     user = user_service.get_user_by_id(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return user
+    etag = make_etag("user", [(user.id, user.updated_at)])
+    return json_response(dump_json(UserResponse, user), headers={"ETag": etag})
 
 
 @router.delete("/user/{user_id}", summary="Delete user by ID", status_code=status.HTTP_200_OK)
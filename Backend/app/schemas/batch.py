@@ -0,0 +1,44 @@
+"""
+Batch request schemas
+"""
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, List, Literal, Optional
+from urllib.parse import unquote, urlsplit
+from app.core.config import settings
+
+BATCH_PATH = "/v1/batch"
+
+
+class BatchSubRequest(BaseModel):
+    """One GET to run inside a batch"""
+    id: Optional[str] = None  # echoed back so clients can match responses
+    method: Literal["GET"] = "GET"
+    path: str  # path and query string, e.g. /v1/products/?featured=true&limit=10
+    headers: Dict[str, str] = {}
+    
+    @field_validator("path")
+    @classmethod
+    def validate_path(cls, path: str) -> str:
+        if not path.startswith("/") or path.startswith("//"):
+            raise ValueError("path must be an absolute path on this API")
+        if unquote(urlsplit(path).path).startswith(BATCH_PATH):
+            raise ValueError("batch requests cannot be nested")
+        return path
+
+
+class BatchRequest(BaseModel):
+    """Independent sub-requests, run concurrently"""
+    requests: List[BatchSubRequest] = Field(..., min_length=1, max_length=settings.BATCH_MAX_REQUESTS)
+
+
+class BatchSubResponse(BaseModel):
+    """Outcome of one sub-request"""
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str]
+    body: Any = None  # parsed JSON, text, or null for an empty body
+
+
+class BatchResponse(BaseModel):
+    """Sub-request responses in request order"""
+    responses: List[BatchSubResponse]
@@ -1,7 +1,7 @@
 """
 Order schemas for request/response models
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from app.models.order import OrderStatus, PaymentStatus
@@ -10,7 +10,7 @@ from app.models.order import OrderStatus, PaymentStatus
 class OrderItemCreate(BaseModel):
     """Order item creation schema"""
     product_id: int
-    quantity: int
+    quantity: int = Field(..., gt=0)
 
 
 class OrderCreate(BaseModel):
@@ -65,6 +65,7 @@ class OrderResponse(BaseModel):
     shipping_country: Optional[str] = None
     shipping_postal_code: Optional[str] = None
     tracking_number: Optional[str] = None
+    reserved_until: Optional[datetime] = None
     estimated_delivery: Optional[datetime] = None
     delivered_at: Optional[datetime] = None
     notes: Optional[str] = None
@@ -1,9 +1,10 @@
 """
 Product schemas for request/response models
 """
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, Optional, List
 from datetime import datetime
+from app.core.config import settings
 from app.models.product import ProductCategory, ProductCondition
 
 
@@ -64,6 +65,59 @@ class ProductResponse(ProductBase):
         from_attributes = True
 
 
+class ProductBrowseResponse(BaseModel):
+    """Filtered products with catalog-wide facet counts"""
+    items: List[ProductResponse]
+    facets: Dict[str, Dict[str, int]]  # facet -> value -> number of active products
+    next_cursor: Optional[str] = None
+
+
+class ProductBulkCreateRequest(BaseModel):
+    """Bulk product creation; each item is validated as ProductCreate and reported separately"""
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=settings.PRODUCT_BULK_MAX_ITEMS)
+
+
+class ProductBulkUpdateItem(ProductUpdate):
+    """One product change in a bulk update"""
+    id: int
+    
+    @field_validator("title", "category", "condition", "price", "currency", "quantity_available")
+    @classmethod
+    def not_null(cls, v):
+        """Columns that are NOT NULL can be left out, but not set to null"""
+        if v is None:
+            raise ValueError("May not be null")
+        return v
+    
+    @field_validator("price", "quantity_available")
+    @classmethod
+    def not_negative(cls, v):
+        """Price and stock can't go below zero"""
+        if v is not None and v < 0:
+            raise ValueError("Must not be negative")
+        return v
+
+
+class ProductBulkUpdateRequest(BaseModel):
+    """Bulk product update; each item is validated as ProductBulkUpdateItem and reported separately"""
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=settings.PRODUCT_BULK_MAX_ITEMS)
+
+
+class ProductBulkItemResult(BaseModel):
+    """Outcome for one item of a bulk request"""
+    index: int
+    status: str  # created, updated, invalid or not_found
+    id: Optional[int] = None
+    errors: Optional[List[Dict[str, Any]]] = None
+
+
+class ProductBulkResponse(BaseModel):
+    """Per-item results of a bulk request"""
+    succeeded: int
+    failed: int
+    results: List[ProductBulkItemResult]
+
+
 class ProductImageResponse(BaseModel):
     """Product image response schema"""
     id: int
@@ -0,0 +1,27 @@
+"""
+Delta sync schemas
+"""
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.order import OrderResponse
+from app.schemas.product import ProductResponse
+
+
+class ProductSyncChanges(BaseModel):
+    """Products changed since the watermark"""
+    changed: List[ProductResponse]  # created or updated: replace the cached copy
+    deleted: List[int]  # tombstones: ids of deactivated products to drop from the cache
+
+
+class OrderSyncChanges(BaseModel):
+    """The current user's orders changed since the watermark"""
+    changed: List[OrderResponse]
+    deleted: List[int]
+
+
+class SyncResponse(BaseModel):
+    """One page of changes; call again with `watermark` until has_more is false"""
+    products: ProductSyncChanges
+    orders: OrderSyncChanges
+    watermark: Optional[str] = None
+    has_more: bool
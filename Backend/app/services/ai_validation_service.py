@@ -1,16 +1,26 @@
 """
 AI validation service for sunglasses detection
+
+Pillow (and any model or Vision API client added here) is imported on the
+first validation request, or by warmup() when AI_WARMUP_ON_STARTUP is set,
+so importing the app doesn't load the image stack in every worker.
 """
 import io
 import base64
 import logging
 from typing import Dict, Any
-from PIL import Image
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+def warmup() -> None:
+    """Import the image stack and its format plugins ahead of the first request"""
+    from PIL import Image
+    
+    Image.init()
+
+
 class AIValidationService:
     """AI validation service for sunglasses detection"""
     
@@ -34,6 +44,8 @@ class AIValidationService:
         # In a real implementation, you would use the actual AI model
         
         try:
+            from PIL import Image
+            
             # Load and analyze the image
             image = Image.open(io.BytesIO(image_content))
             width, height = image.size
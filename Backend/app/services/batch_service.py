@@ -0,0 +1,116 @@
+"""
+Batch service: runs sub-requests against the ASGI app in-process
+
+Each sub-request goes through the full middleware stack (rate limiting,
+query stats, error handlers) exactly as if the client had sent it, but
+without a network round trip. Sub-requests run concurrently and each gets
+its own database session from the normal dependencies: a Session is not
+safe to share between concurrently running requests. What they do share is
+the batch's authentication result, passed through the ASGI scope state so
+get_current_user doesn't look the user up again for every sub-request.
+"""
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote, urlsplit
+
+from starlette.types import ASGIApp, Scope
+
+from app.schemas.batch import BatchSubRequest
+
+# Parent request headers passed on to every sub-request (sub-request headers win)
+FORWARDED_HEADERS = ("authorization", "accept-language", "user-agent")
+# Client identity headers (rate limiting) that sub-requests can't override
+PINNED_HEADERS = ("x-forwarded-for", "x-real-ip")
+# Sub-response bodies are embedded in the batch JSON, so they must not be content-encoded
+DROPPED_HEADERS = ("accept-encoding",)
+
+
+class BatchService:
+    """Batch service class"""
+
+    def __init__(self, app: ASGIApp, scope: Scope, state: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            app: Application to dispatch sub-requests to
+            scope: ASGI scope of the batch request
+            state: Request state shared with every sub-request
+        """
+        self.app = app
+        self.scope = scope
+        self.state = state or {}
+
+    async def run(self, requests: List[BatchSubRequest]) -> List[Dict[str, Any]]:
+        """Run all sub-requests concurrently; responses are returned in request order"""
+        return await asyncio.gather(*(self._call(request) for request in requests))
+
+    async def _call(self, request: BatchSubRequest) -> Dict[str, Any]:
+        url = urlsplit(request.path)
+        parent = {name.decode("latin-1"): value.decode("latin-1") for name, value in self.scope["headers"]}
+        headers = {name: parent[name] for name in FORWARDED_HEADERS if name in parent}
+        headers.update({name.lower(): value for name, value in request.headers.items() if name.lower() not in PINNED_HEADERS + DROPPED_HEADERS})
+        headers.update({name: parent[name] for name in PINNED_HEADERS if name in parent})
+
+        scope = {
+            "type": "http",
+            "asgi": self.scope.get("asgi", {"version": "3.0"}),
+            "http_version": self.scope.get("http_version", "1.1"),
+            "method": request.method,
+            "scheme": self.scope.get("scheme", "http"),
+            "server": self.scope.get("server"),
+            "client": self.scope.get("client"),
+            "root_path": self.scope.get("root_path", ""),
+            "path": unquote(url.path),
+            "raw_path": url.path.encode(),
+            "query_string": url.query.encode(),
+            "headers": [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()],
+            "state": dict(self.state),
+        }
+
+        request_sent = False
+        disconnected = asyncio.Event()
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Nothing more to read; only report a disconnect once the response is done
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        status, response_headers, body = 500, {}, []
+
+        async def send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = {
+                    name.decode("latin-1"): value.decode("latin-1") for name, value in message.get("headers", [])
+                }
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            # ServerErrorMiddleware has already sent the 500 response
+            status = 500
+        finally:
+            disconnected.set()
+
+        response_headers.pop("content-length", None)
+        return {
+            "id": request.id,
+            "status": status,
+            "headers": response_headers,
+            "body": self._decode(b"".join(body), response_headers.get("content-type", "")),
+        }
+
+    @staticmethod
+    def _decode(body: bytes, content_type: str) -> Any:
+        if not body:
+            return None
+        if content_type.startswith("application/json"):
+            return json.loads(body)
+        return body.decode("utf-8", errors="replace")
@@ -0,0 +1,124 @@
+"""
+Catalog export service
+
+Streams the product catalog as NDJSON or CSV. Rows are read through a
+server-side cursor (yield_per) and written out one chunk at a time, so
+memory stays constant however large the catalog is.
+
+A full export contains every active product. An incremental export
+(`since`) contains every product whose updated_at is after `since`,
+including soft-deleted ones (is_active false) so consumers can drop them.
+Both stop at the watermark taken when the export starts. The watermark
+stays EXPORT_LAG_SECONDS behind now, because a transaction that stamped an
+earlier updated_at may not have committed yet, and it is read in the same
+session (so from the same replica) as the rows. Passing it as the next
+`since` therefore picks up where this export ended.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Callable, Iterator, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.product import Product
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Columns of ProductResponse plus is_active, in output order
+EXPORT_COLUMNS = (
+    "id", "seller_id", "title", "description", "category", "condition", "price", "currency",
+    "quantity_available", "sku", "brand", "model", "color", "size", "material",
+    "primary_image_url", "image_urls", "ai_validated", "ai_confidence", "ai_validation_date",
+    "is_featured", "is_approved", "is_active", "created_at", "updated_at",
+)
+
+
+def _plain(value: Any) -> Any:
+    """Column value as a JSON/CSV scalar"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class ProductExportService:
+    """Product export service class"""
+
+    def __init__(self, session_factory: Callable[[], Session], chunk_size: int = None):
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+        self._db: Optional[Session] = None
+
+    def _session(self) -> Session:
+        # One session for the watermark and the rows: a read session sticks to one replica
+        if self._db is None:
+            self._db = self.session_factory()
+        return self._db
+
+    def close(self) -> None:
+        """Close the export session (safe to call more than once)"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def get_watermark(self) -> Optional[datetime]:
+        """
+        Latest updated_at in the catalog, held EXPORT_LAG_SECONDS behind now
+        (None if there are no products)
+        """
+        latest = self._session().scalar(select(func.max(Product.updated_at)))
+        if latest is None:
+            return None
+        return min(latest, datetime.utcnow() - timedelta(seconds=settings.EXPORT_LAG_SECONDS))
+
+    def stream(self, export_format: str, until: Optional[datetime], since: Optional[datetime] = None) -> Iterator[bytes]:
+        """
+        Yield the export body chunk by chunk, then close the session
+
+        Args:
+            export_format: "ndjson" or "csv"
+            until: Watermark from get_watermark(); rows updated later are left out
+            since: Only rows updated after this (incremental export)
+        """
+        write = self._ndjson_chunk if export_format == "ndjson" else self._csv_chunk
+        try:
+            if export_format == "csv":
+                yield self._csv_chunk([EXPORT_COLUMNS])
+            if until is None:
+                return
+
+            result = self._session().execute(
+                self._query(until, since).execution_options(yield_per=self.chunk_size)
+            )
+            for rows in result.partitions():
+                yield write([[_plain(value) for value in row] for row in rows])
+        finally:
+            self.close()
+
+    def _query(self, until: datetime, since: Optional[datetime]):
+        query = select(*(getattr(Product, name) for name in EXPORT_COLUMNS)).where(Product.updated_at <= until)
+        if since is None:
+            return query.where(Product.is_active == True).order_by(Product.id)
+        # Served by ix_products_updated_at_id
+        return query.where(Product.updated_at > since).order_by(Product.updated_at, Product.id)
+
+    @staticmethod
+    def _ndjson_chunk(rows) -> bytes:
+        return "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), separators=(",", ":")) + "\n" for row in rows
+        ).encode()
+
+    @staticmethod
+    def _csv_chunk(rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
@@ -0,0 +1,178 @@
+"""
+Facet count service for the product browse screen
+
+product_facet_counts holds the number of active products per facet value,
+so reading the counts is a single small query instead of a GROUP BY over the
+whole catalog per request. ProductService records +1/-1 deltas with each
+product write; they are applied in a short transaction of their own once the
+write commits (keys in sorted order), so product writes never queue on the
+few hot count rows. If that follow-up fails the counts drift until
+scripts/rebuild_facet_counts.py is run.
+
+Counts are catalog-wide by design: they describe what is available, not what
+matches the current filters (per-selection counts would need a GROUP BY per
+request, which is what this table avoids).
+"""
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from sqlalchemy import case, event, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.product import Product
+from app.models.product_facet import ProductFacetCount
+
+# Facets taken directly from a product column
+FACET_COLUMNS = ("category", "condition", "brand", "color", "material")
+
+# Price facet buckets: (label, lower bound inclusive, upper bound exclusive)
+PRICE_BUCKETS = (
+    ("0-50", 0, 50),
+    ("50-100", 50, 100),
+    ("100-250", 100, 250),
+    ("250-500", 250, 500),
+    ("500+", 500, None),
+)
+
+FacetKey = Tuple[str, str]
+
+logger = logging.getLogger(__name__)
+
+
+def price_bucket(price: float) -> str:
+    """Label of the price bucket containing `price`"""
+    for label, low, high in PRICE_BUCKETS:
+        if price >= low and (high is None or price < high):
+            return label
+    return PRICE_BUCKETS[0][0]
+
+
+def product_facets(product: Product) -> List[FacetKey]:
+    """Facet values an active product contributes to"""
+    return facet_values({name: getattr(product, name) for name in (*FACET_COLUMNS, "price")})
+
+
+def facet_values(values: Mapping[str, Any]) -> List[FacetKey]:
+    """Facet values for a product given as a column -> value mapping (bulk writes)"""
+    facets = []
+    for facet in FACET_COLUMNS:
+        value = values.get(facet)
+        if value is None or value == "":
+            continue
+        facets.append((facet, getattr(value, "value", value)))
+    if values.get("price") is not None:
+        facets.append(("price", price_bucket(values["price"])))
+    return facets
+
+
+class FacetService:
+    """Facet service class"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record(self, before: Optional[Iterable[FacetKey]], after: Optional[Iterable[FacetKey]]) -> None:
+        """
+        Apply the change from one product's `before` facets to its `after`
+        facets (None for a product that didn't exist / is no longer active)
+        once the caller's transaction commits.
+        """
+        deltas = Counter()
+        for key in after or ():
+            deltas[key] += 1
+        for key in before or ():
+            deltas[key] -= 1
+        self.apply_deltas(deltas)
+
+    def apply_deltas(self, deltas: Dict[FacetKey, int]) -> None:
+        """Add each delta to its facet count once the caller's transaction commits (dropped on rollback)"""
+        self.db.info.setdefault("facet_deltas", Counter()).update(deltas)
+
+    def write_deltas(self, deltas: Dict[FacetKey, int]) -> None:
+        """Add each delta to its facet count now, creating missing rows (keys in sorted order, so concurrent writers can't deadlock)"""
+        rows = [
+            {"facet": facet, "value": value, "count": delta}
+            for (facet, value), delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = insert(ProductFacetCount)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["facet", "value"],
+                set_={"count": ProductFacetCount.count + stmt.excluded.count}
+            )
+            self.db.execute(stmt, rows)
+            return
+
+        # Other backends: update, then insert the rows that didn't exist yet
+        for row in rows:
+            result = self.db.execute(
+                update(ProductFacetCount)
+                .where(ProductFacetCount.facet == row["facet"], ProductFacetCount.value == row["value"])
+                .values(count=ProductFacetCount.count + row["count"])
+            )
+            if result.rowcount == 0:
+                self.db.add(ProductFacetCount(**row))
+        self.db.flush()
+
+    def get_counts(self) -> Dict[str, Dict[str, int]]:
+        """All non-zero facet counts, grouped by facet"""
+        counts: Dict[str, Dict[str, int]] = {facet: {} for facet in (*FACET_COLUMNS, "price")}
+        rows = self.db.execute(
+            select(ProductFacetCount.facet, ProductFacetCount.value, ProductFacetCount.count)
+            .where(ProductFacetCount.count > 0)
+            .order_by(ProductFacetCount.facet, ProductFacetCount.count.desc(), ProductFacetCount.value)
+        )
+        for facet, value, count in rows:
+            counts.setdefault(facet, {})[value] = count
+        return counts
+
+    def rebuild(self) -> None:
+        """Recompute every count from the products table (backfill / repair)"""
+        deltas: Dict[FacetKey, int] = {}
+        active = Product.is_active == True
+        for facet in FACET_COLUMNS:
+            column = getattr(Product, facet)
+            rows = self.db.execute(
+                select(column, func.count()).where(active, column.isnot(None)).group_by(column)
+            )
+            for value, count in rows:
+                if value != "":
+                    deltas[(facet, getattr(value, "value", value))] = count
+
+        bucket = case(
+            *((Product.price < high, label) for label, _, high in PRICE_BUCKETS if high is not None),
+            else_=PRICE_BUCKETS[-1][0]
+        )
+        rows = self.db.execute(
+            select(bucket, func.count()).where(active, Product.price.isnot(None)).group_by(bucket)
+        )
+        for label, count in rows:
+            deltas[("price", label)] = count
+
+        self.db.query(ProductFacetCount).delete(synchronize_session=False)
+        self.write_deltas(deltas)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_facet_deltas(session: Session) -> None:
+    deltas = session.info.pop("facet_deltas", None)
+    if not deltas or not any(deltas.values()):
+        return
+    try:
+        with Session(bind=session.get_bind()) as db:
+            FacetService(db).write_deltas(deltas)
+            db.commit()
+    except Exception:
+        # The product write already committed; rebuild_facet_counts repairs the drift
+        logger.exception("Applying facet count deltas failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_facet_deltas(session: Session) -> None:
+    session.info.pop("facet_deltas", None)
@@ -0,0 +1,183 @@
+"""
+Idempotency service for safely retried POST requests
+"""
+import hashlib
+import hmac
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from fastapi.responses import Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+# Completed responses, keyed by (scope, key), so replays skip the database
+_response_cache = TTLCache(
+    maxsize=settings.IDEMPOTENCY_CACHE_SIZE,
+    ttl=settings.IDEMPOTENCY_KEY_TTL_HOURS * 3600
+)
+
+
+class IdempotencyError(ValueError):
+    """Base class for idempotency key errors"""
+    status_code = 409
+
+
+class IdempotencyKeyReusedError(IdempotencyError):
+    """The key was already used with a different request body"""
+    status_code = 422
+
+    def __init__(self):
+        super().__init__("Idempotency-Key was already used with a different request")
+
+
+class IdempotencyKeyInProgressError(IdempotencyError):
+    """A request with the same key is still being processed"""
+    status_code = 409
+
+    def __init__(self):
+        super().__init__("A request with this Idempotency-Key is already in progress")
+
+
+def fingerprint(payload: Any) -> str:
+    """Stable hash of a JSON-compatible request body"""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def secret_digest(value: str) -> str:
+    """Keyed hash of a secret (e.g. a password) for a fingerprint; never stores the value or a plain hash of it"""
+    return hmac.new(settings.SECRET_KEY.encode(), value.encode(), hashlib.sha256).hexdigest()
+
+
+class IdempotencyService:
+    """
+    Idempotency service class.
+
+    Usage in a route:
+        replay = idempotency.begin(scope, key, payload)
+        if replay is not None:
+            return replay
+        ...run the handler without committing, calling idempotency.abandon() if it fails...
+        return idempotency.complete(body, status_code)
+
+    complete() commits the handler's writes together with the stored
+    response, so a crash in between can't leave the work done while the
+    key still looks unfinished (and a retry would do it again). When no key
+    is supplied every method is a pass-through apart from that commit.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.scope: Optional[str] = None
+        self.key: Optional[str] = None
+        self.request_hash: Optional[str] = None
+
+    def begin(self, scope: str, key: Optional[str], payload: Any) -> Optional[Response]:
+        """
+        Return the stored response if this key was already completed,
+        otherwise claim the key so the caller can run the handler.
+        """
+        if not key:
+            return None
+        self.scope, self.key, self.request_hash = scope, key, fingerprint(payload)
+
+        cached = _response_cache.get((scope, key))
+        if cached is not None:
+            return self._replay(cached)
+
+        now = datetime.utcnow()
+        record = self._get_record()
+        if record is not None:
+            if record.expires_at > now:
+                if record.request_hash != self.request_hash:
+                    raise IdempotencyKeyReusedError()
+                if record.status_code is None:
+                    raise IdempotencyKeyInProgressError()
+                stored = self._to_cached(record)
+                _response_cache.set((scope, key), stored)
+                return self._replay(stored)
+            # Expired record (or an abandoned in-progress lease): start over
+            self.db.delete(record)
+            self.db.commit()
+
+        # Claim the key with a short lease; a concurrent duplicate loses the
+        # unique constraint race and is told the request is in progress
+        self.db.add(IdempotencyKey(
+            scope=scope,
+            key=key,
+            request_hash=self.request_hash,
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+        ))
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise IdempotencyKeyInProgressError()
+        return None
+
+    def complete(self, content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+        """Store the handler's response for future replays, commit it with the handler's writes, and return it"""
+        body = json.dumps(content, separators=(",", ":"), default=str).encode()
+        headers = dict(headers or {})
+
+        if self.key:
+            record = self._get_record()
+            if record is not None:
+                record.status_code = status_code
+                record.response_body = body.decode()
+                record.response_headers = headers
+                record.expires_at = datetime.utcnow() + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        self.db.commit()
+        if self.key:
+            _response_cache.set((self.scope, self.key), (self.request_hash, status_code, body, headers))
+
+        return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
+
+    def abandon(self) -> None:
+        """Release the key after a failed request so the client can retry"""
+        if not self.key:
+            return
+        self.db.rollback()
+        self.db.query(IdempotencyKey).filter(
+            IdempotencyKey.scope == self.scope,
+            IdempotencyKey.key == self.key,
+            IdempotencyKey.status_code.is_(None)
+        ).delete(synchronize_session=False)
+        self.db.commit()
+
+    def purge_expired(self, now: datetime = None) -> int:
+        """Delete expired keys"""
+        count = self.db.query(IdempotencyKey).filter(
+            IdempotencyKey.expires_at < (now or datetime.utcnow())
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return count
+
+    def _get_record(self) -> Optional[IdempotencyKey]:
+        return self.db.query(IdempotencyKey).filter(
+            IdempotencyKey.scope == self.scope,
+            IdempotencyKey.key == self.key
+        ).first()
+
+    @staticmethod
+    def _to_cached(record: IdempotencyKey) -> tuple:
+        return (
+            record.request_hash,
+            record.status_code,
+            record.response_body.encode(),
+            record.response_headers or {}
+        )
+
+    def _replay(self, stored: tuple) -> Response:
+        request_hash, status_code, body, headers = stored
+        if request_hash != self.request_hash:
+            raise IdempotencyKeyReusedError()
+        return Response(
+            content=body,
+            status_code=status_code,
+            headers={**headers, "Idempotent-Replayed": "true"},
+            media_type="application/json"
+        )
@@ -0,0 +1,154 @@
+"""
+Inventory service for stock reservation
+"""
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import bindparam, case, update
+from sqlalchemy.orm import Session, selectinload
+from app.models.order import Order, OrderStatus, PaymentStatus
+from app.core.cache import invalidate_on_commit
+from app.models.product import Product
+from app.services.product_service import PRODUCT_LIST_TAG, product_tag
+
+
+class InsufficientInventoryError(ValueError):
+    """Raised when a product does not have enough stock to reserve"""
+
+    def __init__(self, product_id: int, quantity: int):
+        self.product_id = product_id
+        self.quantity = quantity
+        super().__init__(f"Product {product_id} does not have {quantity} unit(s) available")
+
+
+class InventoryService:
+    """
+    Inventory service class.
+
+    Stock is decremented with a single conditional UPDATE
+    (quantity_available >= requested) inside the caller's transaction, so
+    concurrent buyers never oversell and no read-modify-write round trip
+    holds row locks.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def reserve(self, quantities: Dict[int, int]) -> None:
+        """
+        Reserve stock for {product_id: quantity} in one statement. Does not
+        commit; on failure the caller must roll back the transaction.
+        """
+        if not quantities:
+            return
+
+        product_ids = sorted(quantities)
+        requested = case(quantities, value=Product.id)
+        reserved = self.db.execute(
+            update(Product)
+            .where(
+                Product.id.in_(product_ids),
+                Product.is_active == True,
+                Product.quantity_available >= requested
+            )
+            .values(quantity_available=Product.quantity_available - requested)
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+
+        if len(reserved) != len(product_ids):
+            short = min(set(product_ids) - set(reserved))
+            raise InsufficientInventoryError(short, quantities[short])
+
+        # Cached listings show quantity_available
+        invalidate_on_commit(self.db, PRODUCT_LIST_TAG, *(product_tag(product_id) for product_id in product_ids))
+
+    def release(self, quantities: Dict[int, int]) -> None:
+        """Return reserved stock for {product_id: quantity}. Does not commit."""
+        if not quantities:
+            return
+        products = Product.__table__
+        self.db.execute(
+            products.update()
+            .where(products.c.id == bindparam("b_product_id"))
+            .values(quantity_available=products.c.quantity_available + bindparam("b_quantity")),
+            [
+                {"b_product_id": product_id, "b_quantity": quantity}
+                for product_id, quantity in sorted(quantities.items())
+            ]
+        )
+        invalidate_on_commit(self.db, PRODUCT_LIST_TAG, *(product_tag(product_id) for product_id in quantities))
+
+    def claim_reservation(self, order: Order) -> bool:
+        """
+        Take the reservation off a pending order with one conditional UPDATE,
+        so payment, cancellation and the expiry job can't all act on it.
+        Returns False if it was already released or paid. Does not commit.
+        """
+        orders = Order.__table__
+        return bool(self.db.execute(
+            orders.update()
+            .where(
+                orders.c.id == order.id,
+                orders.c.reserved_until.isnot(None),
+                orders.c.status == OrderStatus.PENDING
+            )
+            .values(reserved_until=None)
+        ).rowcount)
+
+    def release_order(self, order: Order) -> bool:
+        """
+        Release the reservation held by an order. Returns False if another
+        process already released or paid it. Does not commit.
+        """
+        if not self.claim_reservation(order):
+            return False
+        self.release(self._order_quantities(order))
+        return True
+
+    def cancel_order(self, order: Order) -> bool:
+        """
+        Cancel an order and return the stock it holds: its reservation if
+        unpaid, or the units it bought if paid. Claimed by a conditional
+        status change, so stock comes back exactly once. Returns False if the
+        order was already cancelled. Does not commit.
+        """
+        orders = Order.__table__
+        claimed = self.db.execute(
+            orders.update()
+            .where(orders.c.id == order.id, orders.c.status != OrderStatus.CANCELLED)
+            .values(status=OrderStatus.CANCELLED, reserved_until=None)
+        ).rowcount
+        if not claimed:
+            return False
+        self.release(self._order_quantities(order))
+        return True
+
+    @staticmethod
+    def _order_quantities(order: Order) -> Dict[int, int]:
+        quantities: Dict[int, int] = {}
+        for item in order.order_items:
+            quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+        return quantities
+
+    def release_expired_reservations(self, now: datetime = None) -> int:
+        """Cancel unpaid orders whose reservation expired and restock their items"""
+        now = now or datetime.utcnow()
+        expired: List[Order] = (
+            self.db.query(Order)
+            .options(selectinload(Order.order_items))
+            .filter(
+                Order.reserved_until < now,
+                Order.status == OrderStatus.PENDING,
+                Order.payment_status == PaymentStatus.PENDING
+            )
+            .all()
+        )
+
+        released = 0
+        for order in expired:
+            if self.release_order(order):
+                order.status = OrderStatus.CANCELLED
+                released += 1
+
+        self.db.commit()
+        return released
@@ -1,47 +1,101 @@
 """
 Order service for business logic
 """
-from sqlalchemy.orm import Session
-from app.models.order import Order, OrderItem
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, selectinload
+from app.core.config import settings
+from app.models.order import Order, OrderItem, OrderStatus, PaymentStatus
+from app.models.product import Product
 from app.schemas.order import OrderCreate, OrderUpdate
+from app.services.inventory_service import InventoryService
+from app.utils.fields import Fields, load_only_columns
+from app.utils.pagination import keyset_paginate
+from datetime import datetime, timedelta
 from typing import Optional, List
 import uuid
 
 
+class OrderConflictError(ValueError):
+    """Raised when an order's state no longer allows the requested change"""
+
+
+class ProductUnavailableError(ValueError):
+    """Raised when an order references a product that is no longer listed"""
+
+    def __init__(self, product_id: int):
+        self.product_id = product_id
+        super().__init__(f"Product {product_id} is no longer available")
+
+
 class OrderService:
     """Order service class"""
     
     def __init__(self, db: Session):
         self.db = db
     
-    def get_user_orders(self, user_id: int, skip: int = 0, limit: int = 100, status: str = None) -> List[Order]:
-        """Get user's orders"""
+    def get_user_orders(self, user_id: int, skip: int = 0, limit: int = 100, status: str = None, cursor: str = None, fields: Fields = None) -> List[Order]:
+        """
+        Get user's orders with their items, newest first (one query for the page, one for all items).
+        `fields` limits the columns loaded; items are only loaded when order_items is selected.
+        """
         query = self.db.query(Order).filter(Order.buyer_id == user_id)
+        if fields is None or "order_items" in fields:
+            query = query.options(selectinload(Order.order_items))
+        if fields is not None:
+            query = query.options(load_only_columns(Order, fields, required=("id", "created_at")))
         
         if status:
             query = query.filter(Order.status == status)
         
-        return query.offset(skip).limit(limit).all()
+        return keyset_paginate(query, Order, limit, cursor=cursor, skip=skip)
     
     def get_order_by_id(self, order_id: int, user_id: int) -> Optional[Order]:
         """Get order by ID for specific user"""
-        return self.db.query(Order).filter(
+        return self.db.query(Order).options(
+            selectinload(Order.order_items)
+        ).filter(
             Order.id == order_id,
             Order.buyer_id == user_id
         ).first()
     
-    def create_order(self, order_data: OrderCreate, buyer_id: int) -> Order:
-        """Create new order"""
+    def create_order(self, order_data: OrderCreate, buyer_id: int, commit: bool = True) -> Order:
+        """
+        Create new order.
+        With commit=False the order is only flushed, so the caller can commit
+        it together with other writes (e.g. the stored idempotent response).
+        """
         # Generate order number
         order_number = f"ORD-{uuid.uuid4().hex[:8].upper()}"
         
-        # Calculate totals (simplified)
-        subtotal = 0.0
-        for item in order_data.items:
-            # Get product price (simplified)
-            product = self.db.query(Product).filter(Product.id == item.product_id).first()
-            if product:
-                subtotal += product.price * item.quantity
+        # Load every referenced product in a single query
+        product_ids = {item.product_id for item in order_data.items}
+        products = {
+            product.id: product
+            for product in self.db.query(Product).filter(Product.id.in_(product_ids))
+        }
+        
+        # Deactivated listings can't be reserved; say so instead of "insufficient stock"
+        inactive = sorted(product_id for product_id, product in products.items() if not product.is_active)
+        if inactive:
+            raise ProductUnavailableError(inactive[0])
+        
+        # Price each line from the product map (unknown products are skipped)
+        lines = [
+            (item, products[item.product_id])
+            for item in order_data.items
+            if item.product_id in products
+        ]
+        subtotal = sum(product.price * item.quantity for item, product in lines)
+        
+        # Reserve stock in this transaction; raises InsufficientInventoryError
+        quantities = {}
+        for item, product in lines:
+            quantities[product.id] = quantities.get(product.id, 0) + item.quantity
+        try:
+            InventoryService(self.db).reserve(quantities)
+        except Exception:
+            self.db.rollback()
+            raise
         
         total_amount = subtotal  # Simplified - no tax/shipping for now
         
@@ -56,28 +110,30 @@ class OrderService:
             shipping_state=order_data.shipping_state,
             shipping_country=order_data.shipping_country,
             shipping_postal_code=order_data.shipping_postal_code,
-            notes=order_data.notes
+            notes=order_data.notes,
+            reserved_until=datetime.utcnow() + timedelta(minutes=settings.ORDER_RESERVATION_MINUTES)
         )
         
         self.db.add(db_order)
         self.db.flush()  # Get the order ID
         
-        # Create order items
-        for item in order_data.items:
-            product = self.db.query(Product).filter(Product.id == item.product_id).first()
-            if product:
-                order_item = OrderItem(
-                    order_id=db_order.id,
-                    product_id=item.product_id,
-                    quantity=item.quantity,
-                    unit_price=product.price,
-                    total_price=product.price * item.quantity,
-                    product_title=product.title,
-                    product_sku=product.sku
-                )
-                self.db.add(order_item)
+        # Create all order items with one executemany insert
+        if lines:
+            self.db.execute(insert(OrderItem), [
+                {
+                    "order_id": db_order.id,
+                    "product_id": product.id,
+                    "quantity": item.quantity,
+                    "unit_price": product.price,
+                    "total_price": product.price * item.quantity,
+                    "product_title": product.title,
+                    "product_sku": product.sku,
+                }
+                for item, product in lines
+            ])
         
-        self.db.commit()
+        if commit:
+            self.db.commit()
         self.db.refresh(db_order)
         return db_order
     
@@ -88,6 +144,19 @@ class OrderService:
             return None
         
         update_data = order_update.dict(exclude_unset=True)
+        
+        # Paying claims the reservation (paid orders keep their stock) and
+        # cancelling gives back whatever the order holds, reserved or bought;
+        # both go through conditional UPDATEs so they can't race each other
+        # or the expiry job into selling or restocking the same units twice
+        inventory = InventoryService(self.db)
+        if update_data.get("status") == OrderStatus.CANCELLED:
+            inventory.cancel_order(db_order)
+        elif update_data.get("payment_status") == PaymentStatus.PAID and db_order.payment_status != PaymentStatus.PAID:
+            if not inventory.claim_reservation(db_order):
+                self.db.rollback()
+                raise OrderConflictError("The order's reservation has expired or was already released")
+        
         for field, value in update_data.items():
             setattr(db_order, field, value)
         
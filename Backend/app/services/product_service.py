@@ -1,10 +1,35 @@
 """
 Product service for business logic
 """
-from sqlalchemy.orm import Session
+from collections import Counter
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Query, Session
+from app.core.cache import invalidate_on_commit
 from app.models.product import Product
-from app.schemas.product import ProductCreate, ProductUpdate
-from typing import Optional, List
+from app.schemas.product import ProductBulkUpdateItem, ProductCreate, ProductUpdate
+from app.services.facet_service import FACET_COLUMNS, FacetService, facet_values, product_facets
+from app.services.search_service import ProductSearchService
+from app.utils.fields import Fields, load_only_columns
+from app.utils.pagination import InvalidCursorError, keyset_query
+from datetime import datetime
+from typing import Any, Dict, Optional, List, Tuple
+
+# Response cache tags: every product listing, and one product's detail
+PRODUCT_LIST_TAG = "products"
+
+
+def product_tag(product_id: int) -> str:
+    return f"product:{product_id}"
+
+
+def _invalid(index: int, error: ValidationError) -> Dict[str, Any]:
+    """Per-item result for a bulk item that failed validation"""
+    return {
+        "index": index,
+        "status": "invalid",
+        "errors": error.errors(include_url=False, include_context=False, include_input=False),
+    }
 
 
 class ProductService:
@@ -13,17 +38,79 @@ class ProductService:
     def __init__(self, db: Session):
         self.db = db
     
-    def get_products(self, skip: int = 0, limit: int = 100, category: str = None, search: str = None) -> List[Product]:
-        """Get products with optional filtering"""
+    def get_products(self, skip: int = 0, limit: int = 100, category: str = None, search: str = None, cursor: str = None, featured: bool = None, fields: Fields = None) -> List[Product]:
+        """
+        Get products with optional filtering, newest first (keyset paged when a cursor is given).
+        Search results are ordered by relevance instead and paged with skip.
+        `fields` limits the columns loaded (id, created_at and updated_at are always loaded for cursors and ETags).
+        """
+        query = self.listing_query(
+            skip=skip, limit=limit, category=category, search=search, cursor=cursor, featured=featured
+        )
+        if fields is not None:
+            query = query.options(load_only_columns(Product, fields, required=("id", "created_at", "updated_at")))
+        return query.all()
+    
+    def listing_query(self, skip: int = 0, limit: int = 100, category: str = None, search: str = None, cursor: str = None, featured: bool = None) -> Query:
+        """Query behind get_products (each filter combination has a matching partial index)"""
         query = self.db.query(Product).filter(Product.is_active == True)
         
         if category:
             query = query.filter(Product.category == category)
         
+        if featured is not None:
+            query = query.filter(Product.is_featured == featured)
+        
         if search:
-            query = query.filter(Product.title.ilike(f"%{search}%"))
+            if cursor:
+                raise InvalidCursorError("Search results are paged with skip, not cursor")
+            query = ProductSearchService(self.db).apply(query, search)
+        
+        return keyset_query(query, Product, limit, cursor=cursor, skip=skip)
+    
+    def browse(
+        self,
+        limit: int = 50,
+        cursor: str = None,
+        categories: List[str] = None,
+        conditions: List[str] = None,
+        brands: List[str] = None,
+        colors: List[str] = None,
+        materials: List[str] = None,
+        min_price: float = None,
+        max_price: float = None
+    ) -> Tuple[List[Product], Dict[str, Dict[str, int]]]:
+        """
+        Filter products by any combination of facets (values within a facet are
+        OR-ed, facets are AND-ed), newest first, together with catalog facet counts
+        """
+        query = self.db.query(Product).filter(Product.is_active == True)
         
-        return query.offset(skip).limit(limit).all()
+        for column, values in (
+            (Product.category, categories),
+            (Product.condition, conditions),
+            (Product.brand, brands),
+            (Product.color, colors),
+            (Product.material, materials),
+        ):
+            if values:
+                query = query.filter(column.in_(values))
+        
+        if min_price is not None:
+            query = query.filter(Product.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Product.price <= max_price)
+        
+        products = keyset_query(query, Product, limit, cursor=cursor).all()
+        return products, FacetService(self.db).get_counts()
+    
+    def get_listing_versions(self, **filters) -> List[Tuple[int, datetime]]:
+        """(id, updated_at) of the rows get_products(**filters) would return, without loading them"""
+        return [tuple(row) for row in self.listing_query(**filters).with_entities(Product.id, Product.updated_at)]
+    
+    def get_product_version(self, product_id: int) -> Optional[datetime]:
+        """updated_at of an active product (None if not found), without loading the row"""
+        return self.db.query(Product.updated_at).filter(Product.id == product_id, Product.is_active == True).scalar()
     
     def get_product_by_id(self, product_id: int) -> Optional[Product]:
         """Get product by ID"""
@@ -36,6 +123,8 @@ class ProductService:
             seller_id=seller_id
         )
         self.db.add(db_product)
+        FacetService(self.db).record(None, product_facets(db_product))
+        invalidate_on_commit(self.db, PRODUCT_LIST_TAG)
         self.db.commit()
         self.db.refresh(db_product)
         return db_product
@@ -51,9 +140,12 @@ class ProductService:
         if not db_product:
             return None
         
+        before = product_facets(db_product)
         update_data = product_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_product, field, value)
+        FacetService(self.db).record(before, product_facets(db_product))
+        invalidate_on_commit(self.db, PRODUCT_LIST_TAG, product_tag(product_id))
         
         self.db.commit()
         self.db.refresh(db_product)
@@ -71,5 +163,109 @@ class ProductService:
             return False
         
         db_product.is_active = False
+        FacetService(self.db).record(product_facets(db_product), None)
+        invalidate_on_commit(self.db, PRODUCT_LIST_TAG, product_tag(product_id))
         self.db.commit()
         return True
+    
+    def bulk_create_products(self, items: List[Dict[str, Any]], seller_id: int) -> List[Dict[str, Any]]:
+        """
+        Create many products in one transaction
+        
+        Every item is validated first; the valid ones are inserted with a single
+        executemany INSERT ... RETURNING and facet counts are updated once for
+        the whole batch. Invalid items are reported and skipped.
+        
+        Returns:
+            List[Dict]: One result per item, in request order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        indexes, rows = [], []
+        for index, item in enumerate(items):
+            try:
+                product_data = ProductCreate.model_validate(item)
+            except ValidationError as e:
+                results[index] = _invalid(index, e)
+                continue
+            indexes.append(index)
+            rows.append({**product_data.model_dump(), "seller_id": seller_id})
+        
+        if rows:
+            ids = self.db.scalars(
+                insert(Product).returning(Product.id, sort_by_parameter_order=True), rows
+            ).all()
+            deltas = Counter()
+            for index, row, product_id in zip(indexes, rows, ids):
+                deltas.update(facet_values(row))
+                results[index] = {"index": index, "status": "created", "id": product_id}
+            FacetService(self.db).apply_deltas(deltas)
+            invalidate_on_commit(self.db, PRODUCT_LIST_TAG)
+            self.db.commit()
+        
+        return results
+    
+    def bulk_update_products(self, items: List[Dict[str, Any]], seller_id: int) -> List[Dict[str, Any]]:
+        """
+        Update many of a seller's products in one transaction
+        
+        Every item is validated first, the targeted products are read (and
+        locked) in one query, and the changes are written with an executemany UPDATE by
+        primary key. Invalid items, repeated ids and products that don't exist
+        or belong to another seller are reported and skipped.
+        
+        Returns:
+            List[Dict]: One result per item, in request order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        changes: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+        for index, item in enumerate(items):
+            try:
+                product_update = ProductBulkUpdateItem.model_validate(item)
+            except ValidationError as e:
+                results[index] = _invalid(index, e)
+                continue
+            if product_update.id in changes:
+                results[index] = {
+                    "index": index,
+                    "status": "invalid",
+                    "id": product_update.id,
+                    "errors": [{"type": "duplicate", "loc": ["id"], "msg": "Product appears more than once in this request"}],
+                }
+                continue
+            changes[product_update.id] = (index, product_update.model_dump(exclude_unset=True, exclude={"id"}))
+        
+        current = {}
+        if changes:
+            current = {
+                row.id: row._asdict()
+                for row in self.db.execute(
+                    select(Product.id, *(getattr(Product, name) for name in (*FACET_COLUMNS, "price")))
+                    .where(Product.id.in_(changes), Product.seller_id == seller_id, Product.is_active == True)
+                    .order_by(Product.id)
+                    # Facet deltas are computed from these values: concurrent bulk updates of the same rows must wait
+                    .with_for_update()
+                )
+            }
+        
+        now = datetime.utcnow()
+        deltas = Counter()
+        params = []
+        for product_id, (index, values) in changes.items():
+            if product_id not in current:
+                results[index] = {"index": index, "status": "not_found", "id": product_id}
+                continue
+            before = current[product_id]
+            deltas.update(facet_values({**before, **values}))
+            deltas.subtract(facet_values(before))
+            params.append({**values, "id": product_id, "updated_at": now})
+            results[index] = {"index": index, "status": "updated", "id": product_id}
+        
+        if params:
+            self.db.execute(update(Product), params)
+            FacetService(self.db).apply_deltas(deltas)
+            invalidate_on_commit(
+                self.db, PRODUCT_LIST_TAG, *(product_tag(row["id"]) for row in params)
+            )
+            self.db.commit()
+        
+        return results
@@ -0,0 +1,50 @@
+"""
+Product search service backed by the full-text index in app.db.fulltext
+"""
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.orm import Query, Session
+from app.db.fulltext import (
+    SEARCH_COLUMNS, SQLITE_BM25_WEIGHTS, SQLITE_FTS_TABLE,
+    fts5_query, products_fts, search_query, search_vector
+)
+from app.models.product import Product
+
+
+class ProductSearchService:
+    """Product search service class"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @property
+    def dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    def apply(self, query: Query, term: str) -> Query:
+        """
+        Restrict a product query to rows matching `term` across title, brand,
+        model and description, best matches first
+        """
+        term = term.strip()
+        if not term:
+            return query
+
+        if self.dialect == "postgresql":
+            vector = search_vector(Product.__table__)
+            tsquery = search_query(term)
+            return query.filter(vector.op("@@")(tsquery)).order_by(
+                func.ts_rank_cd(vector, tsquery).desc()
+            )
+
+        if self.dialect == "sqlite":
+            match = fts5_query(term)
+            if not match:
+                return query
+            fts = literal_column(SQLITE_FTS_TABLE)
+            return query.join(products_fts, products_fts.c.rowid == Product.id).filter(
+                fts.op("MATCH")(match)
+            ).order_by(func.bm25(fts, literal_column(SQLITE_BM25_WEIGHTS)))
+
+        # No full-text index on other backends: substring match, unranked
+        pattern = f"%{term}%"
+        return query.filter(or_(*(getattr(Product, name).ilike(pattern) for name, _ in SEARCH_COLUMNS)))
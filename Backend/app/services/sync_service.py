@@ -0,0 +1,98 @@
+"""
+Delta sync service for client-side product and order caches
+
+A watermark is an opaque token holding, per resource, the (updated_at, id)
+of the last row a client has received. Each sync returns the rows after it
+in (updated_at, id) order, served by the updated_at indexes. Soft-deleted
+rows (is_active false) come back as tombstones: just the id, for the client
+to drop. Rows updated within the last SYNC_LAG_SECONDS are held back until
+the next sync, because a transaction that stamped an earlier updated_at may
+not have committed yet and the watermark would otherwise move past it.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query, Session, selectinload
+
+from app.core.config import settings
+from app.models.order import Order
+from app.models.product import Product
+from app.utils.pagination import InvalidCursorError
+
+Position = Optional[Tuple[datetime, int]]
+
+
+def encode_watermark(positions: Dict[str, Position]) -> str:
+    """Encode per-resource (updated_at, id) positions as an opaque token"""
+    raw = json.dumps(
+        {name: [position[0].isoformat(), position[1]] if position else None for name, position in positions.items()},
+        separators=(",", ":")
+    ).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_watermark(watermark: str) -> Dict[str, Position]:
+    """
+    Decode a token produced by encode_watermark
+
+    Raises:
+        InvalidCursorError: If the watermark is malformed
+    """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(watermark + "=" * (-len(watermark) % 4)))
+        return {
+            name: (datetime.fromisoformat(position[0]), int(position[1])) if position else None
+            for name, position in raw.items()
+        }
+    except (ValueError, TypeError, AttributeError, IndexError):
+        raise InvalidCursorError("Invalid sync watermark")
+
+
+class SyncService:
+    """Sync service class"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_changes(self, user_id: int, watermark: str = None, limit: int = None) -> Dict[str, Any]:
+        """
+        Products and the user's orders changed after `watermark` (everything
+        on first sync), at most `limit` of each
+
+        Returns:
+            Dict: {"products": {"changed", "deleted"}, "orders": {...}, "watermark", "has_more"}
+        """
+        limit = limit or settings.SYNC_PAGE_SIZE
+        positions = decode_watermark(watermark) if watermark else {}
+        until = datetime.utcnow() - timedelta(seconds=settings.SYNC_LAG_SECONDS)
+
+        queries = {
+            "products": self.db.query(Product),
+            "orders": self.db.query(Order).options(selectinload(Order.order_items)).filter(Order.buyer_id == user_id),
+        }
+        response = {"has_more": False}
+        for name, query in queries.items():
+            model = query.column_descriptions[0]["entity"]
+            rows = self._changed_rows(query, model, positions.get(name), until, limit)
+            if len(rows) > limit:
+                rows = rows[:limit]
+                response["has_more"] = True
+            if rows:
+                positions[name] = (rows[-1].updated_at, rows[-1].id)
+            response[name] = {
+                "changed": [row for row in rows if row.is_active],
+                "deleted": [row.id for row in rows if not row.is_active],
+            }
+
+        response["watermark"] = encode_watermark({name: positions.get(name) for name in queries})
+        return response
+
+    def _changed_rows(self, query: Query, model: Any, position: Position, until: datetime, limit: int) -> List[Any]:
+        """Rows after `position` up to `until`, plus one extra to tell whether more remain"""
+        query = query.filter(model.updated_at <= until)
+        if position:
+            query = query.filter(tuple_(model.updated_at, model.id) > tuple_(*position))
+        return query.order_by(model.updated_at, model.id).limit(limit + 1).all()
@@ -6,6 +6,7 @@ from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserSignupRequest
 from app.core.security import get_password_hash, verify_password
 from app.utils.user_id_generator import generate_unique_user_id
+from datetime import datetime
 from typing import Optional
 
 
@@ -19,6 +20,10 @@ class UserService:
         """Get user by ID"""
         return self.db.query(User).filter(User.id == user_id).first()
     
+    def get_user_version(self, user_id: int) -> Optional[datetime]:
+        """updated_at of a user (None if not found), without loading the row"""
+        return self.db.query(User.updated_at).filter(User.id == user_id).scalar()
+    
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         return self.db.query(User).filter(User.email == email).first()
@@ -0,0 +1,48 @@
+"""
+ETag / If-None-Match helpers for conditional GETs
+
+ETags are derived from the updated_at timestamps of the rows a response is
+built from (plus a representation version), so they can be computed from a
+lightweight version lookup before loading or serializing anything.
+"""
+import hashlib
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+# Bump when a response schema changes so clients don't keep stale bodies
+REPRESENTATION_VERSION = "1"
+
+
+def make_etag(resource: str, versions: Iterable[Tuple[int, Optional[datetime]]]) -> str:
+    """
+    Strong ETag for a resource built from (id, updated_at) pairs
+
+    Args:
+        resource: Resource name, e.g. "product" or "products?category=sunglasses"
+        versions: (id, updated_at) of every row in the response, in response order
+
+    Returns:
+        str: Quoted ETag value
+    """
+    digest = hashlib.sha256(f"{REPRESENTATION_VERSION}:{resource}".encode())
+    for row_id, updated_at in versions:
+        digest.update(f"|{row_id}:{updated_at.isoformat() if updated_at else ''}".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match covers `etag` (weak comparison, per RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """304 response for a matching ETag"""
+    return Response(status_code=304, headers={"ETag": etag})
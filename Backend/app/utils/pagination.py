@@ -0,0 +1,94 @@
+"""
+Keyset (cursor) pagination utilities
+
+Lists are ordered newest first by (created_at, id). A cursor is an opaque,
+URL-safe token holding the (created_at, id) of the last row of a page; the
+next page is every row strictly after it in that order. Unlike OFFSET this
+costs the same at any depth (the database seeks the composite index instead
+of scanning and discarding skipped rows) and rows inserted while a client is
+paging don't shift later pages.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor this API did not issue"""
+
+    def __init__(self, message: str = "Invalid pagination cursor"):
+        super().__init__(message)
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode a row position as an opaque cursor
+
+    Args:
+        created_at: Creation timestamp of the last row on the page
+        row_id: Primary key of the last row on the page
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorError()
+
+
+def keyset_query(query: Query, model: Any, limit: int, cursor: Optional[str] = None, skip: int = 0) -> Query:
+    """
+    Apply newest-first keyset ordering and paging to a query
+
+    Args:
+        query: Filtered query over `model`
+        model: Mapped class with created_at and id columns
+        limit: Page size
+        cursor: Cursor from the previous page, if any
+        skip: Legacy offset, only applied when no cursor is given
+
+    Returns:
+        Query: Query for the page
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    elif skip:
+        query = query.offset(skip)
+
+    return query.limit(limit)
+
+
+def keyset_paginate(query: Query, model: Any, limit: int, cursor: Optional[str] = None, skip: int = 0) -> List[Any]:
+    """Rows for one page of keyset_query"""
+    return keyset_query(query, model, limit, cursor=cursor, skip=skip).all()
+
+
+def next_cursor(rows: List[Any], limit: int) -> Optional[str]:
+    """Cursor for the page after `rows`, or None if this was the last page"""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
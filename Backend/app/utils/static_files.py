@@ -0,0 +1,50 @@
+"""
+Static files with precompressed variants
+
+Serves `<file>.br` / `<file>.gz` (written by scripts/precompress_static.py)
+in place of `<file>` when the client accepts that coding, so static assets
+go out compressed without being compressed on every request.
+"""
+import mimetypes
+import os
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.middleware.compression import preferred_encodings
+
+# Coding -> file suffix, in preference order
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that prefers a precompressed sibling of the requested file"""
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        available = [
+            encoding for encoding, suffix in PRECOMPRESSED_SUFFIXES.items()
+            if os.path.isfile(f"{full_path}{suffix}")
+        ]
+        if not available:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        encodings = preferred_encodings(request_headers.get("accept-encoding"), available)
+        if encodings:
+            variant_path = f"{full_path}{PRECOMPRESSED_SUFFIXES[encodings[0]]}"
+            response = FileResponse(
+                variant_path,
+                status_code=status_code,
+                stat_result=os.stat(variant_path),
+                media_type=mimetypes.guess_type(str(full_path))[0] or "text/plain",
+                headers={"Content-Encoding": encodings[0]},
+            )
+        else:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        response.headers["Vary"] = "Accept-Encoding"
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,118 @@
+"""
+Benchmark bulk product create/update throughput
+
+Compares what N calls to POST/PUT /v1/products do (one ProductService
+create_product/update_product transaction per item) with a single
+POST/PATCH /v1/products/bulk call, reporting statements issued and
+products per second. Use --database-url postgresql://... to measure the
+single-statement INSERT ... RETURNING path; SQLite returns ids one row at
+a time but still writes everything in one transaction.
+
+Usage:
+    python benchmarks/bench_bulk_products.py [--items 500] [--runs 5] [--database-url sqlite:///bench_bulk.db]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.db.query_stats import track_queries
+from app.db.session import create_db_engine
+from app.models import User
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.product_service import ProductService
+
+BRANDS = ["Ray-Ban", "Oakley", "Persol", "Warby Parker", "Gucci", "Prada", "Maui Jim", "Tom Ford"]
+
+
+def make_items(count):
+    return [
+        {
+            "title": f"{BRANDS[n % len(BRANDS)]} frame {n}",
+            "category": "sunglasses",
+            "condition": "new",
+            "price": float(20 + n % 480),
+            "brand": BRANDS[n % len(BRANDS)],
+            "color": "black" if n % 2 else "tortoise",
+        }
+        for n in range(count)
+    ]
+
+
+def create_single(db, items, seller_id):
+    service = ProductService(db)
+    return [service.create_product(ProductCreate(**item), seller_id).id for item in items]
+
+
+def create_bulk(db, items, seller_id):
+    return [result["id"] for result in ProductService(db).bulk_create_products(items, seller_id)]
+
+
+def update_single(db, ids, seller_id):
+    service = ProductService(db)
+    for n, product_id in enumerate(ids):
+        service.update_product(product_id, ProductUpdate(price=float(30 + n % 400), quantity_available=2), seller_id)
+
+
+def update_bulk(db, ids, seller_id):
+    ProductService(db).bulk_update_products(
+        [{"id": product_id, "price": float(30 + n % 400), "quantity_available": 2} for n, product_id in enumerate(ids)],
+        seller_id
+    )
+
+
+def run(name, create, update, session_factory, seller_id, items, runs):
+    create_timings, update_timings = [], []
+    for _ in range(runs):
+        db = session_factory()
+        with track_queries() as create_stats:
+            start = time.perf_counter()
+            ids = create(db, items, seller_id)
+            create_timings.append(time.perf_counter() - start)
+        with track_queries() as update_stats:
+            start = time.perf_counter()
+            update(db, ids, seller_id)
+            update_timings.append(time.perf_counter() - start)
+        db.close()
+
+    print(name)
+    for action, stats, timings in (("create", create_stats, create_timings), ("update", update_stats, update_timings)):
+        mean = statistics.mean(timings)
+        print(f"  {action}: statements={stats.count:<6} mean={mean * 1000:.1f}ms throughput={len(items) / mean:,.0f} products/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite:///bench_bulk.db")
+    args = parser.parse_args()
+
+    engine = create_db_engine(args.database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = session_factory()
+    seller = User(email="bench@example.com", username="bench", hashed_password="x")
+    db.add(seller)
+    db.commit()
+    seller_id = seller.id
+    db.close()
+
+    # Bulk statements are expected to trip the slow-query log
+    logging.getLogger("app.db.query_stats").setLevel(logging.ERROR)
+    items = make_items(args.items)
+    print(f"{args.items} products per request on {engine.dialect.name}")
+    run("Single-item endpoints (one transaction per product)", create_single, update_single, session_factory, seller_id, items, args.runs)
+    run("Bulk endpoints (one transaction per request)", create_bulk, update_bulk, session_factory, seller_id, items, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark order creation for a 50-item order
+
+Compares the previous per-item product lookups (2N queries) with the batched
+OrderService.create_order, reporting statements issued and latency.
+
+Usage:
+    python benchmarks/bench_create_order.py [--items 50] [--runs 200] [--database-url sqlite:///bench.db]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.db.query_stats import track_queries
+from app.db.session import create_db_engine
+from app.models import User, Product, Order, OrderItem
+from app.models.product import ProductCategory, ProductCondition
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.services.order_service import OrderService
+
+
+def create_order_per_item(db, order_data, buyer_id):
+    """The previous implementation: one product query per item, twice"""
+    subtotal = 0.0
+    for item in order_data.items:
+        product = db.query(Product).filter(Product.id == item.product_id).first()
+        if product:
+            subtotal += product.price * item.quantity
+
+    db_order = Order(
+        order_number=f"ORD-{uuid.uuid4().hex[:8].upper()}",
+        buyer_id=buyer_id,
+        subtotal=subtotal,
+        total_amount=subtotal,
+    )
+    db.add(db_order)
+    db.flush()
+
+    for item in order_data.items:
+        product = db.query(Product).filter(Product.id == item.product_id).first()
+        if product:
+            db.add(OrderItem(
+                order_id=db_order.id,
+                product_id=item.product_id,
+                quantity=item.quantity,
+                unit_price=product.price,
+                total_price=product.price * item.quantity,
+                product_title=product.title,
+                product_sku=product.sku
+            ))
+
+    db.commit()
+    db.refresh(db_order)
+    return db_order
+
+
+def seed(session_factory, item_count):
+    db = session_factory()
+    buyer = User(email="bench@example.com", username="bench", hashed_password="x")
+    db.add(buyer)
+    db.flush()
+    products = [
+        Product(
+            title=f"Frame {i}",
+            category=ProductCategory.SUNGLASSES,
+            condition=ProductCondition.NEW,
+            price=50.0 + i,
+            sku=f"BENCH-{i}",
+            seller_id=buyer.id,
+        )
+        for i in range(item_count)
+    ]
+    db.add_all(products)
+    db.commit()
+    order_data = OrderCreate(items=[OrderItemCreate(product_id=p.id, quantity=1) for p in products])
+    buyer_id = buyer.id
+    db.close()
+    return order_data, buyer_id
+
+
+def run(name, create, session_factory, order_data, buyer_id, runs):
+    timings = []
+    statements = 0
+    for _ in range(runs):
+        db = session_factory()
+        with track_queries() as stats:
+            start = time.perf_counter()
+            create(db, order_data, buyer_id)
+            timings.append((time.perf_counter() - start) * 1000)
+        statements = stats.count
+        db.close()
+
+    print(
+        f"{name:<22} statements={statements:<4} "
+        f"mean={statistics.mean(timings):.2f}ms p95={sorted(timings)[int(len(timings) * 0.95) - 1]:.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    engine = create_db_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    order_data, buyer_id = seed(session_factory, args.items)
+
+    print(f"{args.items}-item order, {args.runs} runs on {engine.dialect.name}")
+    run("per-item lookups", create_order_per_item, session_factory, order_data, buyer_id, args.runs)
+    run(
+        "OrderService (batched)",
+        lambda db, data, buyer: OrderService(db).create_order(data, buyer),
+        session_factory, order_data, buyer_id, args.runs
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark JSON serialization of a /v1/products/?limit=100 page
+
+Loads one page of products and times each way of turning it into a
+response body:
+
+- jsonable_encoder + JSONResponse: FastAPI's fallback path (stdlib json)
+- response_model + JSONResponse: validate, dump to Python, stdlib json
+- response_model + ORJSONResponse: the same with orjson (DefaultJSONResponse)
+- dump_json + json_response: pydantic-core straight to bytes (the products route)
+
+Usage:
+    python benchmarks/bench_json_response.py [--limit 100] [--runs 500] [--database-url sqlite://]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from app.core.responses import DefaultJSONResponse, dump_json, json_response, type_adapter
+from app.db.base import Base
+from app.db.session import create_db_engine
+from app.models import User, Product
+from app.models.product import ProductCategory, ProductCondition
+from app.schemas.product import ProductResponse
+from app.services.product_service import ProductService
+
+
+def seed(db, rows):
+    seller = User(email="bench@example.com", username="bench", hashed_password="x")
+    db.add(seller)
+    db.commit()
+    db.execute(insert(Product), [
+        {
+            "title": f"Aviator {n}",
+            "description": "Polarized lenses in a titanium frame. " * 4,
+            "category": ProductCategory.SUNGLASSES,
+            "condition": ProductCondition.NEW,
+            "price": 100.0 + n,
+            "brand": "Ray-Ban",
+            "model": f"RB{3000 + n}",
+            "image_urls": '["https://cdn.example.com/a.jpg", "https://cdn.example.com/b.jpg"]',
+            "ai_confidence": 0.93,
+            "seller_id": seller.id,
+        }
+        for n in range(rows)
+    ])
+    db.commit()
+
+
+def jsonable_encoder_stdlib(products):
+    return JSONResponse(jsonable_encoder(type_adapter(List[ProductResponse]).validate_python(products, from_attributes=True))).body
+
+
+def response_model_stdlib(products):
+    adapter = type_adapter(List[ProductResponse])
+    return JSONResponse(adapter.dump_python(adapter.validate_python(products, from_attributes=True), mode="json")).body
+
+
+def response_model_default(products):
+    adapter = type_adapter(List[ProductResponse])
+    return DefaultJSONResponse(adapter.dump_python(adapter.validate_python(products, from_attributes=True), mode="json")).body
+
+
+def dump_json_bytes(products):
+    return json_response(dump_json(List[ProductResponse], products)).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    engine = create_db_engine(args.database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    seed(db, args.limit)
+    products = ProductService(db).get_products(limit=args.limit)
+    print(f"{len(products)} products, {DefaultJSONResponse.__name__} as default response class")
+
+    baseline = None
+    for name, render in (
+        ("jsonable_encoder + JSONResponse", jsonable_encoder_stdlib),
+        ("response_model + JSONResponse", response_model_stdlib),
+        (f"response_model + {DefaultJSONResponse.__name__}", response_model_default),
+        ("dump_json + json_response", dump_json_bytes),
+    ):
+        render(products)  # warm the TypeAdapter caches
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            body = render(products)
+            timings.append((time.perf_counter() - start) * 1000)
+        mean = statistics.mean(timings)
+        baseline = baseline or mean
+        print(f"  {name:<34} bytes={len(body):<7} mean={mean:.3f}ms p95={sorted(timings)[int(len(timings) * 0.95) - 1]:.3f}ms speedup={baseline / mean:.1f}x")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark product search on a large catalog
+
+Compares the previous Product.title ILIKE '%term%' scan with the full-text
+index used by ProductService.get_products(search=...), reporting latency per
+search term. Seeding 1M rows takes a few minutes on SQLite; use --rows for a
+quicker run, and --database-url postgresql://... to measure the GIN index.
+
+Usage:
+    python benchmarks/bench_product_search.py [--rows 1000000] [--runs 20] [--database-url sqlite:///bench_search.db]
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.db.session import create_db_engine
+from app.models import User, Product
+from app.models.product import ProductCategory, ProductCondition
+from app.services.product_service import ProductService
+
+BRANDS = ["Ray-Ban", "Oakley", "Persol", "Warby Parker", "Gucci", "Prada", "Maui Jim", "Tom Ford", "Costa", "Oliver Peoples"]
+STYLES = ["Aviator", "Wayfarer", "Clubmaster", "Round", "Cat Eye", "Square", "Rectangle", "Browline", "Shield", "Oval"]
+MATERIALS = ["acetate", "titanium", "stainless steel", "tortoiseshell", "nylon", "wood", "carbon fibre"]
+FEATURES = ["polarized", "photochromic", "blue light", "gradient", "mirrored", "anti-reflective", "scratch resistant"]
+TERMS = ["aviator", "oakley", "polarized titanium", "persol tortoiseshell", "photochromic", "rb2140"]
+
+BATCH_SIZE = 10000
+
+
+def seed(session_factory, rows):
+    db = session_factory()
+    seller = User(email="bench@example.com", username="bench", hashed_password="x")
+    db.add(seller)
+    db.commit()
+    seller_id = seller.id
+
+    rng = random.Random(42)
+    categories = list(ProductCategory)
+    conditions = list(ProductCondition)
+    for start in range(0, rows, BATCH_SIZE):
+        batch = []
+        for i in range(start, min(start + BATCH_SIZE, rows)):
+            brand, style = rng.choice(BRANDS), rng.choice(STYLES)
+            batch.append({
+                "title": f"{brand} {style} {rng.randint(1, 999)}",
+                "brand": brand,
+                "model": f"RB{rng.randint(1000, 9999)}",
+                "description": f"{rng.choice(FEATURES).capitalize()} lenses in a {rng.choice(MATERIALS)} frame",
+                "category": rng.choice(categories),
+                "condition": rng.choice(conditions),
+                "price": round(rng.uniform(20, 500), 2),
+                "seller_id": seller_id,
+            })
+        db.execute(insert(Product), batch)
+        db.commit()
+    db.close()
+
+
+def search_ilike(db, term):
+    """The previous implementation: leading-wildcard match on title only"""
+    return db.query(Product).filter(
+        Product.is_active == True,
+        Product.title.ilike(f"%{term}%")
+    ).limit(100).all()
+
+
+def search_fulltext(db, term):
+    return ProductService(db).get_products(search=term, limit=100)
+
+
+def run(name, search, session_factory, runs):
+    print(name)
+    for term in TERMS:
+        db = session_factory()
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            results = search(db, term)
+            timings.append((time.perf_counter() - start) * 1000)
+        db.close()
+        print(f"  {term!r:<26} hits={len(results):<4} mean={statistics.mean(timings):.2f}ms p95={sorted(timings)[int(len(timings) * 0.95) - 1]:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--database-url", default="sqlite:///bench_search.db")
+    args = parser.parse_args()
+
+    engine = create_db_engine(args.database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    # Bulk insert batches are expected to trip the slow-query log
+    logging.getLogger("app.db.query_stats").setLevel(logging.ERROR)
+    start = time.perf_counter()
+    seed(session_factory, args.rows)
+    logging.getLogger("app.db.query_stats").setLevel(logging.NOTSET)
+    print(f"Seeded {args.rows} products on {engine.dialect.name} in {time.perf_counter() - start:.1f}s")
+
+    run("ILIKE '%term%' on title", search_ilike, session_factory, args.runs)
+    run("Full-text index", search_fulltext, session_factory, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark worker startup: import-to-ready time
+
+Starts fresh interpreters (like gunicorn workers) and measures, in each:
+
+- import: `import main` (app construction, route registration)
+- startup: the startup event (OpenAPI document, optional create_all)
+- ready: the first 200 from /health/ready
+
+Pass --create-tables to also run create_all on startup, which is what every
+worker used to do at import time.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--database-url sqlite:////tmp/bench.db] [--create-tables]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    started = time.perf_counter()
+    status = client.get("/health/ready").status_code
+    ready = time.perf_counter()
+print(json.dumps({
+    "import": (imported - start) * 1000,
+    "startup": (started - imported) * 1000,
+    "ready": (ready - start) * 1000,
+    "status": status,
+}))
+"""
+
+
+def run_worker(env):
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite:////tmp/bench_startup.db")
+    parser.add_argument("--create-tables", action="store_true")
+    args = parser.parse_args()
+
+    env = dict(
+        os.environ,
+        DATABASE_URL=args.database_url,
+        DB_CREATE_TABLES_ON_STARTUP=str(args.create_tables).lower(),
+    )
+    run_worker(env)  # warm the bytecode cache
+    results = [run_worker(env) for _ in range(args.runs)]
+
+    print(f"{args.runs} workers, create_all on startup: {args.create_tables}, /health/ready: {results[-1]['status']}")
+    for phase in ("import", "startup", "ready"):
+        timings = [result[phase] for result in results]
+        print(f"  {phase:<8} mean={statistics.mean(timings):.1f}ms min={min(timings):.1f}ms max={max(timings):.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
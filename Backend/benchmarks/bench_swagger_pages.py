@@ -0,0 +1,59 @@
+"""
+Benchmark rendering of the Swagger login page and dashboard
+
+Times each way of producing the page body:
+
+- compile + render: parse the template on every request (no template cache)
+- compiled render: the template compiled once, rendered per request (the dashboard)
+- cached bytes: rendered once at import (the login page without an error)
+
+Usage:
+    python benchmarks/bench_swagger_pages.py [--runs 2000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jinja2 import Environment, select_autoescape
+from app.routes.swagger_auth import TEMPLATES_DIR, get_dashboard_html, get_login_html
+
+
+def compile_and_render(name, **context):
+    environment = Environment(autoescape=select_autoescape())
+    source = (TEMPLATES_DIR / name).read_text()
+    return environment.from_string(source).render(**context)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+
+    user = SimpleNamespace(
+        email="bench@example.com", username="bench", first_name="Bench", full_name="Bench User",
+        phone_number="+15555550100", is_admin=False, is_seller=True, last_login=datetime.utcnow(),
+    )
+    for name, render in (
+        ("login: compile + render", lambda: compile_and_render("swagger_login.html", error=None)),
+        ("login: cached bytes", lambda: get_login_html()),
+        ("login with error: compiled render", lambda: get_login_html("Incorrect email/phone or password")),
+        ("dashboard: compile + render", lambda: compile_and_render("swagger_dashboard.html", user=user, project_name="Bench")),
+        ("dashboard: compiled render", lambda: get_dashboard_html(user)),
+    ):
+        render()
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - start) * 1_000_000)
+        print(f"  {name:<36} mean={statistics.mean(timings):.1f}us p95={sorted(timings)[int(len(timings) * 0.95) - 1]:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 Error handling middleware for FastAPI application
 """
 from fastapi import Request, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -18,7 +19,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content={
             "error": "Validation Error",
             "message": "Invalid input data",
-            "details": exc.errors()
+            "details": jsonable_encoder(exc.errors())
         }
     )
 
@@ -0,0 +1,25 @@
+"""Add reservation expiry to orders
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('orders', sa.Column('reserved_until', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_orders_reserved_until'), 'orders', ['reserved_until'])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_orders_reserved_until'), table_name='orders')
+    op.drop_column('orders', 'reserved_until')
@@ -0,0 +1,26 @@
+"""Add keyset pagination indexes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Match ORDER BY created_at DESC, id DESC (and the per-buyer filter for orders)
+    op.create_index('ix_products_created_at_id', 'products', ['created_at', 'id'])
+    op.create_index('ix_orders_buyer_id_created_at_id', 'orders', ['buyer_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_buyer_id_created_at_id', table_name='orders')
+    op.drop_index('ix_products_created_at_id', table_name='products')
@@ -0,0 +1,71 @@
+"""Add full-text search index for products
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+# Must stay identical to app.db.fulltext.search_vector so queries use the index
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(brand, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(model, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C')"
+)
+
+COLUMNS = "title, brand, model, description"
+NEW_VALUES = "new.title, new.brand, new.model, new.description"
+OLD_VALUES = "old.title, old.brand, old.model, old.description"
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    
+    if dialect == 'postgresql':
+        # CONCURRENTLY avoids locking writes on a large catalog
+        with op.get_context().autocommit_block():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_search ON products USING gin (({SEARCH_VECTOR}))")
+    
+    elif dialect == 'sqlite':
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+            f"{COLUMNS}, content='products', content_rowid='id', tokenize='porter unicode61')"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN "
+            f"INSERT INTO products_fts(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN "
+            f"INSERT INTO products_fts(products_fts, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF {COLUMNS} ON products BEGIN "
+            f"INSERT INTO products_fts(products_fts, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES}); "
+            f"INSERT INTO products_fts(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES}); END"
+        )
+        # Index the rows that already exist
+        op.execute("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_products_search")
+    
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS products_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS products_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS products_fts_ai")
+        op.execute("DROP TABLE IF EXISTS products_fts")
@@ -0,0 +1,45 @@
+"""Add partial and composite indexes for product listings
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+# Listings only show active products, so these indexes skip soft-deleted rows
+PARTIAL_INDEXES = [
+    ('ix_products_active_created_at_id', ['created_at', 'id']),
+    ('ix_products_active_category_created_at_id', ['category', 'created_at', 'id']),
+    ('ix_products_active_featured_created_at_id', ['is_featured', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in PARTIAL_INDEXES:
+            op.create_index(
+                name, 'products', columns,
+                postgresql_where=sa.text('is_active = true'),
+                sqlite_where=sa.text('is_active = 1'),
+                postgresql_concurrently=True
+            )
+        op.create_index('ix_products_seller_id_is_active', 'products', ['seller_id', 'is_active'], postgresql_concurrently=True)
+        
+        # Superseded by ix_products_active_created_at_id
+        op.drop_index('ix_products_created_at_id', table_name='products', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_products_created_at_id', 'products', ['created_at', 'id'], postgresql_concurrently=True)
+        op.drop_index('ix_products_seller_id_is_active', table_name='products', postgresql_concurrently=True)
+        for name, _ in reversed(PARTIAL_INDEXES):
+            op.drop_index(name, table_name='products', postgresql_concurrently=True)
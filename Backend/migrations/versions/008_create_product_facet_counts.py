@@ -0,0 +1,58 @@
+"""Create product_facet_counts table
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# Enum columns store member names; facet values are the lower-case enum values
+FACET_EXPRESSIONS = {
+    'category': "LOWER(CAST(category AS VARCHAR))",
+    'condition': "LOWER(CAST(condition AS VARCHAR))",
+    'brand': "brand",
+    'color': "color",
+    'material': "material",
+    # Must match app.services.facet_service.PRICE_BUCKETS
+    'price': (
+        "CASE WHEN price < 50 THEN '0-50' WHEN price < 100 THEN '50-100' "
+        "WHEN price < 250 THEN '100-250' WHEN price < 500 THEN '250-500' ELSE '500+' END"
+    ),
+}
+
+
+def upgrade() -> None:
+    op.create_table('product_facet_counts',
+        sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column('facet', sa.String(length=20), nullable=False),
+        sa.Column('value', sa.String(length=100), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('facet', 'value', name='uq_product_facet_counts_facet_value')
+    )
+    op.create_index(op.f('ix_product_facet_counts_id'), 'product_facet_counts', ['id'])
+    
+    # Backfill from the current catalog; ProductService keeps the counts up to date from here on
+    for facet, expression in FACET_EXPRESSIONS.items():
+        op.execute(
+            f"INSERT INTO product_facet_counts (facet, value, count, created_at, updated_at, is_active) "
+            f"SELECT '{facet}', {expression}, COUNT(*), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, TRUE "
+            f"FROM products WHERE is_active = TRUE AND {expression} IS NOT NULL AND {expression} <> '' "
+            f"GROUP BY {expression}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_product_facet_counts_id'), table_name='product_facet_counts')
+    op.drop_table('product_facet_counts')
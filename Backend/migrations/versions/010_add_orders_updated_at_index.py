@@ -0,0 +1,27 @@
+"""Add (buyer_id, updated_at, id) index for order delta sync
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_orders_buyer_id_updated_at_id', 'orders', ['buyer_id', 'updated_at', 'id'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_orders_buyer_id_updated_at_id', table_name='orders', postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+"""
+Write the OpenAPI schema as openapi.json (plus openapi.json.gz) so the API
+docs can be served statically, e.g. from static/ via PrecompressedStaticFiles
+or a CDN. The bytes are identical to what /docs/frame/openapi.json serves.
+Run as part of the build whenever routes or schemas change.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.openapi import get_openapi_document
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+
+
+def dump_openapi(directory: str = STATIC_DIR):
+    """Write openapi.json and its gzip variant to a directory"""
+    from app.main import app
+    
+    document = get_openapi_document(app)
+    os.makedirs(directory, exist_ok=True)
+    for name, data in (("openapi.json", document.body), ("openapi.json.gz", document.gzip_body)):
+        path = os.path.join(directory, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        print(f"{path}: {len(data)} bytes")
+    print(f"ETag: {document.etag}")
+
+
+if __name__ == "__main__":
+    dump_openapi(sys.argv[1] if len(sys.argv) > 1 else STATIC_DIR)
@@ -1,22 +1,40 @@
 """
 Database initialization script
+
+Run once per deployment (release step, Cloud Run job or `make db-init`),
+before the new revision takes traffic; workers never create or migrate the
+schema themselves. An empty database gets every table from the models and is
+stamped at the latest migration; an existing one is migrated to head.
 """
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine
+from sqlalchemy import inspect
 from app.db.base import Base
-from app.core.config import settings
+import app.models  # noqa: F401 - registers every table on Base.metadata
+from app.db.session import engine
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 def init_db():
-    """Initialize database tables"""
-    # Create engine
-    engine = create_engine(settings.DATABASE_URL)
+    """Create the schema on an empty database, otherwise migrate it to head"""
+    from alembic import command
+    from alembic.config import Config
     
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    
+    tables = set(inspect(engine).get_table_names())
+    if not tables - {"alembic_version"}:
+        Base.metadata.create_all(bind=engine)
+        command.stamp(config, "head")
+        print("Database tables created successfully!")
+    else:
+        command.upgrade(config, "head")
+        print("Database migrated to head")
+
 
 if __name__ == "__main__":
     init_db()
@@ -0,0 +1,56 @@
+"""
+Write .gz (and .br, when the brotli package is installed) variants of the
+compressible files under static/, for PrecompressedStaticFiles to serve.
+Run as part of the build whenever static files change; variants that are
+already up to date are skipped.
+"""
+import sys
+import os
+import gzip
+import mimetypes
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.middleware.compression import brotli
+from app.utils.static_files import PRECOMPRESSED_SUFFIXES
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def precompress_static(directory: str = STATIC_DIR):
+    """Write compressed variants next to each compressible static file"""
+    encodings = [encoding for encoding in PRECOMPRESSED_SUFFIXES if encoding != "br" or brotli is not None]
+    content_types = set(settings.compression_content_types)
+    written = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith(tuple(PRECOMPRESSED_SUFFIXES.values())):
+                continue
+            if mimetypes.guess_type(name)[0] not in content_types or os.path.getsize(path) < settings.COMPRESSION_MINIMUM_SIZE:
+                continue
+            
+            with open(path, "rb") as f:
+                data = f.read()
+            for encoding in encodings:
+                variant = path + PRECOMPRESSED_SUFFIXES[encoding]
+                if os.path.exists(variant) and os.path.getmtime(variant) >= os.path.getmtime(path):
+                    continue
+                compressed = _compress(data, encoding)
+                if len(compressed) >= len(data):
+                    continue
+                with open(variant, "wb") as f:
+                    f.write(compressed)
+                written += 1
+                print(f"{variant}: {len(data)} -> {len(compressed)} bytes")
+    print(f"Wrote {written} precompressed files under {directory}")
+
+
+if __name__ == "__main__":
+    precompress_static(sys.argv[1] if len(sys.argv) > 1 else STATIC_DIR)
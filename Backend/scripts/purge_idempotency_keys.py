@@ -0,0 +1,24 @@
+"""
+Delete expired idempotency keys.
+Run periodically (e.g. Cloud Scheduler -> Cloud Run job, or cron).
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.idempotency_service import IdempotencyService
+
+
+def purge_idempotency_keys():
+    """Remove keys past their replay window"""
+    db = SessionLocal()
+    try:
+        purged = IdempotencyService(db).purge_expired()
+        print(f"Purged {purged} expired idempotency key(s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    purge_idempotency_keys()
@@ -0,0 +1,26 @@
+"""
+Recompute product facet counts from the products table.
+Only needed to repair counts after writes that bypassed ProductService
+(e.g. manual SQL); ProductService maintains them incrementally.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.facet_service import FacetService
+
+
+def rebuild_facet_counts():
+    """Replace every facet count with a fresh GROUP BY"""
+    db = SessionLocal()
+    try:
+        FacetService(db).rebuild()
+        db.commit()
+        print("Rebuilt product facet counts")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_facet_counts()
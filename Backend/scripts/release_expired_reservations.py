@@ -0,0 +1,24 @@
+"""
+Release stock held by unpaid orders whose reservation has expired.
+Run periodically (e.g. Cloud Scheduler -> Cloud Run job, or cron).
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.inventory_service import InventoryService
+
+
+def release_expired_reservations():
+    """Cancel expired unpaid orders and restock their items"""
+    db = SessionLocal()
+    try:
+        released = InventoryService(db).release_expired_reservations()
+        print(f"Released {released} expired reservation(s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    release_expired_reservations()
@@ -4,6 +4,12 @@ set -e
 # Get port from environment variable (Cloud Run sets this)
 PORT=${PORT:-8080}
 
+# Create/migrate the schema once for this container, before any worker starts
+# (prefer running scripts/init_db.py as a separate release job when possible)
+if [ "${DB_INIT_ON_START:-false}" = "true" ]; then
+    python scripts/init_db.py
+fi
+
 # Start the application using gunicorn with uvicorn workers
 exec gunicorn -w 4 -k uvicorn.workers.UvicornWorker \
     --bind "0.0.0.0:${PORT}" \
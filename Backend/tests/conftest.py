@@ -0,0 +1,101 @@
+"""
+Shared test configuration
+"""
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite database before app.core.config is imported
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='frame-tests-'), 'app.db')}"
+)
+# Statement counting backs query budgets and assert_max_queries
+os.environ.setdefault("QUERY_INSTRUMENTATION_ENABLED", "true")
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.db.session import create_db_engine
+from app.models import User, Product
+from app.models.product import ProductCategory, ProductCondition
+
+
+@pytest.fixture
+def db_engine():
+    """Instrumented in-memory SQLite engine with all tables created"""
+    engine = create_db_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(db_engine):
+    """Session bound to the in-memory test database"""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def make_user(db_session):
+    """Factory for persisted users"""
+    def factory(email="seller@example.com", **fields):
+        user = User(
+            email=email,
+            username=email.split("@")[0],
+            hashed_password="not-a-real-hash",
+            **fields
+        )
+        db_session.add(user)
+        db_session.commit()
+        return user
+    return factory
+
+
+@pytest.fixture
+def make_product(db_session):
+    """Factory for persisted products"""
+    def factory(seller, **fields):
+        values = {
+            "title": "Aviator Sunglasses",
+            "category": ProductCategory.SUNGLASSES,
+            "condition": ProductCondition.NEW,
+            "price": 100.0,
+            "quantity_available": 1,
+        }
+        values.update(fields)
+        product = Product(seller_id=seller.id, **values)
+        db_session.add(product)
+        db_session.commit()
+        return product
+    return factory
+
+
+@pytest.fixture
+def app_client(db_session):
+    """
+    Factory for app clients on the test database: every session dependency
+    yields db_session, `user` (if given) is the authenticated user, and the
+    response cache starts and ends empty. Overrides are removed afterwards.
+    """
+    from fastapi.testclient import TestClient
+    from app.api.v1.dependencies import get_current_user
+    from app.core.cache import response_cache
+    from app.db.session import get_db, get_lazy_db, get_primary_read_db, get_read_db
+    from app.main import app
+
+    dependencies = (get_db, get_lazy_db, get_primary_read_db, get_read_db)
+
+    def factory(user=None, **client_options):
+        for dependency in dependencies:
+            app.dependency_overrides[dependency] = lambda: db_session
+        if user is not None:
+            app.dependency_overrides[get_current_user] = lambda: user
+        return TestClient(app, **client_options)
+
+    response_cache.clear()
+    yield factory
+    for dependency in (*dependencies, get_current_user):
+        app.dependency_overrides.pop(dependency, None)
+    response_cache.clear()
@@ -0,0 +1,61 @@
+"""
+Tests for the /v1/batch endpoint
+"""
+import pytest
+from sqlalchemy import inspect
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.query_stats import track_queries
+
+
+@pytest.fixture
+def client(app_client):
+    return app_client()
+
+
+def batch(client, *paths, **kwargs):
+    return client.post("/v1/batch/", json={"requests": [{"id": str(n), "path": path} for n, path in enumerate(paths)]}, **kwargs)
+
+
+def test_runs_sub_requests_and_returns_responses_in_order(client, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller, title="Aviator", is_featured=True)
+
+    response = batch(client, "/v1/products/?featured=true&fields=id,title", f"/v1/products/{product.id}", "/v1/products/999999")
+
+    assert response.status_code == 200
+    first, second, third = response.json()["responses"]
+    assert (first["id"], first["status"], first["body"]) == ("0", 200, [{"id": product.id, "title": "Aviator"}])
+    assert first["headers"]["content-type"] == "application/json"
+    assert "etag" in first["headers"]
+    assert (second["status"], second["body"]["title"]) == (200, "Aviator")
+    assert third["status"] == 404
+
+
+def test_authenticates_once_for_the_whole_batch(client, make_user):
+    user = make_user()
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+    with track_queries() as stats:
+        response = batch(client, "/v1/orders/", "/v1/orders/?status=pending", "/v1/sync/", headers=headers)
+
+    assert [item["status"] for item in response.json()["responses"]] == [200, 200, 200]
+    assert sum("FROM users" in statement and "WHERE users.id" in statement for statement in stats.statements) == 1
+    assert inspect(user).detached  # the same identity the sub-requests shared
+
+
+def test_sub_requests_without_credentials_are_rejected_individually(client):
+    response = batch(client, "/v1/orders/", "/health")
+    assert [item["status"] for item in response.json()["responses"]] == [401, 200]
+
+
+@pytest.mark.parametrize("requests", [
+    [{"path": "/v1/batch/"}],
+    [{"path": "/v1/%62atch/"}],
+    [{"path": "https://example.com/v1/products/"}],
+    [{"method": "POST", "path": "/v1/products/"}],
+    [{"path": "/health"}] * (settings.BATCH_MAX_REQUESTS + 1),
+    [],
+])
+def test_rejects_nested_foreign_unsafe_and_oversized_batches(client, requests):
+    assert client.post("/v1/batch/", json={"requests": requests}).status_code == 422
@@ -0,0 +1,137 @@
+"""
+Tests for bulk product create/update
+"""
+import pytest
+from app.core.config import settings
+from app.db.query_stats import assert_max_queries
+from app.models import Product, ProductFacetCount
+from app.services.facet_service import FacetService
+from app.services.product_service import ProductService
+
+
+def item(**fields):
+    values = {"title": "Frame", "category": "sunglasses", "condition": "new", "price": 80.0}
+    values.update(fields)
+    return values
+
+
+def stored_counts(db):
+    return {(row.facet, row.value): row.count for row in db.query(ProductFacetCount) if row.count}
+
+
+@pytest.fixture
+def seller(make_user):
+    return make_user()
+
+
+@pytest.fixture
+def client(app_client, seller):
+    return app_client(user=seller)
+
+
+def test_bulk_create_inserts_valid_items_and_reports_invalid_ones(db_session, seller):
+    items = [item(title="Aviator", brand="Ray-Ban"), item(price="free"), item(title="Wayfarer", brand="Ray-Ban")]
+
+    results = ProductService(db_session).bulk_create_products(items, seller.id)
+
+    assert [result["status"] for result in results] == ["created", "invalid", "created"]
+    assert results[1]["errors"][0]["loc"] == ("price",)
+    created = {product.id: product for product in db_session.query(Product)}
+    assert created[results[0]["id"]].title == "Aviator"
+    assert created[results[2]["id"]].title == "Wayfarer"
+    assert all(product.seller_id == seller.id for product in created.values())
+
+
+def test_bulk_create_batches_everything_but_the_insert(db_session, seller):
+    items = [item(title=f"Frame {n}", brand=f"Brand {n % 5}", price=float(n)) for n in range(200)]
+    seller_id = seller.id
+
+    with assert_max_queries(len(items) + 1) as stats:
+        ProductService(db_session).bulk_create_products(items, seller_id)
+
+    # One executemany INSERT (a single statement where the driver can return
+    # ids in parameter order, one per row on SQLite) plus one facet upsert
+    inserts = [statement for statement in stats.statements if statement.startswith("INSERT INTO products")]
+    assert len(stats.statements) - len(inserts) == 1
+    assert db_session.query(Product).count() == 200
+
+
+def test_bulk_writes_keep_facet_counts_in_sync(db_session, seller):
+    service = ProductService(db_session)
+    results = service.bulk_create_products(
+        [item(brand="Oakley", color="black"), item(brand="Persol", price=320.0), item(brand="Oakley", price=40.0)],
+        seller.id
+    )
+    service.bulk_update_products(
+        [{"id": results[0]["id"], "brand": "Persol"}, {"id": results[2]["id"], "price": 150.0}],
+        seller.id
+    )
+    incremental = stored_counts(db_session)
+
+    assert FacetService(db_session).get_counts()["brand"] == {"Persol": 2, "Oakley": 1}
+    FacetService(db_session).rebuild()
+    db_session.commit()
+    assert stored_counts(db_session) == incremental
+
+
+def test_bulk_update_reports_missing_foreign_duplicate_and_invalid_items(db_session, seller, make_user, make_product):
+    other = make_user(email="other@example.com")
+    mine = make_product(seller, title="Mine")
+    theirs = make_product(other, title="Theirs")
+    before = mine.updated_at
+
+    results = ProductService(db_session).bulk_update_products(
+        [
+            {"id": mine.id, "title": "Renamed", "price": 95.0},
+            {"id": theirs.id, "title": "Stolen"},
+            {"id": 999999, "title": "Ghost"},
+            {"id": mine.id, "title": "Again"},
+            {"title": "No id"},
+        ],
+        seller.id
+    )
+
+    assert [result["status"] for result in results] == ["updated", "not_found", "not_found", "invalid", "invalid"]
+    db_session.expire_all()
+    assert (mine.title, mine.price) == ("Renamed", 95.0)
+    assert mine.updated_at > before
+    assert theirs.title == "Theirs"
+
+
+def test_bulk_update_rejects_nulls_and_negative_values(db_session, seller, make_product):
+    product = make_product(seller, title="Mine")
+
+    results = ProductService(db_session).bulk_update_products(
+        [
+            {"id": product.id, "title": None},
+            {"id": product.id, "price": -1.0},
+            {"id": product.id, "quantity_available": -3},
+            {"id": product.id, "description": None},
+        ],
+        seller.id
+    )
+
+    assert [result["status"] for result in results] == ["invalid", "invalid", "invalid", "updated"]
+    assert [result["errors"][0]["loc"] for result in results[:3]] == [("title",), ("price",), ("quantity_available",)]
+    db_session.expire_all()
+    assert (product.title, product.description) == ("Mine", None)
+
+
+def test_bulk_routes(client, db_session, seller):
+    response = client.post("/v1/products/bulk", json={"items": [item(title="A"), item(title="B"), {"title": "C"}]})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    ids = [result["id"] for result in body["results"][:2]]
+
+    response = client.patch("/v1/products/bulk", json={"items": [{"id": ids[0], "quantity_available": 7}, {"id": -1}]})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (1, 1)
+    assert client.get(f"/v1/products/{ids[0]}").json()["quantity_available"] == 7
+
+
+def test_bulk_routes_cap_the_number_of_items(client):
+    items = [item()] * (settings.PRODUCT_BULK_MAX_ITEMS + 1)
+    assert client.post("/v1/products/bulk", json={"items": items}).status_code == 422
+    assert client.post("/v1/products/bulk", json={"items": []}).status_code == 422
@@ -0,0 +1,114 @@
+"""
+Tests for response compression and precompressed static files
+"""
+import gzip
+import zlib
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+from app.middleware.compression import CompressionMiddleware, accepted_encodings, preferred_encodings
+from app.utils.static_files import PrecompressedStaticFiles
+
+LARGE = b'{"items": [' + b",".join(b'{"title": "Aviator"}' for _ in range(200)) + b"]}"
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, content_types=["application/json", "application/x-ndjson"], brotli_enabled=False)
+
+    @app.get("/large")
+    def large():
+        return Response(LARGE, media_type="application/json", headers={"ETag": '"abc"'})
+
+    @app.get("/unchanged")
+    def unchanged():
+        return Response(status_code=304, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    def small():
+        return Response(b'{"ok": true}', media_type="application/json")
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" + b"\0" * 2000, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((b'{"n": %d}\n' % n for n in range(100)), media_type="application/x-ndjson")
+
+    return TestClient(app)
+
+
+def raw_get(client, path, encoding="gzip"):
+    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_accept_encoding_parsing():
+    assert accepted_encodings("gzip, deflate, br;q=0") == {"gzip", "deflate"}
+    assert accepted_encodings("br;q=0.5, *;q=0.1") == {"br", "*"}
+    assert accepted_encodings(None) == set()
+
+
+def test_preferred_encodings_follow_q_values():
+    assert preferred_encodings("gzip;q=1, br;q=0.1") == ["gzip", "br"]
+    assert preferred_encodings("gzip, br") == ["br", "gzip"]
+    assert preferred_encodings("*;q=0.5, gzip;q=0") == ["br"]
+    assert preferred_encodings("identity") == []
+
+
+def test_not_modified_answers_with_the_validator_the_client_holds(client):
+    response = client.get("/unchanged", headers={"Accept-Encoding": "gzip", "If-None-Match": 'W/"abc"'})
+    assert response.status_code == 304
+    assert response.headers["etag"] == 'W/"abc"'
+
+    response = client.get("/unchanged", headers={"Accept-Encoding": "gzip", "If-None-Match": '"abc"'})
+    assert response.headers["etag"] == '"abc"'
+
+
+def test_large_allowlisted_responses_are_gzipped(client):
+    response, body = raw_get(client, "/large")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert int(response.headers["content-length"]) == len(body) < len(LARGE)
+    assert gzip.decompress(body) == LARGE
+
+
+@pytest.mark.parametrize("path,encoding", [("/small", "gzip"), ("/image", "gzip"), ("/large", "identity"), ("/large", "gzip;q=0")])
+def test_small_foreign_or_unaccepted_responses_pass_through(client, path, encoding):
+    response, _ = raw_get(client, path, encoding)
+    assert "content-encoding" not in response.headers
+
+
+def test_streamed_responses_are_compressed_incrementally(client):
+    response, body = raw_get(client, "/stream")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert zlib.decompress(body, 31).count(b"\n") == 100
+
+
+def test_precompressed_static_variants(tmp_path):
+    (tmp_path / "app.js").write_text("console.log('x');" * 100)
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress((tmp_path / "app.js").read_bytes()))
+    (tmp_path / "logo.svg").write_text("<svg/>")
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=str(tmp_path)))
+    client = TestClient(app)
+
+    response, body = raw_get(client, "/static/app.js")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert gzip.decompress(body) == (tmp_path / "app.js").read_bytes()
+
+    response, body = raw_get(client, "/static/app.js", "identity")
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert body == (tmp_path / "app.js").read_bytes()
+
+    response, _ = raw_get(client, "/static/logo.svg")
+    assert "content-encoding" not in response.headers
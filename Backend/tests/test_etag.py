@@ -0,0 +1,72 @@
+"""
+Tests for ETag / If-None-Match conditional GETs
+"""
+import pytest
+from starlette.requests import Request
+from app.core.config import settings
+from app.db.query_stats import track_queries
+from app.schemas.product import ProductUpdate
+from app.services.product_service import ProductService
+from app.utils.etag import etag_matches
+
+
+@pytest.fixture(params=[True, False], ids=["cached", "uncached"])
+def client(request, app_client, monkeypatch):
+    """App client on the test database, with and without the response cache"""
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", request.param)
+    return app_client()
+
+
+def request_with(if_none_match):
+    return Request({"type": "http", "headers": [(b"if-none-match", if_none_match.encode())]})
+
+
+def test_if_none_match_parsing():
+    assert etag_matches(request_with('"a", "b"'), '"b"')
+    assert etag_matches(request_with('W/"b"'), '"b"')
+    assert etag_matches(request_with("*"), '"b"')
+    assert not etag_matches(request_with('"a"'), '"b"')
+
+
+def test_product_detail_revalidation(client, db_session, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller)
+    etag = client.get(f"/v1/products/{product.id}").headers["ETag"]
+
+    with track_queries() as stats:
+        response = client.get(f"/v1/products/{product.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    # Served from the cache, or from a single-column version lookup
+    assert stats.count <= 1
+    assert all("products.title" not in statement for statement in stats.statements)
+
+    ProductService(db_session).update_product(product.id, ProductUpdate(price=150.0), seller.id)
+    response = client.get(f"/v1/products/{product.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_product_list_revalidation(client, db_session, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller, sku="A")
+    etag = client.get("/v1/products/?limit=10").headers["ETag"]
+
+    assert client.get("/v1/products/?limit=10", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/v1/products/?limit=5", headers={"If-None-Match": etag}).status_code == 200
+
+    ProductService(db_session).delete_product(product.id, seller.id)
+    assert client.get("/v1/products/?limit=10", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_user_profile_revalidation(client, db_session, make_user):
+    user = make_user()
+    etag = client.get(f"/v1/auth/{user.id}").headers["ETag"]
+
+    assert client.get(f"/v1/auth/{user.id}", headers={"If-None-Match": etag}).status_code == 304
+
+    user.first_name = "Renamed"
+    db_session.commit()
+    assert client.get(f"/v1/auth/{user.id}", headers={"If-None-Match": etag}).status_code == 200
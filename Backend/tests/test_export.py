@@ -0,0 +1,118 @@
+"""
+Tests for the streaming catalog export
+"""
+import csv
+import io
+import json
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db.session import get_read_session_factory
+from app.main import app
+from app.services.export_service import EXPORT_COLUMNS, ProductExportService
+
+
+@pytest.fixture(autouse=True)
+def no_lag(monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_LAG_SECONDS", 0)
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+
+@pytest.fixture
+def client(session_factory):
+    app.dependency_overrides[get_read_session_factory] = lambda: session_factory
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_read_session_factory, None)
+
+
+@pytest.fixture
+def catalog(db_session, make_user, make_product):
+    seller = make_user()
+    products = [make_product(seller, title=f"Frame {n}", brand="Oakley") for n in range(5)]
+    products[4].is_active = False
+    db_session.commit()
+    return products
+
+
+def read_ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_full_ndjson_export_streams_active_products(client, catalog):
+    response = client.get("/v1/products/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-length" not in response.headers
+    rows = read_ndjson(response)
+    assert [row["title"] for row in rows] == [f"Frame {n}" for n in range(4)]
+    assert rows[0]["category"] == "sunglasses"
+    assert list(rows[0]) == list(EXPORT_COLUMNS)
+    assert response.headers["x-export-watermark"] == max(p.updated_at for p in catalog).isoformat()
+
+
+def test_csv_export(client, catalog):
+    response = client.get("/v1/products/export", params={"format": "csv"})
+
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == [f"Frame {n}" for n in range(4)]
+    assert rows[0]["condition"] == "new"
+    assert rows[0]["sku"] == ""
+
+
+def test_incremental_export_includes_changes_and_deactivations(client, db_session, catalog):
+    watermark = client.get("/v1/products/export").headers["x-export-watermark"]
+    assert read_ndjson(client.get("/v1/products/export", params={"since": watermark})) == []
+
+    catalog[1].price = 80.0
+    catalog[2].is_active = False
+    db_session.commit()
+
+    response = client.get("/v1/products/export", params={"since": watermark})
+    rows = read_ndjson(response)
+    assert [(row["id"], row["price"], row["is_active"]) for row in rows] == [
+        (catalog[1].id, 80.0, True),
+        (catalog[2].id, 100.0, False),
+    ]
+    assert response.headers["x-export-watermark"] > watermark
+
+
+def test_export_is_written_in_chunks(session_factory, catalog):
+    service = ProductExportService(session_factory, chunk_size=2)
+
+    chunks = list(service.stream("ndjson", service.get_watermark()))
+
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2]
+
+
+def test_export_rejects_unknown_format(client):
+    assert client.get("/v1/products/export", params={"format": "xml"}).status_code == 422
+
+
+def test_recent_writes_are_held_back(client, monkeypatch, catalog):
+    monkeypatch.setattr(settings, "EXPORT_LAG_SECONDS", 60)
+
+    response = client.get("/v1/products/export")
+
+    assert read_ndjson(response) == []
+    assert response.headers["x-export-watermark"] < min(p.updated_at for p in catalog).isoformat()
+
+
+def test_watermark_and_rows_share_one_session(catalog, session_factory):
+    opened = []
+
+    def factory():
+        opened.append(session_factory())
+        return opened[-1]
+
+    service = ProductExportService(factory)
+    chunks = list(service.stream("ndjson", service.get_watermark()))
+
+    assert len(opened) == 1
+    assert sum(chunk.count(b"\n") for chunk in chunks) == 4
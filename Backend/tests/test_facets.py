@@ -0,0 +1,96 @@
+"""
+Tests for faceted browsing and incrementally maintained facet counts
+"""
+import pytest
+from fastapi.testclient import TestClient
+from app.db.query_stats import assert_max_queries
+from app.main import app
+from app.models import ProductFacetCount
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.facet_service import FacetService
+from app.services.product_service import ProductService
+
+
+def create(db, seller, **fields):
+    values = {"title": "Frame", "category": "sunglasses", "condition": "new", "price": 80.0}
+    values.update(fields)
+    return ProductService(db).create_product(ProductCreate(**values), seller.id)
+
+
+def stored_counts(db):
+    return {(row.facet, row.value): row.count for row in db.query(ProductFacetCount) if row.count}
+
+
+@pytest.fixture
+def catalog(db_session, make_user):
+    seller = make_user()
+    create(db_session, seller, title="Aviator", brand="Ray-Ban", color="gold", material="metal", price=150.0)
+    create(db_session, seller, title="Holbrook", brand="Oakley", color="black", material="acetate", price=120.0)
+    create(db_session, seller, title="Reader", category="eyeglasses", condition="good", brand="Oakley", color="black", price=40.0)
+    create(db_session, seller, title="Steve McQueen", brand="Persol", color="tortoise", material="acetate", price=320.0)
+    return seller
+
+
+def test_counts_track_creates_updates_and_deletes(db_session, catalog):
+    service = ProductService(db_session)
+    counts = FacetService(db_session).get_counts()
+    assert counts["brand"] == {"Oakley": 2, "Persol": 1, "Ray-Ban": 1}
+    assert counts["category"] == {"sunglasses": 3, "eyeglasses": 1}
+    assert counts["price"] == {"100-250": 2, "0-50": 1, "250-500": 1}
+
+    aviator = service.browse(brands=["Ray-Ban"])[0][0]
+    service.update_product(aviator.id, ProductUpdate(brand="Oakley", price=90.0), catalog.id)
+    persol = service.browse(brands=["Persol"])[0][0]
+    service.delete_product(persol.id, catalog.id)
+
+    counts = FacetService(db_session).get_counts()
+    assert counts["brand"] == {"Oakley": 3}
+    assert counts["price"] == {"0-50": 1, "100-250": 1, "50-100": 1}
+    assert counts["material"] == {"acetate": 1, "metal": 1}
+
+
+def test_incremental_counts_match_rebuild(db_session, catalog):
+    service = ProductService(db_session)
+    reader = service.browse(categories=["eyeglasses"])[0][0]
+    service.update_product(reader.id, ProductUpdate(category="sunglasses", color="blue"), catalog.id)
+    incremental = stored_counts(db_session)
+
+    FacetService(db_session).rebuild()
+    db_session.commit()
+
+    assert stored_counts(db_session) == incremental
+
+
+def test_deltas_are_applied_after_commit_and_dropped_on_rollback(db_session, catalog):
+    before = stored_counts(db_session)
+    FacetService(db_session).record(None, [("brand", "Maui Jim")])
+    assert stored_counts(db_session) == before  # not written in the caller's transaction
+    db_session.rollback()
+    db_session.commit()
+    assert stored_counts(db_session) == before
+
+    FacetService(db_session).record(None, [("brand", "Maui Jim")])
+    db_session.commit()
+    assert stored_counts(db_session)[("brand", "Maui Jim")] == 1
+
+
+def test_values_within_a_facet_are_ored_and_facets_are_anded(db_session, catalog):
+    def titles(**filters):
+        return sorted(product.title for product in ProductService(db_session).browse(**filters)[0])
+
+    assert titles(brands=["Oakley", "Persol"]) == ["Holbrook", "Reader", "Steve McQueen"]
+    assert titles(brands=["Oakley", "Persol"], categories=["sunglasses"]) == ["Holbrook", "Steve McQueen"]
+    assert titles(materials=["acetate"], min_price=100, max_price=200) == ["Holbrook"]
+    assert titles(conditions=["good"], colors=["black"]) == ["Reader"]
+
+
+def test_facet_counts_are_read_without_scanning_products(db_session, catalog):
+    with assert_max_queries(2) as stats:
+        ProductService(db_session).browse(brands=["Oakley"])
+
+    assert sum("products" in statement and "GROUP BY" in statement for statement in stats.statements) == 0
+
+
+def test_browse_route_is_matched_before_product_id():
+    response = TestClient(app).get("/v1/products/browse", params={"cursor": "garbage"})
+    assert response.status_code == 400
@@ -0,0 +1,68 @@
+"""
+Tests for sparse fieldsets (?fields=)
+"""
+import pytest
+from app.db.query_stats import assert_max_queries, track_queries
+from app.schemas.order import OrderCreate, OrderItemCreate, OrderResponse
+from app.schemas.product import ProductResponse
+from app.services.order_service import OrderService
+from app.utils.fields import InvalidFieldsError, dump_fields, parse_fields, partial_schema
+
+
+@pytest.fixture
+def client(app_client):
+    return app_client()
+
+
+def test_parse_fields_canonicalises_to_schema_order():
+    assert parse_fields(None, ProductResponse) is None
+    assert parse_fields("price, title,id,title", ProductResponse) == ("title", "price", "id")
+    with pytest.raises(InvalidFieldsError, match="hashed_password"):
+        parse_fields("id,hashed_password", ProductResponse)
+    with pytest.raises(InvalidFieldsError):
+        parse_fields(" , ", ProductResponse)
+
+
+def test_partial_serializers_are_built_once_per_field_set():
+    fields = parse_fields("id,title", ProductResponse)
+    assert partial_schema(ProductResponse, fields) is partial_schema(ProductResponse, parse_fields("title,id", ProductResponse))
+    assert dump_fields(ProductResponse, fields, [{"id": 1, "title": "Aviator", "price": 1.0}], many=True) == b'[{"title":"Aviator","id":1}]'
+
+
+def test_product_list_selects_and_serializes_only_requested_fields(client, make_user, make_product):
+    seller = make_user()
+    make_product(seller, title="Aviator", description="x" * 1000)
+
+    with track_queries() as stats:
+        response = client.get("/v1/products/", params={"fields": "id,title,price"})
+
+    assert response.status_code == 200
+    assert response.json()[0].keys() == {"id", "title", "price"}
+    select = next(statement for statement in stats.statements if "FROM products" in statement)
+    assert "products.description" not in select
+    assert "ETag" in response.headers
+
+    # The field set is part of the cache key
+    assert "description" in client.get("/v1/products/").json()[0]
+
+
+def test_unknown_fields_are_rejected(client):
+    assert client.get("/v1/products/", params={"fields": "id,secret"}).status_code == 400
+
+
+def test_order_list_skips_items_query_unless_selected(db_session, make_user, make_product):
+    buyer = make_user()
+    product = make_product(buyer, quantity_available=5)
+    service = OrderService(db_session)
+    service.create_order(OrderCreate(items=[OrderItemCreate(product_id=product.id, quantity=1)]), buyer.id)
+    buyer_id = buyer.id
+    db_session.expire_all()
+
+    fields = parse_fields("id,status,total_amount", OrderResponse)
+    with assert_max_queries(1):
+        orders = service.get_user_orders(buyer_id, fields=fields)
+        body = dump_fields(OrderResponse, fields, orders, many=True)
+
+    assert b"order_items" not in body
+    with assert_max_queries(2):
+        service.get_user_orders(buyer_id, fields=parse_fields("id,order_items", OrderResponse))
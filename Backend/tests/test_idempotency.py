@@ -0,0 +1,153 @@
+"""
+Tests for Idempotency-Key handling
+"""
+import json
+from datetime import datetime, timedelta
+import pytest
+from app.models import IdempotencyKey
+from app.services import idempotency_service
+from app.services.idempotency_service import (
+    IdempotencyService, IdempotencyKeyInProgressError, IdempotencyKeyReusedError
+)
+
+PAYLOAD = {"items": [{"product_id": 1, "quantity": 2}]}
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    idempotency_service._response_cache.clear()
+    yield
+    idempotency_service._response_cache.clear()
+
+
+def test_completed_request_is_replayed(db_session):
+    first = IdempotencyService(db_session)
+    assert first.begin("orders:create:1", "key-1", PAYLOAD) is None
+    first.complete({"id": 7}, status_code=201, headers={"createdOn": "2026-01-01T00:00:00Z"})
+
+    replay = IdempotencyService(db_session).begin("orders:create:1", "key-1", PAYLOAD)
+
+    assert replay.status_code == 201
+    assert json.loads(replay.body) == {"id": 7}
+    assert replay.headers["createdOn"] == "2026-01-01T00:00:00Z"
+    assert replay.headers["Idempotent-Replayed"] == "true"
+
+
+def test_replay_survives_cache_loss(db_session):
+    first = IdempotencyService(db_session)
+    first.begin("orders:create:1", "key-1", PAYLOAD)
+    first.complete({"id": 7})
+    idempotency_service._response_cache.clear()
+
+    replay = IdempotencyService(db_session).begin("orders:create:1", "key-1", PAYLOAD)
+
+    assert json.loads(replay.body) == {"id": 7}
+
+
+def test_key_reused_with_different_payload_is_rejected(db_session):
+    first = IdempotencyService(db_session)
+    first.begin("orders:create:1", "key-1", PAYLOAD)
+    first.complete({"id": 7})
+
+    with pytest.raises(IdempotencyKeyReusedError) as exc:
+        IdempotencyService(db_session).begin("orders:create:1", "key-1", {"items": []})
+    assert exc.value.status_code == 422
+
+
+def test_concurrent_duplicate_is_in_progress(db_session):
+    IdempotencyService(db_session).begin("orders:create:1", "key-1", PAYLOAD)
+
+    with pytest.raises(IdempotencyKeyInProgressError) as exc:
+        IdempotencyService(db_session).begin("orders:create:1", "key-1", PAYLOAD)
+    assert exc.value.status_code == 409
+
+
+def test_abandoned_key_can_be_retried(db_session):
+    first = IdempotencyService(db_session)
+    first.begin("orders:create:1", "key-1", PAYLOAD)
+    first.abandon()
+
+    assert IdempotencyService(db_session).begin("orders:create:1", "key-1", PAYLOAD) is None
+
+
+def test_keys_are_scoped(db_session):
+    first = IdempotencyService(db_session)
+    first.begin("orders:create:1", "key-1", PAYLOAD)
+    first.complete({"id": 7})
+
+    assert IdempotencyService(db_session).begin("orders:create:2", "key-1", PAYLOAD) is None
+
+
+def test_no_key_is_a_pass_through(db_session):
+    service = IdempotencyService(db_session)
+    assert service.begin("orders:create:1", None, PAYLOAD) is None
+    service.complete({"id": 7})
+
+    assert db_session.query(IdempotencyKey).count() == 0
+
+
+def test_purge_expired(db_session):
+    first = IdempotencyService(db_session)
+    first.begin("orders:create:1", "key-1", PAYLOAD)
+    first.complete({"id": 7})
+
+    assert IdempotencyService(db_session).purge_expired(datetime.utcnow() + timedelta(days=2)) == 1
+    assert db_session.query(IdempotencyKey).count() == 0
+
+
+SIGNUP = {
+    "email": "new@example.com", "firstName": "New", "lastName": "User", "phoneNumber": "+15555550123",
+    "password": "SecurePass123", "rePassword": "SecurePass123", "gender": "N/A",
+}
+
+
+@pytest.fixture
+def register_client(app_client):
+    return app_client(raise_server_exceptions=False)
+
+
+def test_register_key_reused_by_another_client_is_not_replayed(register_client):
+    headers = {"Idempotency-Key": "signup-1", "X-Forwarded-For": "203.0.113.1"}  # own registration rate limit
+    assert register_client.post("/v1/auth/register", json=SIGNUP, headers=headers).status_code == 201
+
+    other = {**SIGNUP, "password": "OtherPass456", "rePassword": "OtherPass456"}
+    response = register_client.post("/v1/auth/register", json=other, headers=headers)
+
+    assert response.status_code == 422
+
+
+def test_register_releases_key_on_unexpected_errors(register_client, monkeypatch):
+    from app.services.user_service import UserService
+
+    headers = {"Idempotency-Key": "signup-2", "X-Forwarded-For": "203.0.113.2"}
+    original = UserService.signup_user
+    monkeypatch.setattr(UserService, "signup_user", lambda self, data: (_ for _ in ()).throw(RuntimeError("db down")))
+    assert register_client.post("/v1/auth/register", json=SIGNUP, headers=headers).status_code == 500
+
+    monkeypatch.setattr(UserService, "signup_user", original)
+    assert register_client.post("/v1/auth/register", json=SIGNUP, headers=headers).status_code == 201
+
+
+def test_order_is_not_kept_when_its_response_cannot_be_stored(app_client, db_session, make_user, make_product, monkeypatch):
+    from app.models import Order, Product
+
+    buyer = make_user()
+    product = make_product(buyer, quantity_available=1)
+    client = app_client(user=buyer, raise_server_exceptions=False)
+    body = {"items": [{"product_id": product.id, "quantity": 1}]}
+    headers = {"Idempotency-Key": "order-1", "X-Forwarded-For": "203.0.113.3"}  # own rate limit bucket
+    original = IdempotencyService.complete
+    monkeypatch.setattr(IdempotencyService, "complete", lambda self, *args, **kwargs: (_ for _ in ()).throw(RuntimeError("db down")))
+    assert client.post("/v1/orders/", json=body, headers=headers).status_code == 500
+
+    db_session.expire_all()
+    assert db_session.query(Order).count() == 0
+    assert db_session.get(Product, product.id).quantity_available == 1
+
+    monkeypatch.setattr(IdempotencyService, "complete", original)
+    first = client.post("/v1/orders/", json=body, headers=headers)
+    replay = client.post("/v1/orders/", json=body, headers=headers)
+
+    assert first.status_code == 200
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert db_session.query(Order).count() == 1
@@ -0,0 +1,155 @@
+"""
+Tests for inventory reservation on order creation
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.db.session import create_db_engine
+from app.models import Product, User
+from app.models.order import Order, OrderStatus, PaymentStatus
+from app.models.product import ProductCategory, ProductCondition
+from app.schemas.order import OrderCreate, OrderItemCreate, OrderUpdate
+from app.services.inventory_service import InsufficientInventoryError, InventoryService
+from app.services.order_service import OrderConflictError, OrderService
+
+
+def order_for(product_id, quantity=1):
+    return OrderCreate(items=[OrderItemCreate(product_id=product_id, quantity=quantity)])
+
+
+def stock(db, product_id):
+    db.expire_all()
+    return db.get(Product, product_id).quantity_available
+
+
+def test_order_reserves_stock(db_session, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller, quantity_available=3)
+
+    order = OrderService(db_session).create_order(order_for(product.id, 2), seller.id)
+
+    assert stock(db_session, product.id) == 1
+    assert order.reserved_until > datetime.utcnow()
+
+
+def test_order_exceeding_stock_is_rejected(db_session, make_user, make_product):
+    seller = make_user()
+    first = make_product(seller, sku="A", quantity_available=5)
+    second = make_product(seller, sku="B", quantity_available=1)
+    order_data = OrderCreate(items=[
+        OrderItemCreate(product_id=first.id, quantity=1),
+        OrderItemCreate(product_id=second.id, quantity=2),
+    ])
+
+    with pytest.raises(InsufficientInventoryError):
+        OrderService(db_session).create_order(order_data, seller.id)
+
+    assert stock(db_session, first.id) == 5
+    assert stock(db_session, second.id) == 1
+    assert db_session.query(Order).count() == 0
+
+
+def test_expired_reservations_are_released(db_session, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller, quantity_available=2)
+    service = OrderService(db_session)
+    expired = service.create_order(order_for(product.id, 1), seller.id)
+    paid = service.create_order(order_for(product.id, 1), seller.id)
+    service.update_order(paid.id, OrderUpdate(payment_status=PaymentStatus.PAID), seller.id)
+    expired.reserved_until = datetime.utcnow() - timedelta(minutes=1)
+    db_session.commit()
+
+    inventory = InventoryService(db_session)
+    assert inventory.release_expired_reservations() == 1
+    assert inventory.release_expired_reservations() == 0
+
+    assert stock(db_session, product.id) == 1
+    assert db_session.get(Order, expired.id).status == OrderStatus.CANCELLED
+    assert db_session.get(Order, paid.id).status == OrderStatus.PENDING
+
+
+def test_cancelling_order_releases_stock(db_session, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller, quantity_available=1)
+    service = OrderService(db_session)
+    order = service.create_order(order_for(product.id), seller.id)
+
+    service.update_order(order.id, OrderUpdate(status=OrderStatus.CANCELLED), seller.id)
+
+    assert stock(db_session, product.id) == 1
+
+
+def test_paying_an_expired_order_is_rejected(db_session, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller, quantity_available=1)
+    service = OrderService(db_session)
+    order = service.create_order(order_for(product.id), seller.id)
+    order.reserved_until = datetime.utcnow() - timedelta(minutes=1)
+    db_session.commit()
+    assert InventoryService(db_session).release_expired_reservations() == 1
+
+    with pytest.raises(OrderConflictError):
+        service.update_order(order.id, OrderUpdate(payment_status=PaymentStatus.PAID), seller.id)
+
+    assert db_session.get(Order, order.id).payment_status == PaymentStatus.PENDING
+    assert stock(db_session, product.id) == 1
+
+
+def test_cancelling_paid_order_restocks_once(db_session, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller, quantity_available=2)
+    service = OrderService(db_session)
+    paid = service.create_order(order_for(product.id), seller.id)
+    service.update_order(paid.id, OrderUpdate(payment_status=PaymentStatus.PAID), seller.id)
+    both = service.create_order(order_for(product.id), seller.id)
+    assert stock(db_session, product.id) == 0
+
+    service.update_order(paid.id, OrderUpdate(status=OrderStatus.CANCELLED), seller.id)
+    service.update_order(paid.id, OrderUpdate(status=OrderStatus.CANCELLED), seller.id)
+    service.update_order(both.id, OrderUpdate(payment_status=PaymentStatus.PAID, status=OrderStatus.CANCELLED), seller.id)
+
+    assert stock(db_session, product.id) == 2
+    assert InventoryService(db_session).release_expired_reservations() == 0
+    assert stock(db_session, product.id) == 2
+
+
+def test_concurrent_buyers_never_oversell(tmp_path):
+    """Hundreds of simultaneous buyers compete for five units of one SKU"""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'inventory.db'}")
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with SessionLocal() as db:
+        seller = User(email="seller@example.com", username="seller", hashed_password="x")
+        db.add(seller)
+        db.flush()
+        product = Product(
+            title="One-of-a-kind frame",
+            category=ProductCategory.SUNGLASSES,
+            condition=ProductCondition.GOOD,
+            price=250.0,
+            quantity_available=5,
+            seller_id=seller.id,
+        )
+        db.add(product)
+        db.commit()
+        product_id, seller_id = product.id, seller.id
+
+    def buy(_):
+        with SessionLocal() as db:
+            try:
+                OrderService(db).create_order(order_for(product_id), seller_id)
+                return True
+            except InsufficientInventoryError:
+                return False
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        results = list(executor.map(buy, range(300)))
+
+    with SessionLocal() as db:
+        assert results.count(True) == 5
+        assert db.get(Product, product_id).quantity_available == 0
+        assert db.query(Order).count() == 5
+    engine.dispose()
@@ -0,0 +1,61 @@
+"""
+Tests that routes which never touch the database never check out a connection
+"""
+import base64
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from app.db.session import engine, LazySession
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def checkouts():
+    """Count pool checkouts on the application engine"""
+    count = {"value": 0}
+
+    def on_checkout(*args):
+        count["value"] += 1
+
+    event.listen(engine, "checkout", on_checkout)
+    yield count
+    event.remove(engine, "checkout", on_checkout)
+
+
+@pytest.mark.parametrize("method, path", [
+    ("post", "/v1/frame/register"),
+    ("get", "/v1/frame/"),
+    ("get", "/v1/frame/frame_123"),
+    ("put", "/v1/frame/frame_123"),
+    ("delete", "/v1/frame/frame_123"),
+])
+def test_frame_routes_do_not_check_out_connections(checkouts, method, path):
+    response = client.request(method, path)
+    assert response.status_code == 200
+    assert checkouts["value"] == 0
+
+
+def test_validation_routes_do_not_check_out_connections(checkouts):
+    response = client.post(
+        "/v1/validate-sunglasses",
+        files={"file": ("frame.txt", b"not an image", "text/plain")},
+    )
+    assert response.status_code == 400
+
+    response = client.post(
+        "/v1/validate-sunglasses-base64",
+        json={"image": base64.b64encode(b"not an image").decode()},
+    )
+    assert response.status_code == 200
+    assert checkouts["value"] == 0
+
+
+def test_lazy_session_opens_on_first_use(checkouts):
+    db = LazySession()
+    assert not db.is_started
+    db.execute(text("SELECT 1"))
+    assert db.is_started
+    assert checkouts["value"] == 1
+    db.close()
@@ -0,0 +1,47 @@
+"""
+Tests for the prebuilt OpenAPI document and the docs routes
+"""
+import gzip
+import json
+from fastapi.testclient import TestClient
+from app.core.openapi import OPENAPI_URL, REDOC_URL, SWAGGER_UI_URL, get_openapi_document
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_openapi_json_is_served_from_prebuilt_bytes():
+    document = get_openapi_document(app)
+    response = client.get(OPENAPI_URL, headers={"Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert response.content == document.body
+    assert response.headers["etag"] == document.etag
+    schema = json.loads(response.content)
+    assert "Bearer" in schema["components"]["securitySchemes"]
+    assert "/v1/products/" in schema["paths"]
+    assert get_openapi_document(app) is document
+    assert app.openapi() is document.schema
+
+
+def test_openapi_json_gzip_and_not_modified():
+    document = get_openapi_document(app)
+    with client.stream("GET", OPENAPI_URL, headers={"Accept-Encoding": "gzip"}) as response:
+        body = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert len(body) < len(document.body)
+    assert gzip.decompress(body) == document.body
+
+    for etag in (document.etag, response.headers["etag"]):
+        response = client.get(OPENAPI_URL, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+
+def test_docs_pages_point_at_the_openapi_document():
+    for url in (SWAGGER_UI_URL, REDOC_URL):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert OPENAPI_URL in response.text
+    assert client.get("/docs/oauth2-redirect").status_code == 200
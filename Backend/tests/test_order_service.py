@@ -0,0 +1,82 @@
+"""
+Tests for order creation
+"""
+import pytest
+from app.db.query_stats import assert_max_queries
+from app.schemas.order import OrderCreate, OrderItemCreate, OrderResponse
+from app.services.order_service import OrderService, ProductUnavailableError
+
+
+def test_create_order_prices_items_in_constant_queries(db_session, make_user, make_product):
+    seller = make_user()
+    buyer = make_user(email="buyer@example.com")
+    products = [make_product(seller, title=f"Frame {i}", price=10.0 + i, sku=f"SKU-{i}", quantity_available=5) for i in range(50)]
+    order_data = OrderCreate(items=[OrderItemCreate(product_id=p.id, quantity=2) for p in products])
+    buyer_id = buyer.id
+
+    # Product lookup, stock reservation, order insert, item insert, refresh
+    with assert_max_queries(5):
+        order = OrderService(db_session).create_order(order_data, buyer_id)
+
+    assert order.subtotal == sum((10.0 + i) * 2 for i in range(50))
+    assert order.total_amount == order.subtotal
+    assert len(order.order_items) == 50
+    item = next(i for i in order.order_items if i.product_sku == "SKU-3")
+    assert (item.unit_price, item.total_price, item.product_title) == (13.0, 26.0, "Frame 3")
+
+
+def test_create_order_skips_unknown_products(db_session, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller, price=25.0)
+    order_data = OrderCreate(items=[
+        OrderItemCreate(product_id=product.id, quantity=1),
+        OrderItemCreate(product_id=9999, quantity=3),
+    ])
+
+    order = OrderService(db_session).create_order(order_data, seller.id)
+
+    assert order.subtotal == 25.0
+    assert [item.product_id for item in order.order_items] == [product.id]
+
+
+def test_order_page_loads_items_in_two_queries(db_session, make_user, make_product):
+    seller = make_user()
+    buyer = make_user(email="buyer@example.com")
+    products = [make_product(seller, sku=f"SKU-{i}", quantity_available=100) for i in range(3)]
+    service = OrderService(db_session)
+    for _ in range(20):
+        service.create_order(OrderCreate(items=[OrderItemCreate(product_id=p.id, quantity=1) for p in products]), buyer.id)
+    buyer_id = buyer.id
+    db_session.expunge_all()
+
+    with assert_max_queries(2):
+        orders = service.get_user_orders(buyer_id)
+        page = [OrderResponse.model_validate(order) for order in orders]
+
+    assert len(page) == 20
+    assert all(len(order.order_items) == 3 for order in page)
+
+
+def test_order_detail_loads_items_in_two_queries(db_session, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller, quantity_available=5)
+    order = OrderService(db_session).create_order(OrderCreate(items=[OrderItemCreate(product_id=product.id, quantity=2)]), seller.id)
+    order_id, buyer_id = order.id, seller.id
+    db_session.expunge_all()
+
+    with assert_max_queries(2):
+        detail = OrderResponse.model_validate(OrderService(db_session).get_order_by_id(order_id, buyer_id))
+
+    assert [item.quantity for item in detail.order_items] == [2]
+
+
+def test_create_order_rejects_inactive_products(db_session, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller, quantity_available=5)
+    product.is_active = False
+    db_session.commit()
+
+    with pytest.raises(ProductUnavailableError) as exc:
+        OrderService(db_session).create_order(OrderCreate(items=[OrderItemCreate(product_id=product.id, quantity=1)]), seller.id)
+
+    assert exc.value.product_id == product.id
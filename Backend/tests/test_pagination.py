@@ -0,0 +1,72 @@
+"""
+Tests for keyset (cursor) pagination
+"""
+from datetime import datetime
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.product_service import ProductService
+from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor, next_cursor
+
+
+def page_through(service, limit):
+    """Follow cursors until the last page, returning every product id seen"""
+    seen, cursor = [], None
+    while True:
+        page = service.get_products(limit=limit, cursor=cursor)
+        seen.extend(product.id for product in page)
+        cursor = next_cursor(page, limit)
+        if cursor is None:
+            return seen
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 19, 12, 30, 45, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", encode_cursor(datetime.utcnow(), 1)[:-4]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_pages_cover_every_row_once_newest_first(db_session, make_user, make_product):
+    seller = make_user()
+    # Shared timestamps make id the tie-breaker
+    keys = []
+    for i in range(11):
+        created_at = datetime(2026, 1, 1 + i % 2)
+        keys.append((created_at, make_product(seller, sku=f"SKU-{i}", created_at=created_at).id))
+
+    seen = page_through(ProductService(db_session), limit=3)
+
+    assert seen == [row_id for _, row_id in sorted(keys, reverse=True)]
+
+
+def test_new_rows_do_not_shift_later_pages(db_session, make_user, make_product):
+    seller = make_user()
+    for i in range(6):
+        make_product(seller, sku=f"SKU-{i}")
+    service = ProductService(db_session)
+
+    first = service.get_products(limit=3)
+    make_product(seller, sku="NEW")
+    second = service.get_products(limit=3, cursor=next_cursor(first, 3))
+
+    assert {p.id for p in first}.isdisjoint(p.id for p in second)
+    assert len(second) == 3
+
+
+def test_skip_is_still_supported(db_session, make_user, make_product):
+    seller = make_user()
+    for i in range(5):
+        make_product(seller, sku=f"SKU-{i}")
+    service = ProductService(db_session)
+
+    assert service.get_products(skip=3, limit=3) == service.get_products(limit=5)[3:]
+
+
+def test_invalid_cursor_returns_400():
+    response = TestClient(app).get("/v1/products/", params={"cursor": "garbage"})
+    assert response.status_code == 400
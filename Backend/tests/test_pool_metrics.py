@@ -0,0 +1,65 @@
+"""
+Tests for connection pool settings and telemetry
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import exc, text
+from app.core.config import settings
+from app.db.pool_metrics import InstrumentedQueuePool, get_pool_metrics
+from app.db.session import create_db_engine
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_engine_uses_configured_pool(tmp_path, monkeypatch):
+    """Pool size, overflow and timeout come from settings"""
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 2)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 7)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 2
+    assert engine.pool._timeout == 7
+    engine.dispose()
+
+
+def test_checkouts_and_timeouts_are_recorded(tmp_path, monkeypatch):
+    """Checkout latency, in-use gauge and timeouts are reported"""
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.05)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert get_pool_metrics(engine)["in_use"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    metrics = get_pool_metrics(engine)
+    assert metrics["checkouts"] == 1
+    assert metrics["timeouts"] == 1
+    assert metrics["in_use"] == 0
+    assert metrics["checkout_latency_histogram"]["+Inf"] == 1
+    engine.dispose()
+
+
+def test_metrics_endpoint():
+    """Metrics endpoint exposes pool telemetry"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "db_pool" in response.json()
+
+
+def test_metrics_endpoint_requires_configured_token(monkeypatch):
+    """With METRICS_TOKEN set, only requests bearing it get metrics"""
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert "db_pool" in response.json()
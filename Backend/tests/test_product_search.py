@@ -0,0 +1,86 @@
+"""
+Tests for full-text product search
+"""
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+from app.db.fulltext import fts5_query, search_query, search_vector, tsquery_text
+from app.models import Product
+from app.services.product_service import ProductService
+
+
+def search(db, term, **filters):
+    return [product.title for product in ProductService(db).get_products(search=term, **filters)]
+
+
+def test_search_covers_title_brand_model_and_description(db_session, make_user, make_product):
+    seller = make_user()
+    make_product(seller, sku="1", title="Aviator", brand="Ray-Ban")
+    make_product(seller, sku="2", title="Wayfarer", model="RB2140")
+    make_product(seller, sku="3", title="Clubmaster", description="Polarized lenses with acetate frame")
+    make_product(seller, sku="4", title="Round Metal")
+
+    assert search(db_session, "ray") == ["Aviator"]
+    assert search(db_session, "rb2140") == ["Wayfarer"]
+    assert search(db_session, "polarized frames") == ["Clubmaster"]
+
+
+def test_title_matches_rank_above_description_matches(db_session, make_user, make_product):
+    seller = make_user()
+    make_product(seller, sku="1", title="Acetate Cat Eye", description="Lightweight frame")
+    make_product(seller, sku="2", title="Tortoise Square", description="Handmade acetate frame")
+
+    assert search(db_session, "acetate") == ["Acetate Cat Eye", "Tortoise Square"]
+
+
+def test_last_word_matches_as_prefix(db_session, make_user, make_product):
+    seller = make_user()
+    make_product(seller, sku="1", title="Polarized Aviator")
+
+    assert search(db_session, "polarized avi") == ["Polarized Aviator"]
+
+
+def test_index_follows_updates_and_inactive_rows_are_hidden(db_session, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller, title="Aviator")
+
+    product.title = "Pilot"
+    db_session.commit()
+    assert search(db_session, "aviator") == []
+    assert search(db_session, "pilot") == ["Pilot"]
+
+    product.is_active = False
+    db_session.commit()
+    assert search(db_session, "pilot") == []
+
+
+def test_search_input_is_not_parsed_as_fts_syntax(db_session, make_user, make_product):
+    seller = make_user()
+    make_product(seller, title="Aviator")
+
+    assert search(db_session, 'aviator OR "NEAR(') == []
+    assert fts5_query('say "hi"') == '"say" """hi"""*'
+
+
+def test_postgres_query_matches_the_last_word_as_a_prefix():
+    assert tsquery_text("ray avia") == "'ray' & 'avia':*"
+    assert tsquery_text("it's a | b\\") == "'it''s' & 'a' & '|' & 'b\\\\':*"
+    assert "to_tsquery" in str(search_query("avia").compile(dialect=postgresql.dialect()))
+
+
+def test_search_combines_with_filters(db_session, make_user, make_product):
+    seller = make_user()
+    make_product(seller, sku="1", title="Aviator")
+    make_product(seller, sku="2", title="Aviator Kids", category="eyeglasses")
+
+    assert search(db_session, "aviator", category="eyeglasses") == ["Aviator Kids"]
+
+
+def test_postgres_query_uses_the_indexed_expression():
+    index = next(index for index in Product.__table__.indexes if index.name == "ix_products_search")
+    dialect = postgresql.dialect()
+
+    ddl = str(CreateIndex(index).compile(dialect=dialect))
+    predicate = str(search_vector(Product.__table__).op("@@")(search_query("x")).compile(dialect=dialect))
+
+    assert "USING gin" in ddl
+    assert predicate.split(" @@ ")[0].strip("()").replace("products.", "") in ddl
@@ -0,0 +1,90 @@
+"""
+Tests for statement counting, slow-query logging and query budgets
+"""
+import logging
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.core.config import settings
+from app.db.query_stats import (
+    QueryBudgetExceeded, assert_max_queries, normalize_statement, query_budget, track_queries
+)
+from app.db.session import create_db_engine
+from app.middleware.query_stats import QueryStatsMiddleware
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name VARCHAR(20))"))
+    yield engine
+    engine.dispose()
+
+
+def test_statements_are_counted(engine):
+    with track_queries("GET /items") as stats:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT * FROM items"))
+            connection.execute(text("SELECT count(*) FROM items"))
+    assert stats.count == 2
+    assert stats.total_seconds > 0
+
+
+def test_repeated_statement_shapes_are_flagged(engine):
+    with track_queries() as stats:
+        with engine.connect() as connection:
+            for item_id in range(6):
+                connection.execute(text("SELECT * FROM items WHERE id = :id"), {"id": item_id})
+    assert stats.repeated_statements(threshold=5) == [("SELECT * FROM items WHERE id = ?", 6)]
+
+
+def test_normalize_statement_collapses_literals_and_in_lists():
+    assert normalize_statement("SELECT * FROM t WHERE id IN (?, ?, ?) AND name = 'x'") == \
+        normalize_statement("SELECT * FROM t WHERE id IN (?, ?) AND name = 'y'")
+
+
+def test_slow_queries_are_logged_with_route(engine, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.db.query_stats"):
+        with track_queries("GET /items"):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT * FROM items"))
+    assert "Slow query" in caplog.text
+    assert "GET /items" in caplog.text
+
+
+def test_assert_max_queries(engine):
+    with pytest.raises(QueryBudgetExceeded):
+        with assert_max_queries(1):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+
+
+def test_route_budget_is_enforced(engine, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_ENFORCE", True)
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/items")
+    @query_budget(1)
+    def list_items():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT * FROM items"))
+            connection.execute(text("SELECT count(*) FROM items"))
+        return []
+
+    @app.get("/count")
+    @query_budget(1)
+    def count_items():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT count(*) FROM items"))
+        return 0
+
+    client = TestClient(app)
+    response = client.get("/count")
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/items")
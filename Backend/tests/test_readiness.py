@@ -0,0 +1,49 @@
+"""
+Tests for the /health/ready readiness check
+"""
+import time
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.db.session import ping_database
+import app.main as main
+
+client = TestClient(main.app)
+
+
+def test_ready_when_database_answers(monkeypatch, db_engine):
+    monkeypatch.setattr(main, "ping_database", lambda: ping_database(db_engine))
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "database": "ok"}
+
+
+def test_unavailable_when_database_fails(monkeypatch):
+    def fail():
+        raise ConnectionError("database is down")
+    monkeypatch.setattr(main, "ping_database", fail)
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json() == {"status": "unavailable", "database": "unavailable"}
+
+
+def test_slow_database_times_out(monkeypatch):
+    monkeypatch.setattr(settings, "DB_READINESS_TIMEOUT", 0.05)
+    monkeypatch.setattr(main, "ping_database", lambda: time.sleep(0.5))
+
+    start = time.perf_counter()
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["database"] == "unavailable"
+    assert time.perf_counter() - start < 0.4
+
+    # The stuck probe is reused rather than piling up another thread
+    probe = main._readiness_probe
+    assert client.get("/health/ready").status_code == 503
+    assert main._readiness_probe is probe
+    probe.result()
+
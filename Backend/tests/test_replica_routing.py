@@ -0,0 +1,108 @@
+"""
+Tests for read-replica routing using separate SQLite databases
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.db.routing import ReplicaRouter, RoutingSession
+
+
+def make_database(path, name):
+    """Create a SQLite database whose single row identifies it"""
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE source (name VARCHAR(20))"))
+        connection.execute(text("INSERT INTO source (name) VALUES (:name)"), {"name": name})
+    return engine
+
+
+def read_source(session):
+    return session.execute(text("SELECT name FROM source")).scalar()
+
+
+@pytest.fixture
+def databases(tmp_path):
+    primary = make_database(tmp_path / "primary.db", "primary")
+    replica_a = make_database(tmp_path / "replica_a.db", "replica_a")
+    replica_b = make_database(tmp_path / "replica_b.db", "replica_b")
+    return primary, replica_a, replica_b
+
+
+def make_session_factory(router):
+    return sessionmaker(class_=RoutingSession, router=router, bind=router.primary)
+
+
+def test_reads_round_robin_and_writes_go_to_primary(databases):
+    primary, replica_a, replica_b = databases
+    SessionLocal = make_session_factory(ReplicaRouter(primary, [replica_a, replica_b]))
+
+    reads = []
+    for _ in range(4):
+        with SessionLocal(info={"read_only": True}) as session:
+            reads.append(read_source(session))
+    assert reads == ["replica_a", "replica_b", "replica_a", "replica_b"]
+
+    with SessionLocal() as session:
+        assert read_source(session) == "primary"
+
+
+def test_read_only_session_sticks_to_one_replica(databases):
+    primary, replica_a, replica_b = databases
+    SessionLocal = make_session_factory(ReplicaRouter(primary, [replica_a, replica_b]))
+
+    with SessionLocal(info={"read_only": True}) as session:
+        assert {read_source(session) for _ in range(3)} == {"replica_a"}
+
+
+def test_unavailable_replica_falls_back(databases, tmp_path):
+    primary, replica_a, _ = databases
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = ReplicaRouter(primary, [broken], retry_interval=60)
+    SessionLocal = make_session_factory(router)
+
+    router.mark_unavailable(broken)
+    with SessionLocal(info={"read_only": True}) as session:
+        assert read_source(session) == "primary"
+    assert router.status()[0]["healthy"] is False
+
+
+def test_failed_replica_is_reprobed(databases):
+    primary, replica_a, _ = databases
+    router = ReplicaRouter(primary, [replica_a], retry_interval=0)
+    SessionLocal = make_session_factory(router)
+
+    router.mark_unavailable(replica_a)
+    with SessionLocal(info={"read_only": True}) as session:
+        assert read_source(session) == "replica_a"
+    assert router.status()[0]["healthy"] is True
+
+
+def test_connection_error_marks_replica_down(databases, tmp_path):
+    primary, _, _ = databases
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = ReplicaRouter(primary, [broken], retry_interval=60)
+    SessionLocal = make_session_factory(router)
+
+    with SessionLocal(info={"read_only": True}) as session:
+        with pytest.raises(Exception):
+            read_source(session)
+    assert router.status()[0]["healthy"] is False
+
+    with SessionLocal(info={"read_only": True}) as session:
+        assert read_source(session) == "primary"
+
+
+def test_own_data_is_read_from_the_primary():
+    """Orders and profiles are read right after the caller's writes, so replica lag would hide them"""
+    from app.db.session import get_primary_read_db, get_read_db
+    from app.main import app
+
+    def dependencies(dependant):
+        for dependency in dependant.dependencies:
+            yield dependency.call
+            yield from dependencies(dependency)
+
+    for path in ("/v1/orders/", "/v1/orders/{order_id}", "/v1/auth/{user_id}"):
+        route = next(route for route in app.routes if route.path == path and "GET" in route.methods)
+        calls = set(dependencies(route.dependant))
+        assert get_primary_read_db in calls and get_read_db not in calls
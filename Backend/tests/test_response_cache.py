@@ -0,0 +1,130 @@
+"""
+Tests for the product response cache
+"""
+import pytest
+from app.core.cache import LocalCacheBackend, ResponseCache, invalidate_on_commit, response_cache
+from app.db.query_stats import track_queries
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.product_service import ProductService
+
+
+@pytest.fixture
+def client(app_client):
+    """App client whose read sessions use the test database"""
+    return app_client()
+
+
+def test_tag_invalidation_hides_older_entries():
+    cache = ResponseCache(LocalCacheBackend(maxsize=10, ttl=60), ttl=60)
+    cache.set("a", ["products", "product:1"], b'{"id":1}', {"X-Test": "1"})
+    cache.set("b", ["products", "product:2"], b'{"id":2}')
+
+    assert cache.get("a", ["products", "product:1"]).body == b'{"id":1}'
+    assert cache.get("a", ["products", "product:1"]).headers == {"X-Test": "1"}
+
+    cache.invalidate("product:1")
+    assert cache.get("a", ["products", "product:1"]) is None
+    assert cache.get("b", ["products", "product:2"]) is not None
+
+    cache.invalidate("products")
+    assert cache.get("b", ["products", "product:2"]) is None
+
+
+def test_write_between_snapshot_and_store_invalidates_the_entry():
+    cache = ResponseCache(LocalCacheBackend(maxsize=10, ttl=60), ttl=60)
+    versions = cache.tag_versions(["products"])
+    cache.invalidate("products")  # a write commits while the response is being built
+    cache.set("a", ["products"], b"stale", versions=versions)
+
+    assert cache.get("a", ["products"]) is None
+
+
+def test_cache_fills_read_the_primary(monkeypatch):
+    from app.core.config import settings
+    from app.routes.products import get_cacheable_read_db
+
+    primary, replica = object(), object()
+    assert get_cacheable_read_db(primary, replica) is primary
+
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", False)
+    assert get_cacheable_read_db(primary, replica) is replica
+
+
+def test_tag_versions_are_bounded_and_eviction_never_revives_entries():
+    backend = LocalCacheBackend(maxsize=10, ttl=60, max_tags=2)
+    cache = ResponseCache(backend, ttl=60)
+    cache.set("a", ["product:1"], b"old")
+    cache.invalidate("product:1")
+    cache.invalidate("product:2", "product:3")
+
+    assert len(backend._versions) == 2
+    assert cache.get("a", ["product:1"]) is None
+    cache.set("a", ["product:1"], b"new")
+    assert cache.get("a", ["product:1"]).body == b"new"
+
+
+def test_key_ignores_param_order_and_empty_values():
+    assert ResponseCache.make_key("list", [("b", 2), ("a", "x"), ("c", None)]) == \
+        ResponseCache.make_key("list", [("a", "x"), ("b", "2"), ("d", "")])
+
+
+def test_tags_are_invalidated_on_commit_only(db_session):
+    response_cache.clear()
+    response_cache.set("k", ["t"], b"{}")
+
+    invalidate_on_commit(db_session, "t")
+    db_session.rollback()
+    assert response_cache.get("k", ["t"]) is not None
+
+    invalidate_on_commit(db_session, "t")
+    db_session.commit()
+    assert response_cache.get("k", ["t"]) is None
+
+
+def test_detail_is_served_from_cache_until_the_product_changes(client, db_session, make_user, make_product):
+    seller = make_user()
+    product = make_product(seller, title="Aviator")
+
+    first = client.get(f"/v1/products/{product.id}")
+    with track_queries() as stats:
+        second = client.get(f"/v1/products/{product.id}")
+
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert second.content == first.content
+    assert stats.count == 0
+
+    ProductService(db_session).update_product(product.id, ProductUpdate(title="Pilot"), seller.id)
+
+    third = client.get(f"/v1/products/{product.id}")
+    assert third.headers["X-Cache"] == "MISS"
+    assert third.json()["title"] == "Pilot"
+
+
+def test_listing_is_invalidated_by_new_products(client, db_session, make_user, make_product):
+    seller = make_user()
+    make_product(seller, sku="A")
+
+    assert len(client.get("/v1/products/?limit=10").json()) == 1
+    assert client.get("/v1/products/", params={"limit": 10}).headers["X-Cache"] == "HIT"
+
+    make_product(seller, sku="B")
+    assert len(client.get("/v1/products/?limit=10").json()) == 1  # written outside ProductService
+
+    ProductService(db_session).create_product(
+        ProductCreate(title="Wayfarer", category="sunglasses", condition="new", price=90.0), seller.id
+    )
+    response = client.get("/v1/products/?limit=10")
+    assert response.headers["X-Cache"] == "MISS"
+    assert len(response.json()) == 3
+
+
+def test_next_cursor_header_is_cached(client, make_user, make_product):
+    seller = make_user()
+    for i in range(3):
+        make_product(seller, sku=f"SKU-{i}")
+
+    first = client.get("/v1/products/?limit=2")
+    second = client.get("/v1/products/?limit=2")
+
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
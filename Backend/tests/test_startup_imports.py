@@ -0,0 +1,66 @@
+"""
+Startup budget: importing the app stays fast and doesn't load heavy libraries
+"""
+import io
+import os
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+from app.core.config import settings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative `import main` time allowed under -X importtime (which itself adds overhead)
+IMPORT_BUDGET_MS = int(os.environ.get("IMPORT_BUDGET_MS", "3000"))
+
+# Loaded on the first validation request (or warmup), never at import
+DEFERRED_MODULES = ("PIL", "google.cloud.vision", "torch", "transformers")
+
+
+def run_python(*args):
+    return subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+
+
+def test_app_import_is_within_budget():
+    stderr = run_python("-X", "importtime", "-c", "import main").stderr
+    cumulative_us = None
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and line.split("|")[-1].strip() == "main":
+            cumulative_us = int(line.split("|")[1])
+
+    assert cumulative_us is not None
+    assert cumulative_us / 1000 < IMPORT_BUDGET_MS
+
+
+def test_app_import_defers_heavy_modules():
+    code = f"import sys, main; print('loaded:', [m for m in {DEFERRED_MODULES!r} if m in sys.modules])"
+    stdout = run_python("-c", code).stdout
+
+    assert "loaded: []" in stdout.splitlines()
+
+
+def test_validation_loads_pillow_on_first_use():
+    from PIL import Image
+    from app.main import app
+
+    image = io.BytesIO()
+    Image.new("RGB", (8, 8), "black").save(image, format="PNG")
+
+    response = TestClient(app).post("/v1/validate-sunglasses", files={"file": ("x.png", image.getvalue(), "image/png")})
+
+    assert response.status_code == 200
+    assert response.json()["analysis"]["analysis_method"] == "simplified_ai_model"
+
+
+def test_warmup_on_startup(monkeypatch):
+    from app.main import app
+    from app.services import ai_validation_service
+
+    calls = []
+    monkeypatch.setattr(settings, "AI_WARMUP_ON_STARTUP", True)
+    monkeypatch.setattr(ai_validation_service, "warmup", lambda: calls.append(True))
+
+    with TestClient(app):
+        pass
+
+    assert calls == [True]
@@ -0,0 +1,36 @@
+"""
+Tests for the Swagger login page and dashboard templates
+"""
+from fastapi.testclient import TestClient
+from app.main import app
+from app.routes.swagger_auth import LOGIN_PAGE
+
+client = TestClient(app)
+
+
+def test_login_page_is_served_from_cached_bytes():
+    response = client.get("/v1/auth/swagger-login")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.content == LOGIN_PAGE
+    assert b'<div class="error-message">' not in LOGIN_PAGE
+
+
+def test_login_error_is_escaped():
+    response = client.get("/v1/auth/swagger-login", params={"error": "<script>alert(1)</script>"})
+
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in response.text
+    assert "<script>" not in response.text
+
+
+def test_dashboard_escapes_user_fields(app_client, make_user):
+    user = make_user(email="viewer@example.com", full_name="<b>Eve</b>", first_name="Eve")
+
+    response = app_client(user=user).get("/v1/auth/swagger-dashboard")
+
+    assert response.status_code == 200
+    assert "Welcome back, Eve!" in response.text
+    assert "&lt;b&gt;Eve&lt;/b&gt;" in response.text
+    assert "viewer@example.com" in response.text
+    assert "Never" in response.text
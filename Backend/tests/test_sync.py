@@ -0,0 +1,89 @@
+"""
+Tests for delta sync
+"""
+import pytest
+from app.core.config import settings
+from app.db.explain import assert_uses_index
+from app.models import Order
+from app.schemas.order import OrderCreate, OrderItemCreate, OrderUpdate
+from app.services.order_service import OrderService
+from app.services.product_service import ProductService
+
+
+@pytest.fixture(autouse=True)
+def no_lag(monkeypatch):
+    monkeypatch.setattr(settings, "SYNC_LAG_SECONDS", 0)
+
+
+@pytest.fixture
+def buyer(make_user):
+    return make_user(email="buyer@example.com")
+
+
+@pytest.fixture
+def client(app_client, buyer):
+    return app_client(user=buyer)
+
+
+def sync(client, watermark=None, **params):
+    response = client.get("/v1/sync/", params={"watermark": watermark, **params} if watermark else params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_first_sync_returns_everything_then_only_changes(client, db_session, buyer, make_user, make_product):
+    seller = make_user()
+    products = [make_product(seller, title=f"Frame {n}", quantity_available=5) for n in range(3)]
+    order = OrderService(db_session).create_order(OrderCreate(items=[OrderItemCreate(product_id=products[0].id, quantity=1)]), buyer.id)
+    OrderService(db_session).create_order(OrderCreate(items=[OrderItemCreate(product_id=products[1].id, quantity=1)]), seller.id)
+
+    first = sync(client)
+    # Ordered by updated_at: reserving stock for the orders touched Frame 0 and 1 last
+    assert [p["title"] for p in first["products"]["changed"]] == ["Frame 2", "Frame 0", "Frame 1"]
+    assert [o["id"] for o in first["orders"]["changed"]] == [order.id]
+    assert first["orders"]["changed"][0]["order_items"][0]["product_id"] == products[0].id
+    assert not first["has_more"]
+
+    empty = sync(client, first["watermark"])
+    assert empty["products"] == {"changed": [], "deleted": []}
+    assert empty["orders"] == {"changed": [], "deleted": []}
+    assert empty["watermark"] == first["watermark"]
+
+    ProductService(db_session).delete_product(products[1].id, seller.id)
+    products[2].price = 80.0
+    db_session.commit()
+    OrderService(db_session).update_order(order.id, OrderUpdate(notes="Leave at door"), buyer.id)
+
+    delta = sync(client, first["watermark"])
+    assert [(p["id"], p["price"]) for p in delta["products"]["changed"]] == [(products[2].id, 80.0)]
+    assert delta["products"]["deleted"] == [products[1].id]
+    assert [o["notes"] for o in delta["orders"]["changed"]] == ["Leave at door"]
+
+
+def test_sync_pages_until_has_more_is_false(client, make_user, make_product):
+    seller = make_user()
+    ids = [make_product(seller, title=f"Frame {n}").id for n in range(5)]
+
+    seen, watermark, has_more = [], None, True
+    while has_more:
+        page = sync(client, watermark, limit=2)
+        seen += [p["id"] for p in page["products"]["changed"]]
+        watermark, has_more = page["watermark"], page["has_more"]
+
+    assert seen == ids
+
+
+def test_recent_writes_are_held_back(client, monkeypatch, make_user, make_product):
+    make_product(make_user())
+    monkeypatch.setattr(settings, "SYNC_LAG_SECONDS", 60)
+
+    assert sync(client)["products"]["changed"] == []
+
+
+def test_invalid_watermark(client):
+    assert client.get("/v1/sync/", params={"watermark": "not-a-watermark"}).status_code == 400
+
+
+def test_order_sync_is_indexed(db_session, buyer):
+    query = db_session.query(Order).filter(Order.buyer_id == buyer.id, Order.updated_at > Order.created_at)
+    assert_uses_index(db_session, query.order_by(Order.updated_at, Order.id), "ix_orders_buyer_id_updated_at_id")